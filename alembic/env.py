@@ -6,11 +6,13 @@ from alembic import context
 from sqlalchemy import engine_from_config, pool
 
 from backend import models  # noqa: F401
-from backend.database import Base, DATABASE_URL
+from backend.database import Base, SYNC_DATABASE_URL
+from backend.search import FTS_INDEX, FTS_TABLE
 
 
 config = context.config
-config.set_main_option("sqlalchemy.url", DATABASE_URL)
+# ConfigParser treats "%" as interpolation, and URL-encoded passwords often contain it.
+config.set_main_option("sqlalchemy.url", SYNC_DATABASE_URL.replace("%", "%%"))
 
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
@@ -18,6 +20,15 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def include_name(name, type_, parent_names) -> bool:
+    # The description search index (FTS5 table and its shadow tables, or a GIN expression index) is managed by hand.
+    if type_ == "table":
+        return not name.startswith(FTS_TABLE)
+    if type_ == "index":
+        return name != FTS_INDEX
+    return True
+
+
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
@@ -26,6 +37,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -44,6 +56,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,
+            include_name=include_name,
         )
 
         with context.begin_transaction():
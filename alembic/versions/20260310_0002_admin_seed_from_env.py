@@ -42,13 +42,14 @@ def upgrade() -> None:
             sa.text(
                 """
                 INSERT INTO users (username, full_name, password_hash, role, is_active)
-                VALUES (:username, :full_name, :password_hash, 'Admin', 1)
+                VALUES (:username, :full_name, :password_hash, 'Admin', :is_active)
                 """
             ),
             {
                 "username": ADMIN_SEED_USERNAME,
                 "full_name": ADMIN_SEED_FULL_NAME,
                 "password_hash": hashed_password,
+                "is_active": True,
             },
         )
         return
@@ -57,7 +58,7 @@ def upgrade() -> None:
         sa.text(
             """
             UPDATE users
-            SET full_name = :full_name, password_hash = :password_hash, role = 'Admin', is_active = 1
+            SET full_name = :full_name, password_hash = :password_hash, role = 'Admin', is_active = :is_active
             WHERE username = :username
             """
         ),
@@ -65,6 +66,7 @@ def upgrade() -> None:
             "username": ADMIN_SEED_USERNAME,
             "full_name": ADMIN_SEED_FULL_NAME,
             "password_hash": hashed_password,
+            "is_active": True,
         },
     )
 
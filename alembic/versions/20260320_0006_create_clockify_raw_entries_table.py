@@ -0,0 +1,61 @@
+"""create clockify raw entries table
+
+Revision ID: 20260320_0006
+Revises: 20260313_0005
+Create Date: 2026-03-20 00:00:00
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260320_0006"
+down_revision = "20260313_0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("audit_sessions", sa.Column("last_synced_at", sa.DateTime(timezone=True), nullable=True))
+
+    op.create_table(
+        "clockify_raw_entries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("audit_session_id", sa.Integer(), nullable=False),
+        sa.Column("clockify_entry_id", sa.String(length=64), nullable=False),
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("user_name", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False, server_default=""),
+        sa.Column("tags", sa.Text(), nullable=False, server_default=""),
+        sa.Column("start_datetime", sa.DateTime(), nullable=False),
+        sa.Column("end_datetime", sa.DateTime(), nullable=False),
+        sa.Column("duration_hours", sa.Float(), nullable=False),
+        sa.Column("last_seen_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.ForeignKeyConstraint(["audit_session_id"], ["audit_sessions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("audit_session_id", "clockify_entry_id"),
+    )
+    op.create_index(op.f("ix_clockify_raw_entries_id"), "clockify_raw_entries", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_clockify_raw_entries_audit_session_id"),
+        "clockify_raw_entries",
+        ["audit_session_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_clockify_raw_entries_start_datetime"),
+        "clockify_raw_entries",
+        ["start_datetime"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_clockify_raw_entries_start_datetime"), table_name="clockify_raw_entries")
+    op.drop_index(op.f("ix_clockify_raw_entries_audit_session_id"), table_name="clockify_raw_entries")
+    op.drop_index(op.f("ix_clockify_raw_entries_id"), table_name="clockify_raw_entries")
+    op.drop_table("clockify_raw_entries")
+    op.drop_column("audit_sessions", "last_synced_at")
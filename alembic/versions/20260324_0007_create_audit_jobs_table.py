@@ -0,0 +1,57 @@
+"""create audit jobs table
+
+Revision ID: 20260324_0007
+Revises: 20260320_0006
+Create Date: 2026-03-24 00:00:00
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260324_0007"
+down_revision = "20260320_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(length=32), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("queued", "running", "succeeded", "failed", "cancelled", name="jobstatus", native_enum=False),
+            nullable=False,
+        ),
+        sa.Column("progress", sa.Float(), server_default="0", nullable=False),
+        sa.Column("message", sa.String(length=255), nullable=True),
+        sa.Column("params", sa.JSON(), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("cancel_requested", sa.Boolean(), server_default="0", nullable=False),
+        sa.Column("audit_session_id", sa.Integer(), nullable=True),
+        sa.Column("created_by_user_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["audit_session_id"], ["audit_sessions.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["created_by_user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_audit_jobs_id"), "audit_jobs", ["id"], unique=False)
+    op.create_index(op.f("ix_audit_jobs_status"), "audit_jobs", ["status"], unique=False)
+    op.create_index(op.f("ix_audit_jobs_audit_session_id"), "audit_jobs", ["audit_session_id"], unique=False)
+    op.create_index(op.f("ix_audit_jobs_created_by_user_id"), "audit_jobs", ["created_by_user_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_audit_jobs_created_by_user_id"), table_name="audit_jobs")
+    op.drop_index(op.f("ix_audit_jobs_audit_session_id"), table_name="audit_jobs")
+    op.drop_index(op.f("ix_audit_jobs_status"), table_name="audit_jobs")
+    op.drop_index(op.f("ix_audit_jobs_id"), table_name="audit_jobs")
+    op.drop_table("audit_jobs")
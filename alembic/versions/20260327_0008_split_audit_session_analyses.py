@@ -0,0 +1,114 @@
+"""split audit session analyses
+
+Revision ID: 20260327_0008
+Revises: 20260324_0007
+Create Date: 2026-03-27 00:00:00
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260327_0008"
+down_revision = "20260324_0007"
+branch_labels = None
+depends_on = None
+
+
+ANALYSIS_COLUMNS = ("time_stats", "overlap_per_user", "small_tasks_per_user", "big_tasks_per_user")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_session_analyses",
+        sa.Column("audit_session_id", sa.Integer(), nullable=False),
+        sa.Column("time_stats", sa.JSON(), nullable=True),
+        sa.Column("overlap_per_user", sa.JSON(), nullable=True),
+        sa.Column("small_tasks_per_user", sa.JSON(), nullable=True),
+        sa.Column("big_tasks_per_user", sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(["audit_session_id"], ["audit_sessions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("audit_session_id"),
+    )
+    op.add_column("audit_sessions", sa.Column("entry_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("audit_sessions", sa.Column("total_hours", sa.Float(), nullable=False, server_default="0"))
+    op.add_column("audit_sessions", sa.Column("user_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("audit_sessions", sa.Column("overlap_count", sa.Integer(), nullable=False, server_default="0"))
+
+    audit_sessions = sa.table(
+        "audit_sessions",
+        sa.column("id", sa.Integer()),
+        sa.column("entry_count", sa.Integer()),
+        sa.column("total_hours", sa.Float()),
+        sa.column("user_count", sa.Integer()),
+        sa.column("overlap_count", sa.Integer()),
+        *(sa.column(name, sa.JSON(none_as_null=True)) for name in ANALYSIS_COLUMNS),
+    )
+    analyses = sa.table(
+        "audit_session_analyses",
+        sa.column("audit_session_id", sa.Integer()),
+        *(sa.column(name, sa.JSON(none_as_null=True)) for name in ANALYSIS_COLUMNS),
+    )
+    time_entries = sa.table("audit_session_time_entries", sa.column("audit_session_id", sa.Integer()))
+
+    connection = op.get_bind()
+    entry_counts = dict(
+        connection.execute(
+            sa.select(time_entries.c.audit_session_id, sa.func.count()).group_by(time_entries.c.audit_session_id)
+        ).all()
+    )
+    rows = connection.execute(
+        sa.select(audit_sessions.c.id, *(audit_sessions.c[name] for name in ANALYSIS_COLUMNS))
+    ).all()
+    for row in rows:
+        time_stats = row.time_stats or {}
+        connection.execute(
+            analyses.insert().values(
+                audit_session_id=row.id,
+                **{name: getattr(row, name) for name in ANALYSIS_COLUMNS},
+            )
+        )
+        connection.execute(
+            audit_sessions.update()
+            .where(audit_sessions.c.id == row.id)
+            .values(
+                entry_count=entry_counts.get(row.id, 0),
+                total_hours=float(time_stats.get("total_time") or 0.0),
+                user_count=len(time_stats.get("time_per_user") or {}),
+                overlap_count=sum(len(overlaps or []) for overlaps in (row.overlap_per_user or {}).values()),
+            )
+        )
+
+    for name in reversed(ANALYSIS_COLUMNS):
+        op.drop_column("audit_sessions", name)
+
+
+def downgrade() -> None:
+    for name in ANALYSIS_COLUMNS:
+        op.add_column("audit_sessions", sa.Column(name, sa.JSON(), nullable=True))
+
+    audit_sessions = sa.table(
+        "audit_sessions",
+        sa.column("id", sa.Integer()),
+        *(sa.column(name, sa.JSON(none_as_null=True)) for name in ANALYSIS_COLUMNS),
+    )
+    analyses = sa.table(
+        "audit_session_analyses",
+        sa.column("audit_session_id", sa.Integer()),
+        *(sa.column(name, sa.JSON(none_as_null=True)) for name in ANALYSIS_COLUMNS),
+    )
+    connection = op.get_bind()
+    for row in connection.execute(sa.select(analyses)).all():
+        connection.execute(
+            audit_sessions.update()
+            .where(audit_sessions.c.id == row.audit_session_id)
+            .values(**{name: getattr(row, name) for name in ANALYSIS_COLUMNS})
+        )
+
+    op.drop_column("audit_sessions", "overlap_count")
+    op.drop_column("audit_sessions", "user_count")
+    op.drop_column("audit_sessions", "total_hours")
+    op.drop_column("audit_sessions", "entry_count")
+    op.drop_table("audit_session_analyses")
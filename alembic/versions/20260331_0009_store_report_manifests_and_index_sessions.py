@@ -0,0 +1,81 @@
+"""store report manifests and index audit sessions
+
+Revision ID: 20260331_0009
+Revises: 20260327_0008
+Create Date: 2026-03-31 00:00:00
+
+"""
+from __future__ import annotations
+
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.public import OUTPUT_DIR
+
+
+# revision identifiers, used by Alembic.
+revision = "20260331_0009"
+down_revision = "20260327_0008"
+branch_labels = None
+depends_on = None
+
+
+def _read_manifest(run_dir: str) -> list[dict] | None:
+    run_path = OUTPUT_DIR / run_dir
+    if not run_path.is_dir():
+        return None
+
+    manifest_path = run_path / "manifest.json"
+    if manifest_path.exists():
+        with open(manifest_path, encoding="utf-8") as file_obj:
+            return json.load(file_obj).get("report_files", [])
+
+    return [
+        {
+            "user": name[:-12].replace("_", " ").strip().title(),
+            "filename": name,
+            "relative_path": f"{run_dir}/{name}",
+        }
+        for name in sorted(path.name for path in run_path.iterdir())
+        if name.endswith("_report.json")
+    ]
+
+
+def upgrade() -> None:
+    op.add_column("audit_sessions", sa.Column("report_files", sa.JSON(), nullable=True))
+    op.create_index(
+        "ix_audit_sessions_created_by_user_id_id",
+        "audit_sessions",
+        ["created_by_user_id", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_audit_sessions_clockify_workspace_id_id",
+        "audit_sessions",
+        ["clockify_workspace_id", "id"],
+        unique=False,
+    )
+    op.create_index("ix_audit_sessions_start_date_end_date", "audit_sessions", ["start_date", "end_date"], unique=False)
+
+    audit_sessions = sa.table(
+        "audit_sessions",
+        sa.column("id", sa.Integer()),
+        sa.column("run_dir", sa.String()),
+        sa.column("report_files", sa.JSON(none_as_null=True)),
+    )
+    connection = op.get_bind()
+    for session_id, run_dir in connection.execute(sa.select(audit_sessions.c.id, audit_sessions.c.run_dir)).all():
+        report_files = _read_manifest(run_dir)
+        if report_files is not None:
+            connection.execute(
+                audit_sessions.update().where(audit_sessions.c.id == session_id).values(report_files=report_files)
+            )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_sessions_start_date_end_date", table_name="audit_sessions")
+    op.drop_index("ix_audit_sessions_clockify_workspace_id_id", table_name="audit_sessions")
+    op.drop_index("ix_audit_sessions_created_by_user_id_id", table_name="audit_sessions")
+    op.drop_column("audit_sessions", "report_files")
@@ -0,0 +1,36 @@
+"""index and tag audit session time entries
+
+Revision ID: 20260402_0010
+Revises: 20260331_0009
+Create Date: 2026-04-02 00:00:00
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260402_0010"
+down_revision = "20260331_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "audit_session_time_entries",
+        sa.Column("tags", sa.Text(), nullable=False, server_default=""),
+    )
+    op.create_index(
+        "ix_audit_session_time_entries_session_user_start",
+        "audit_session_time_entries",
+        ["audit_session_id", "user_name", "start_datetime"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_session_time_entries_session_user_start", table_name="audit_session_time_entries")
+    op.drop_column("audit_session_time_entries", "tags")
@@ -0,0 +1,149 @@
+"""create audit session rollup tables
+
+Revision ID: 20260406_0011
+Revises: 20260402_0010
+Create Date: 2026-04-06 00:00:00
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260406_0011"
+down_revision = "20260402_0010"
+branch_labels = None
+depends_on = None
+
+
+def _backfill() -> None:
+    time_entries = sa.table(
+        "audit_session_time_entries",
+        sa.column("audit_session_id", sa.Integer()),
+        sa.column("user_name", sa.String()),
+        sa.column("description", sa.Text()),
+        sa.column("start_datetime", sa.DateTime()),
+        sa.column("end_datetime", sa.DateTime()),
+        sa.column("duration_hours", sa.Float()),
+    )
+    day_rollups = sa.table(
+        "audit_session_user_day_rollups",
+        sa.column("audit_session_id", sa.Integer()),
+        sa.column("user_name", sa.String()),
+        sa.column("day", sa.Date()),
+        sa.column("hours", sa.Float()),
+        sa.column("entry_count", sa.Integer()),
+        sa.column("overlap_count", sa.Integer()),
+        sa.column("first_start", sa.DateTime()),
+        sa.column("last_end", sa.DateTime()),
+    )
+    user_rollups = sa.table(
+        "audit_session_user_rollups",
+        sa.column("audit_session_id", sa.Integer()),
+        sa.column("user_name", sa.String()),
+        sa.column("hours", sa.Float()),
+        sa.column("entry_count", sa.Integer()),
+        sa.column("overlap_count", sa.Integer()),
+        sa.column("day_count", sa.Integer()),
+        sa.column("first_start", sa.DateTime()),
+        sa.column("last_end", sa.DateTime()),
+    )
+
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(time_entries).order_by(
+            time_entries.c.audit_session_id,
+            time_entries.c.user_name,
+            time_entries.c.start_datetime,
+            time_entries.c.end_datetime,
+            time_entries.c.description,
+        )
+    )
+    days: dict[tuple, dict] = {}
+    users: dict[tuple, dict] = {}
+    previous_key = None
+    previous_end = None
+    for row in rows:
+        user_key = (row.audit_session_id, row.user_name)
+        day_key = (*user_key, row.start_datetime.date())
+        overlaps = int(previous_key == user_key and previous_end > row.start_datetime)
+        previous_key, previous_end = user_key, row.end_datetime
+
+        day = days.setdefault(
+            day_key,
+            {
+                "audit_session_id": row.audit_session_id,
+                "user_name": row.user_name,
+                "day": day_key[2],
+                "hours": 0.0,
+                "entry_count": 0,
+                "overlap_count": 0,
+                "first_start": row.start_datetime,
+                "last_end": row.end_datetime,
+            },
+        )
+        day["hours"] += row.duration_hours
+        day["entry_count"] += 1
+        day["overlap_count"] += overlaps
+        day["last_end"] = max(day["last_end"], row.end_datetime)
+
+        user = users.setdefault(
+            user_key,
+            {
+                "audit_session_id": row.audit_session_id,
+                "user_name": row.user_name,
+                "hours": 0.0,
+                "entry_count": 0,
+                "overlap_count": 0,
+                "day_count": 0,
+                "first_start": row.start_datetime,
+                "last_end": row.end_datetime,
+            },
+        )
+        user["hours"] += row.duration_hours
+        user["entry_count"] += 1
+        user["overlap_count"] += overlaps
+        user["day_count"] += int(day["entry_count"] == 1)
+        user["last_end"] = max(user["last_end"], row.end_datetime)
+
+    if days:
+        connection.execute(day_rollups.insert(), list(days.values()))
+    if users:
+        connection.execute(user_rollups.insert(), list(users.values()))
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_session_user_day_rollups",
+        sa.Column("audit_session_id", sa.Integer(), nullable=False),
+        sa.Column("user_name", sa.String(length=255), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("hours", sa.Float(), nullable=False),
+        sa.Column("entry_count", sa.Integer(), nullable=False),
+        sa.Column("overlap_count", sa.Integer(), nullable=False),
+        sa.Column("first_start", sa.DateTime(), nullable=False),
+        sa.Column("last_end", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["audit_session_id"], ["audit_sessions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("audit_session_id", "user_name", "day"),
+    )
+    op.create_table(
+        "audit_session_user_rollups",
+        sa.Column("audit_session_id", sa.Integer(), nullable=False),
+        sa.Column("user_name", sa.String(length=255), nullable=False),
+        sa.Column("hours", sa.Float(), nullable=False),
+        sa.Column("entry_count", sa.Integer(), nullable=False),
+        sa.Column("overlap_count", sa.Integer(), nullable=False),
+        sa.Column("day_count", sa.Integer(), nullable=False),
+        sa.Column("first_start", sa.DateTime(), nullable=False),
+        sa.Column("last_end", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["audit_session_id"], ["audit_sessions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("audit_session_id", "user_name"),
+    )
+    _backfill()
+
+
+def downgrade() -> None:
+    op.drop_table("audit_session_user_rollups")
+    op.drop_table("audit_session_user_day_rollups")
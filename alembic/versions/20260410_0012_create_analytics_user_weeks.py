@@ -0,0 +1,99 @@
+"""create analytics user weeks
+
+Revision ID: 20260410_0012
+Revises: 20260406_0011
+Create Date: 2026-04-10 00:00:00
+
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260410_0012"
+down_revision = "20260406_0011"
+branch_labels = None
+depends_on = None
+
+
+def _backfill() -> None:
+    time_entries = sa.table(
+        "audit_session_time_entries",
+        sa.column("user_name", sa.String()),
+        sa.column("description", sa.Text()),
+        sa.column("start_datetime", sa.DateTime()),
+        sa.column("end_datetime", sa.DateTime()),
+        sa.column("duration_hours", sa.Float()),
+    )
+    user_weeks = sa.table(
+        "analytics_user_weeks",
+        sa.column("user_name", sa.String()),
+        sa.column("week_start", sa.Date()),
+        sa.column("hours", sa.Float()),
+        sa.column("entry_count", sa.Integer()),
+        sa.column("day_count", sa.Integer()),
+    )
+
+    connection = op.get_bind()
+    # Entries repeated by overlapping sessions are counted once.
+    rows = connection.execute(
+        sa.select(
+            time_entries.c.user_name,
+            time_entries.c.start_datetime,
+            time_entries.c.end_datetime,
+            time_entries.c.description,
+            sa.func.min(time_entries.c.duration_hours).label("duration_hours"),
+        ).group_by(
+            time_entries.c.user_name,
+            time_entries.c.start_datetime,
+            time_entries.c.end_datetime,
+            time_entries.c.description,
+        )
+    )
+    weeks: dict[tuple, dict] = {}
+    days: dict[tuple, set] = {}
+    for row in rows:
+        day = row.start_datetime.date()
+        key = (row.user_name, day - timedelta(days=day.weekday()))
+        week = weeks.setdefault(
+            key,
+            {"user_name": key[0], "week_start": key[1], "hours": 0.0, "entry_count": 0, "day_count": 0},
+        )
+        week["hours"] += float(row.duration_hours)
+        week["entry_count"] += 1
+        days.setdefault(key, set()).add(day)
+
+    for key, week in weeks.items():
+        week["day_count"] = len(days[key])
+    if weeks:
+        connection.execute(user_weeks.insert(), list(weeks.values()))
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_audit_session_time_entries_user_start",
+        "audit_session_time_entries",
+        ["user_name", "start_datetime"],
+        unique=False,
+    )
+    op.create_table(
+        "analytics_user_weeks",
+        sa.Column("user_name", sa.String(length=255), nullable=False),
+        sa.Column("week_start", sa.Date(), nullable=False),
+        sa.Column("hours", sa.Float(), nullable=False),
+        sa.Column("entry_count", sa.Integer(), nullable=False),
+        sa.Column("day_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("user_name", "week_start"),
+    )
+    op.create_index("ix_analytics_user_weeks_week_start", "analytics_user_weeks", ["week_start"], unique=False)
+    _backfill()
+
+
+def downgrade() -> None:
+    op.drop_index("ix_analytics_user_weeks_week_start", table_name="analytics_user_weeks")
+    op.drop_table("analytics_user_weeks")
+    op.drop_index("ix_audit_session_time_entries_user_start", table_name="audit_session_time_entries")
@@ -0,0 +1,75 @@
+"""index time entry descriptions for search
+
+Revision ID: 20260414_0013
+Revises: 20260410_0012
+Create Date: 2026-04-14 00:00:00
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20260414_0013"
+down_revision = "20260410_0012"
+branch_labels = None
+depends_on = None
+
+
+FTS_TABLE = "audit_session_time_entries_fts"
+FTS_INDEX = "ix_audit_session_time_entries_description_fts"
+
+
+def upgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == "sqlite":
+        # External-content FTS5 table: it indexes the entries' descriptions without storing a second copy.
+        op.execute(
+            f"""
+            CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+                description,
+                content='audit_session_time_entries',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON audit_session_time_entries BEGIN
+                INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.id, new.description);
+            END
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON audit_session_time_entries BEGIN
+                INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) VALUES ('delete', old.id, old.description);
+            END
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE OF description ON audit_session_time_entries BEGIN
+                INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) VALUES ('delete', old.id, old.description);
+                INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.id, new.description);
+            END
+            """
+        )
+        op.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    elif dialect_name == "postgresql":
+        op.execute(
+            f"CREATE INDEX {FTS_INDEX} ON audit_session_time_entries "
+            "USING gin (to_tsvector('simple', description))"
+        )
+
+
+def downgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == "sqlite":
+        for suffix in ("insert", "delete", "update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif dialect_name == "postgresql":
+        op.execute(f"DROP INDEX IF EXISTS {FTS_INDEX}")
@@ -0,0 +1,131 @@
+"""create audit session entry archives
+
+Revision ID: 20260418_0014
+Revises: 20260414_0013
+Create Date: 2026-04-18 00:00:00
+
+"""
+from __future__ import annotations
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+from datetime import datetime, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260418_0014"
+down_revision = "20260414_0013"
+branch_labels = None
+depends_on = None
+
+
+_EPOCH = datetime(1970, 1, 1)
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+def _undeltas(encoded: array) -> list[int]:
+    values = []
+    total = 0
+    for delta in encoded:
+        total += delta
+        values.append(total)
+    return values
+
+
+def _decode_entries(data: bytes) -> list[dict]:
+    """Version 1 of ``backend.archive.decode_entries``, frozen here so the downgrade keeps working."""
+    payload = zlib.decompress(data)
+    (header_length,) = _HEADER_LENGTH.unpack_from(payload)
+    offset = _HEADER_LENGTH.size
+    header = json.loads(payload[offset:offset + header_length])
+    if header["version"] != 1:
+        raise ValueError(f"Unsupported entry archive version {header['version']}.")
+    offset += header_length
+
+    count = header["count"]
+    columns = []
+    for typecode in ("q", "q", "q", "q", "q", "q", "q" if header["duration_scale"] else "d"):
+        column = array(typecode)
+        column.frombytes(payload[offset:offset + count * 8])
+        if sys.byteorder == "big":
+            column.byteswap()
+        columns.append(column)
+        offset += count * 8
+    ids, users, descriptions, tags, starts, lengths, durations = columns
+
+    strings = header["strings"]
+    unit = timedelta(seconds=1) if header["time_scale"] == 1 else timedelta(microseconds=1)
+    duration_scale = header["duration_scale"]
+    entries = []
+    for entry_id, user_code, description_code, tags_code, start, length, duration in zip(
+        _undeltas(ids), users, descriptions, tags, _undeltas(starts), lengths, durations
+    ):
+        start_datetime = _EPOCH + start * unit
+        entries.append(
+            {
+                "id": entry_id,
+                "user_name": strings[user_code],
+                "description": strings[description_code],
+                "tags": strings[tags_code],
+                "start_datetime": start_datetime,
+                "end_datetime": start_datetime + length * unit,
+                "duration_hours": duration / duration_scale if duration_scale else duration,
+            }
+        )
+    return entries
+
+
+def upgrade() -> None:
+    op.add_column("audit_sessions", sa.Column("entries_archived_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_table(
+        "audit_session_entry_archives",
+        sa.Column("audit_session_id", sa.Integer(), nullable=False),
+        sa.Column("format_version", sa.Integer(), nullable=False),
+        sa.Column("entry_count", sa.Integer(), nullable=False),
+        sa.Column("first_start", sa.DateTime(), nullable=False),
+        sa.Column("last_start", sa.DateTime(), nullable=False),
+        sa.Column("user_spans", sa.JSON(), nullable=False),
+        sa.Column("original_bytes", sa.Integer(), nullable=False),
+        sa.Column("archived_bytes", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.ForeignKeyConstraint(["audit_session_id"], ["audit_sessions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("audit_session_id"),
+    )
+
+
+def downgrade() -> None:
+    archives = sa.table(
+        "audit_session_entry_archives",
+        sa.column("audit_session_id", sa.Integer()),
+        sa.column("data", sa.LargeBinary()),
+    )
+    time_entries = sa.table(
+        "audit_session_time_entries",
+        sa.column("id", sa.Integer()),
+        sa.column("audit_session_id", sa.Integer()),
+        sa.column("user_name", sa.String()),
+        sa.column("description", sa.Text()),
+        sa.column("tags", sa.Text()),
+        sa.column("start_datetime", sa.DateTime()),
+        sa.column("end_datetime", sa.DateTime()),
+        sa.column("duration_hours", sa.Float()),
+    )
+    connection = op.get_bind()
+    # Put archived entries back so no session loses its rows along with the table.
+    for row in connection.execute(sa.select(archives)).all():
+        entries = _decode_entries(row.data)
+        if entries:
+            connection.execute(
+                time_entries.insert(),
+                [{**entry, "audit_session_id": row.audit_session_id} for entry in entries],
+            )
+
+    op.drop_table("audit_session_entry_archives")
+    op.drop_column("audit_sessions", "entries_archived_at")
@@ -0,0 +1,242 @@
+from datetime import date, datetime, time, timedelta
+from typing import Any, Iterable
+
+from sqlalchemy import Select, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from backend.archive import archived_entries
+from backend.models import AnalyticsUserWeek, AuditSessionEntryArchive, AuditSessionTimeEntry
+
+
+# First and last entry day per user, used to find the weeks a change can affect.
+EntrySpans = dict[str, tuple[date, date]]
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def entry_spans(time_entries: Iterable[dict[str, Any]]) -> EntrySpans:
+    spans: EntrySpans = {}
+    for entry in time_entries:
+        day = entry["start_datetime"].date()
+        first_day, last_day = spans.get(entry["user_name"], (day, day))
+        spans[entry["user_name"]] = (min(first_day, day), max(last_day, day))
+    return spans
+
+
+def merge_spans(*spans: EntrySpans) -> EntrySpans:
+    merged: EntrySpans = {}
+    for user_spans in spans:
+        for user_name, (first_day, last_day) in user_spans.items():
+            if user_name in merged:
+                first_day = min(first_day, merged[user_name][0])
+                last_day = max(last_day, merged[user_name][1])
+            merged[user_name] = (first_day, last_day)
+    return merged
+
+
+def _stored_spans(user_spans: dict[str, list[str]] | None) -> EntrySpans:
+    return {
+        user_name: (date.fromisoformat(first_day), date.fromisoformat(last_day))
+        for user_name, (first_day, last_day) in (user_spans or {}).items()
+    }
+
+
+def session_entry_spans(db: Session, audit_session_id: int) -> EntrySpans:
+    rows = db.execute(
+        select(
+            AuditSessionTimeEntry.user_name,
+            func.min(AuditSessionTimeEntry.start_datetime),
+            func.max(AuditSessionTimeEntry.start_datetime),
+        )
+        .where(AuditSessionTimeEntry.audit_session_id == audit_session_id)
+        .group_by(AuditSessionTimeEntry.user_name)
+    ).all()
+    spans = {user_name: (first_start.date(), last_start.date()) for user_name, first_start, last_start in rows}
+    archived_spans = db.execute(
+        select(AuditSessionEntryArchive.user_spans).where(AuditSessionEntryArchive.audit_session_id == audit_session_id)
+    ).scalar_one_or_none()
+    return merge_spans(spans, _stored_spans(archived_spans))
+
+
+def compute_user_weeks(time_entries: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Aggregate entries into per user/week rows, counting an entry stored by several sessions once.
+
+    Entries are the same when user, start, end and description match; they land in the week they start in.
+    """
+    seen: set[tuple] = set()
+    weeks: dict[tuple[str, date], dict[str, Any]] = {}
+    days: dict[tuple[str, date], set[date]] = {}
+    for entry in time_entries:
+        key = (entry["user_name"], entry["start_datetime"], entry["end_datetime"], entry["description"])
+        if key in seen:
+            continue
+        seen.add(key)
+
+        day = entry["start_datetime"].date()
+        week_key = (entry["user_name"], week_start(day))
+        row = weeks.get(week_key)
+        if row is None:
+            row = weeks[week_key] = {
+                "user_name": week_key[0],
+                "week_start": week_key[1],
+                "hours": 0.0,
+                "entry_count": 0,
+                "day_count": 0,
+            }
+            days[week_key] = set()
+        row["hours"] += float(entry["duration_hours"])
+        row["entry_count"] += 1
+        days[week_key].add(day)
+
+    for week_key, row in weeks.items():
+        row["day_count"] = len(days[week_key])
+    return [weeks[week_key] for week_key in sorted(weeks)]
+
+
+def refresh_user_weeks(db: Session, spans: EntrySpans) -> None:
+    """Recompute the weeks touched by ``spans`` from the entries of every session, in the current transaction.
+
+    Call it after the entries of a session were replaced or deleted, with the spans of the old and new entries.
+    Archived sessions still count: their entries are decoded from the archives that overlap the spans.
+    """
+    archived_by_user = _archived_entries_by_user(db, spans)
+    for user_name, (first_day, last_day) in spans.items():
+        first_week = week_start(first_day)
+        end_week = week_start(last_day) + timedelta(days=7)
+        db.execute(
+            delete(AnalyticsUserWeek).where(
+                AnalyticsUserWeek.user_name == user_name,
+                AnalyticsUserWeek.week_start >= first_week,
+                AnalyticsUserWeek.week_start < end_week,
+            ),
+            execution_options={"synchronize_session": False},
+        )
+        # Served by the (user_name, start_datetime) index across sessions.
+        time_entries = db.execute(
+            select(
+                AuditSessionTimeEntry.user_name,
+                AuditSessionTimeEntry.description,
+                AuditSessionTimeEntry.start_datetime,
+                AuditSessionTimeEntry.end_datetime,
+                AuditSessionTimeEntry.duration_hours,
+            )
+            .distinct()
+            .where(
+                AuditSessionTimeEntry.user_name == user_name,
+                AuditSessionTimeEntry.start_datetime >= datetime.combine(first_week, time.min),
+                AuditSessionTimeEntry.start_datetime < datetime.combine(end_week, time.min),
+            )
+            # A fixed order keeps the float sums identical across refreshes.
+            .order_by(
+                AuditSessionTimeEntry.start_datetime,
+                AuditSessionTimeEntry.end_datetime,
+                AuditSessionTimeEntry.description,
+                AuditSessionTimeEntry.duration_hours,
+            )
+        ).mappings()
+        start_bound = datetime.combine(first_week, time.min)
+        end_bound = datetime.combine(end_week, time.min)
+        archived = [
+            entry
+            for entry in archived_by_user.get(user_name, ())
+            if start_bound <= entry["start_datetime"] < end_bound
+        ]
+        if archived:
+            time_entries = sorted(
+                [*time_entries, *archived],
+                key=lambda entry: (
+                    entry["start_datetime"],
+                    entry["end_datetime"],
+                    entry["description"],
+                    entry["duration_hours"],
+                ),
+            )
+        rows = compute_user_weeks(time_entries)
+        if rows:
+            db.execute(insert(AnalyticsUserWeek), rows)
+
+
+def _archived_entries_by_user(db: Session, spans: EntrySpans) -> dict[str, list[dict[str, Any]]]:
+    """Entries of the requested users from archives whose stored user spans reach into their weeks."""
+    if not spans:
+        return {}
+    week_windows = {
+        user_name: (week_start(first_day), week_start(last_day) + timedelta(days=7))
+        for user_name, (first_day, last_day) in spans.items()
+    }
+    first_bound = datetime.combine(min(first_week for first_week, _ in week_windows.values()), time.min)
+    end_bound = datetime.combine(max(end_week for _, end_week in week_windows.values()), time.min)
+    candidates = db.execute(
+        select(AuditSessionEntryArchive.audit_session_id, AuditSessionEntryArchive.user_spans).where(
+            AuditSessionEntryArchive.first_start < end_bound,
+            AuditSessionEntryArchive.last_start >= first_bound,
+        )
+    ).all()
+
+    entries_by_user: dict[str, list[dict[str, Any]]] = {}
+    for audit_session_id, user_spans in candidates:
+        overlapping_users = {
+            user_name
+            for user_name, (first_day, last_day) in _stored_spans(user_spans).items()
+            if user_name in week_windows
+            and first_day < week_windows[user_name][1]
+            and last_day >= week_windows[user_name][0]
+        }
+        # Only blobs that hold entries of a requested user in its weeks are decoded.
+        if not overlapping_users:
+            continue
+        for entry in archived_entries(db, audit_session_id) or []:
+            if entry["user_name"] in overlapping_users:
+                entries_by_user.setdefault(entry["user_name"], []).append(entry)
+    return entries_by_user
+
+
+def user_week_query(
+    *,
+    users: list[str] | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> Select:
+    """Weekly rows in (user, week) order; the dates select the weeks that contain them."""
+    query = select(AnalyticsUserWeek).order_by(AnalyticsUserWeek.user_name, AnalyticsUserWeek.week_start)
+    return _filter_weeks(query, users=users, start_date=start_date, end_date=end_date)
+
+
+def user_total_query(
+    *,
+    users: list[str] | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> Select:
+    query = (
+        select(
+            AnalyticsUserWeek.user_name,
+            func.sum(AnalyticsUserWeek.hours).label("hours"),
+            func.sum(AnalyticsUserWeek.entry_count).label("entry_count"),
+            func.sum(AnalyticsUserWeek.day_count).label("day_count"),
+            func.count().label("week_count"),
+            func.min(AnalyticsUserWeek.week_start).label("first_week_start"),
+            func.max(AnalyticsUserWeek.week_start).label("last_week_start"),
+        )
+        .group_by(AnalyticsUserWeek.user_name)
+        .order_by(AnalyticsUserWeek.user_name)
+    )
+    return _filter_weeks(query, users=users, start_date=start_date, end_date=end_date)
+
+
+def _filter_weeks(
+    query: Select,
+    *,
+    users: list[str] | None,
+    start_date: date | None,
+    end_date: date | None,
+) -> Select:
+    if users:
+        query = query.where(AnalyticsUserWeek.user_name.in_(users))
+    if start_date is not None:
+        query = query.where(AnalyticsUserWeek.week_start >= week_start(start_date))
+    if end_date is not None:
+        query = query.where(AnalyticsUserWeek.week_start <= end_date)
+    return query
@@ -0,0 +1,384 @@
+import json
+import struct
+import sys
+import zlib
+from array import array
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta, timezone
+from threading import Lock
+from typing import Any, Iterable
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from backend.models import AuditSession, AuditSessionEntryArchive, AuditSessionTimeEntry, ClockifyRawEntry
+from backend.settings import ARCHIVE_CACHE_SIZE
+from backend.time_entries import TIME_ENTRY_COLUMNS, bulk_insert, decode_time_entry_cursor
+
+
+ARCHIVE_FORMAT_VERSION = 1
+# Estimated storage of one entry row besides its strings: id, session id, two datetimes and the duration.
+ENTRY_ROW_OVERHEAD_BYTES = 48
+# The same for a raw Clockify entry, which also stores when it was last seen.
+RAW_ENTRY_ROW_OVERHEAD_BYTES = 56
+
+_EPOCH = datetime(1970, 1, 1)
+_HEADER_LENGTH = struct.Struct("<I")
+_DURATION_SCALE = 1_000_000
+
+
+def _to_bytes(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _deltas(values: list[int]) -> array:
+    encoded = array("q")
+    previous = 0
+    for value in values:
+        encoded.append(value - previous)
+        previous = value
+    return encoded
+
+
+def _undeltas(encoded: array) -> list[int]:
+    values = []
+    total = 0
+    for delta in encoded:
+        total += delta
+        values.append(total)
+    return values
+
+
+def estimate_entry_bytes(entries: Iterable[dict[str, Any]]) -> int:
+    return sum(
+        len(entry["user_name"].encode("utf-8"))
+        + len(entry["description"].encode("utf-8"))
+        + len(entry["tags"].encode("utf-8"))
+        + ENTRY_ROW_OVERHEAD_BYTES
+        for entry in entries
+    )
+
+
+def estimate_raw_entry_bytes(db: Session, audit_session_id: int) -> int:
+    rows = db.execute(
+        select(
+            ClockifyRawEntry.clockify_entry_id,
+            ClockifyRawEntry.fingerprint,
+            ClockifyRawEntry.user_name,
+            ClockifyRawEntry.description,
+            ClockifyRawEntry.tags,
+        ).where(ClockifyRawEntry.audit_session_id == audit_session_id)
+    )
+    return sum(sum(len(value.encode("utf-8")) for value in row) + RAW_ENTRY_ROW_OVERHEAD_BYTES for row in rows)
+
+
+def encode_entries(entries: list[dict[str, Any]]) -> bytes:
+    """Pack entries into a zlib-compressed columnar blob.
+
+    Strings share one dictionary and are stored as indexes into it; ids and start times are delta-encoded
+    in (user, start, id) order, end times are offsets from the start and durations are micro-hours whenever
+    that is lossless. Every numeric column is little-endian int64 (or float64 durations) before compression.
+    """
+    entries = sorted(entries, key=lambda entry: (entry["user_name"], entry["start_datetime"], entry["id"]))
+    time_scale = 1 if all(
+        entry["start_datetime"].microsecond == 0 and entry["end_datetime"].microsecond == 0 for entry in entries
+    ) else 1_000_000
+    scaled_durations = [round(float(entry["duration_hours"]) * _DURATION_SCALE) for entry in entries]
+    durations_are_exact = all(
+        scaled / _DURATION_SCALE == float(entry["duration_hours"])
+        for scaled, entry in zip(scaled_durations, entries)
+    )
+
+    strings: dict[str, int] = {}
+
+    def string_codes(key: str) -> array:
+        return array("q", (strings.setdefault(entry[key], len(strings)) for entry in entries))
+
+    unit = timedelta(seconds=1) if time_scale == 1 else timedelta(microseconds=1)
+
+    def ticks(value: datetime) -> int:
+        return (value - _EPOCH) // unit
+
+    starts = [ticks(entry["start_datetime"]) for entry in entries]
+    columns = [
+        _deltas([entry["id"] for entry in entries]),
+        string_codes("user_name"),
+        string_codes("description"),
+        string_codes("tags"),
+        _deltas(starts),
+        array("q", (ticks(entry["end_datetime"]) - start for entry, start in zip(entries, starts))),
+        array("q", scaled_durations) if durations_are_exact
+        else array("d", (float(entry["duration_hours"]) for entry in entries)),
+    ]
+    header = json.dumps(
+        {
+            "version": ARCHIVE_FORMAT_VERSION,
+            "count": len(entries),
+            "time_scale": time_scale,
+            "duration_scale": _DURATION_SCALE if durations_are_exact else None,
+            "strings": list(strings),
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+    payload = b"".join([_HEADER_LENGTH.pack(len(header)), header, *(_to_bytes(column) for column in columns)])
+    return zlib.compress(payload, 9)
+
+
+def decode_entries(data: bytes) -> list[dict[str, Any]]:
+    payload = zlib.decompress(data)
+    (header_length,) = _HEADER_LENGTH.unpack_from(payload)
+    offset = _HEADER_LENGTH.size
+    header = json.loads(payload[offset:offset + header_length])
+    if header["version"] != ARCHIVE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported entry archive version {header['version']}.")
+    offset += header_length
+
+    count = header["count"]
+    columns = []
+    for typecode in ("q", "q", "q", "q", "q", "q", "q" if header["duration_scale"] else "d"):
+        size = count * 8
+        columns.append(_from_bytes(typecode, payload[offset:offset + size]))
+        offset += size
+    ids, users, descriptions, tags, starts, lengths, durations = columns
+
+    strings = header["strings"]
+    unit = timedelta(seconds=1) if header["time_scale"] == 1 else timedelta(microseconds=1)
+    duration_scale = header["duration_scale"]
+    entries = []
+    for entry_id, user_code, description_code, tags_code, start, length, duration in zip(
+        _undeltas(ids), users, descriptions, tags, _undeltas(starts), lengths, durations
+    ):
+        start_datetime = _EPOCH + start * unit
+        entries.append(
+            {
+                "id": entry_id,
+                "user_name": strings[user_code],
+                "description": strings[description_code],
+                "tags": strings[tags_code],
+                "start_datetime": start_datetime,
+                "end_datetime": start_datetime + length * unit,
+                "duration_hours": duration / duration_scale if duration_scale else duration,
+            }
+        )
+    return entries
+
+
+def user_start_spans(entries: Iterable[dict[str, Any]]) -> dict[str, list[str]]:
+    """First and last start day per user as ISO dates, stored next to the blob so readers can skip it."""
+    spans: dict[str, tuple[date, date]] = {}
+    for entry in entries:
+        day = entry["start_datetime"].date()
+        first_day, last_day = spans.get(entry["user_name"], (day, day))
+        spans[entry["user_name"]] = (min(first_day, day), max(last_day, day))
+    return {user_name: [first_day.isoformat(), last_day.isoformat()] for user_name, (first_day, last_day) in spans.items()}
+
+
+def archive_may_match(
+    user_spans: dict[str, list[str]],
+    users: list[str] | None = None,
+    first_day: date | None = None,
+    last_day: date | None = None,
+) -> bool:
+    """Whether an archive can hold entries of ``users`` (any user when empty) starting within the given days."""
+    for user_name, (span_first, span_last) in user_spans.items():
+        if users and user_name not in users:
+            continue
+        if last_day is not None and date.fromisoformat(span_first) > last_day:
+            continue
+        if first_day is not None and date.fromisoformat(span_last) < first_day:
+            continue
+        return True
+    return False
+
+
+class DecodedArchiveCache:
+    """Recently decoded archives, so paging through an archived session decodes its blob once.
+
+    Keys are ``(audit_session_id, archived_at)``: an archive is never changed in place, and archiving the
+    session again stamps a new ``archived_at``. Cached entries are shared between readers and must not be
+    modified.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._lock = Lock()
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[int, datetime], list[dict[str, Any]]] = OrderedDict()
+
+    def get(self, key: tuple[int, datetime]) -> list[dict[str, Any]] | None:
+        with self._lock:
+            entries = self._entries.get(key)
+            if entries is not None:
+                self._entries.move_to_end(key)
+            return entries
+
+    def put(self, key: tuple[int, datetime], entries: list[dict[str, Any]]) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entries
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+decoded_archive_cache = DecodedArchiveCache(ARCHIVE_CACHE_SIZE)
+
+
+def archived_entries(db: Session, audit_session_id: int) -> list[dict[str, Any]] | None:
+    archived_at = db.execute(
+        select(AuditSessionEntryArchive.archived_at).where(
+            AuditSessionEntryArchive.audit_session_id == audit_session_id
+        )
+    ).scalar_one_or_none()
+    if archived_at is None:
+        return None
+    key = (audit_session_id, archived_at)
+    entries = decoded_archive_cache.get(key)
+    if entries is None:
+        data = db.execute(
+            select(AuditSessionEntryArchive.data).where(AuditSessionEntryArchive.audit_session_id == audit_session_id)
+        ).scalar_one()
+        entries = decode_entries(data)
+        decoded_archive_cache.put(key, entries)
+    return entries
+
+
+def archive_session_entries(db: Session, audit_session: AuditSession) -> AuditSessionEntryArchive | None:
+    """Move a session's time entries into an archive blob in the current transaction; None when it has none.
+
+    The raw Clockify entries are deleted as well, so the next refresh of the session is a full one.
+    """
+    entries = [
+        dict(row)
+        for row in db.execute(
+            select(*TIME_ENTRY_COLUMNS).where(AuditSessionTimeEntry.audit_session_id == audit_session.id)
+        ).mappings()
+    ]
+    if not entries:
+        return None
+
+    data = encode_entries(entries)
+    archive = AuditSessionEntryArchive(
+        audit_session_id=audit_session.id,
+        format_version=ARCHIVE_FORMAT_VERSION,
+        entry_count=len(entries),
+        first_start=min(entry["start_datetime"] for entry in entries),
+        last_start=max(entry["start_datetime"] for entry in entries),
+        user_spans=user_start_spans(entries),
+        original_bytes=estimate_entry_bytes(entries) + estimate_raw_entry_bytes(db, audit_session.id),
+        archived_bytes=len(data),
+        data=data,
+    )
+    for table in (AuditSessionTimeEntry, ClockifyRawEntry):
+        db.execute(
+            delete(table).where(table.audit_session_id == audit_session.id),
+            execution_options={"synchronize_session": False},
+        )
+    db.add(archive)
+    audit_session.entries_archived_at = datetime.now(timezone.utc)
+    return archive
+
+
+def restore_session_entries(db: Session, audit_session: AuditSession) -> int:
+    """Unpack an archived session back into ``audit_session_time_entries`` with its original ids."""
+    entries = archived_entries(db, audit_session.id)
+    discard_session_archive(db, audit_session)
+    if not entries:
+        return 0
+    return bulk_insert(db, AuditSessionTimeEntry.__table__, audit_session.id, entries)
+
+
+def discard_session_archive(db: Session, audit_session: AuditSession) -> None:
+    db.execute(
+        delete(AuditSessionEntryArchive).where(AuditSessionEntryArchive.audit_session_id == audit_session.id),
+        execution_options={"synchronize_session": False},
+    )
+    audit_session.entries_archived_at = None
+
+
+def archivable_sessions(db: Session, older_than_days: int) -> list[AuditSession]:
+    """Sessions with live entries whose last sync (or creation) is more than ``older_than_days`` ago."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    return list(
+        db.execute(
+            select(AuditSession)
+            .where(
+                AuditSession.entries_archived_at.is_(None),
+                func.coalesce(AuditSession.last_synced_at, AuditSession.created_at) < cutoff,
+                select(AuditSessionTimeEntry.id)
+                .where(AuditSessionTimeEntry.audit_session_id == AuditSession.id)
+                .exists(),
+            )
+            .order_by(AuditSession.id)
+        ).scalars()
+    )
+
+
+def archive_old_sessions(db: Session, older_than_days: int) -> list[dict[str, Any]]:
+    """Archive every eligible session, committing after each one so a long run keeps its progress."""
+    archived = []
+    for audit_session in archivable_sessions(db, older_than_days):
+        archive = archive_session_entries(db, audit_session)
+        db.commit()
+        if archive is not None:
+            archived.append(serialize_archive(archive))
+    return archived
+
+
+def serialize_archive(archive: AuditSessionEntryArchive) -> dict[str, Any]:
+    return {
+        "audit_session_id": archive.audit_session_id,
+        "entry_count": archive.entry_count,
+        "original_bytes": archive.original_bytes,
+        "archived_bytes": archive.archived_bytes,
+        "saved_bytes": archive.original_bytes - archive.archived_bytes,
+        "archived_at": archive.archived_at,
+    }
+
+
+def filter_archived_entries(
+    entries: list[dict[str, Any]],
+    *,
+    users: list[str] | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    search: str | None = None,
+    cursor: str | None = None,
+) -> list[dict[str, Any]]:
+    """Apply the filters and keyset order of ``time_entry_query`` to decoded entries."""
+    start_bound = datetime.combine(start_date, time.min) if start_date is not None else None
+    end_bound = datetime.combine(end_date + timedelta(days=1), time.min) if end_date is not None else None
+    needle = search.casefold() if search else None
+    after = decode_time_entry_cursor(cursor) if cursor else None
+    user_set = set(users or [])
+
+    matches = []
+    for entry in entries:
+        if user_set and entry["user_name"] not in user_set:
+            continue
+        if start_bound is not None and entry["start_datetime"] < start_bound:
+            continue
+        if end_bound is not None and entry["start_datetime"] >= end_bound:
+            continue
+        if needle is not None and needle not in entry["description"].casefold():
+            continue
+        if after is not None and (entry["user_name"], entry["start_datetime"], entry["id"]) <= after:
+            continue
+        matches.append(entry)
+    matches.sort(key=lambda entry: (entry["user_name"], entry["start_datetime"], entry["id"]))
+    return matches
@@ -3,9 +3,9 @@ from typing import Callable
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.database import get_db
+from backend.database import get_async_db
 from backend.login_protection import login_attempt_guard
 from backend.models import Role, User
 from backend.schemas import TokenResponse, UserRead
@@ -16,8 +16,8 @@ router = APIRouter(prefix="/api/auth", tags=["auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-def authenticate_user(db: Session, username: str, password: str) -> User | None:
-    user = db.execute(select(User).where(User.username == username)).scalar_one_or_none()
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> User | None:
+    user = (await db.execute(select(User).where(User.username == username))).scalar_one_or_none()
     if user is None or not user.is_active:
         return None
     if not verify_password(password, user.password_hash):
@@ -27,7 +27,7 @@ def authenticate_user(db: Session, username: str, password: str) -> User | None:
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -46,7 +46,7 @@ async def get_current_user(
     except Exception as exc:
         raise credentials_exception from exc
 
-    user = db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
+    user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
     if user is None or not user.is_active:
         raise credentials_exception
     return user
@@ -65,7 +65,7 @@ def require_roles(*roles: Role) -> Callable:
 async def login(
     request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     client_ip = request.client.host if request.client else "unknown"
     lockout_state = login_attempt_guard.check_lockout(client_ip, form_data.username)
@@ -76,7 +76,7 @@ async def login(
             headers={"Retry-After": str(lockout_state.retry_after_seconds)},
         )
 
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if user is None:
         lockout_state = login_attempt_guard.register_failure(client_ip, form_data.username)
         if lockout_state is not None:
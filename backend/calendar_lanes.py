@@ -0,0 +1,128 @@
+import heapq
+from datetime import date, datetime, time, timedelta
+from typing import Any, Iterable
+
+from sqlalchemy import Select, select
+
+from backend.models import AuditSessionTimeEntry
+from backend.time_entries import TIME_ENTRY_COLUMNS
+
+
+LANE_GROUPINGS = ("day", "user")
+MAX_WINDOW_DAYS = 62
+MINUTES_PER_DAY = 24 * 60
+# Matches the calendar views: shorter events still get a box tall enough to click.
+MIN_EVENT_MINUTES = 15
+
+
+def month_bounds(month: str) -> tuple[date, date]:
+    """First and last day of a ``YYYY-MM`` month."""
+    try:
+        first_day = datetime.strptime(month, "%Y-%m").date()
+    except ValueError as exc:
+        raise ValueError("month must be formatted as YYYY-MM.") from exc
+    next_month = (first_day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return first_day, next_month - timedelta(days=1)
+
+
+def _minutes_of_day(value: datetime) -> float:
+    return value.hour * 60 + value.minute + value.second / 60
+
+
+def lane_entry_query(
+    audit_session_id: int,
+    start_date: date,
+    end_date: date,
+    users: list[str] | None = None,
+) -> Select:
+    """Entries of a session that overlap the days ``start_date`` to ``end_date``, including ones crossing midnight."""
+    query = select(*TIME_ENTRY_COLUMNS).where(
+        AuditSessionTimeEntry.audit_session_id == audit_session_id,
+        AuditSessionTimeEntry.start_datetime < datetime.combine(end_date + timedelta(days=1), time.min),
+        AuditSessionTimeEntry.end_datetime > datetime.combine(start_date, time.min),
+    )
+    if users:
+        query = query.where(AuditSessionTimeEntry.user_name.in_(users))
+    return query
+
+
+def day_segments(entries: Iterable[dict[str, Any]], start_date: date, end_date: date) -> list[dict[str, Any]]:
+    """Cut entries at midnight into one segment per day of the window they cover, in minutes of that day."""
+    segments = []
+    for entry in entries:
+        start, end = entry["start_datetime"], entry["end_datetime"]
+        # An entry ending exactly at midnight does not reach into the next day.
+        last_day = (end - timedelta(microseconds=1)).date() if end > start else start.date()
+        day = max(start.date(), start_date)
+        while day <= min(last_day, end_date):
+            day_start = datetime.combine(day, time.min)
+            start_minutes = _minutes_of_day(start) if start > day_start else 0.0
+            end_minutes = _minutes_of_day(end) if end < day_start + timedelta(days=1) else float(MINUTES_PER_DAY)
+            segments.append(
+                {
+                    **entry,
+                    "day": day,
+                    "segment_start": max(start, day_start),
+                    "start_minutes": min(start_minutes, MINUTES_PER_DAY),
+                    "end_minutes": min(max(end_minutes, start_minutes + MIN_EVENT_MINUTES), MINUTES_PER_DAY),
+                }
+            )
+            day += timedelta(days=1)
+    return segments
+
+
+def assign_lanes(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Give every item the lowest free ``lane_index`` and its cluster's ``lane_count``, in O(n log n).
+
+    Items are ordered by start, user and description. A cluster is a run of transitively overlapping items;
+    all of them share its lane count so their boxes have the same width.
+    """
+    items = sorted(items, key=lambda item: (item["segment_start"], item["user_name"], item["description"]))
+    busy: list[tuple[float, int]] = []
+    free_lanes: list[int] = []
+    cluster: list[dict[str, Any]] = []
+    lane_count = 0
+
+    def close_cluster() -> None:
+        for clustered in cluster:
+            clustered["lane_count"] = lane_count
+
+    for item in items:
+        while busy and busy[0][0] <= item["start_minutes"]:
+            heapq.heappush(free_lanes, heapq.heappop(busy)[1])
+        if not busy:
+            close_cluster()
+            cluster, free_lanes, lane_count = [], [], 0
+
+        if free_lanes:
+            lane_index = heapq.heappop(free_lanes)
+        else:
+            lane_index = lane_count
+            lane_count += 1
+        heapq.heappush(busy, (item["end_minutes"], lane_index))
+        item["lane_index"] = lane_index
+        cluster.append(item)
+    close_cluster()
+    return items
+
+
+def layout_calendar_lanes(
+    entries: Iterable[dict[str, Any]],
+    start_date: date,
+    end_date: date,
+    group_by: str = "day",
+) -> list[dict[str, Any]]:
+    """Lane-assigned day segments of ``entries``, laid out per day or per user and day.
+
+    ``day`` shares lanes between every user on a day, as the week view does; ``user`` gives each user
+    a column of their own, as the day view does.
+    """
+    groups: dict[tuple, list[dict[str, Any]]] = {}
+    for segment in day_segments(entries, start_date, end_date):
+        key = (segment["day"],) if group_by == "day" else (segment["day"], segment["user_name"])
+        groups.setdefault(key, []).append(segment)
+
+    events = []
+    for key in sorted(groups):
+        events.extend(assign_lanes(groups[key]))
+    return events
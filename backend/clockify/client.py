@@ -1,15 +1,28 @@
+import asyncio
 import csv
+import hashlib
 import io
+import json
+import time as time_module
 from dataclasses import dataclass
-from datetime import date, datetime, time, timezone
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
 from typing import Any
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import httpx
+import numpy as np
+import pandas as pd
 
 from backend.settings import (
     CLOCKIFY_API_BASE_URL,
+    CLOCKIFY_CHECKPOINT_DIR,
+    CLOCKIFY_CHECKPOINT_TTL_SECONDS,
+    CLOCKIFY_MAX_RETRIES,
+    CLOCKIFY_PAGE_SIZE,
     CLOCKIFY_REPORTS_BASE_URL,
+    CLOCKIFY_SHARD_CONCURRENCY,
+    CLOCKIFY_SHARD_SIZE,
     CLOCKIFY_WORKSPACE_ID,
     require_clockify_api_key,
 )
@@ -40,14 +53,24 @@ class ClockifyProfile:
 
 
 class ClockifyClient:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        api_key: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        page_size: int = CLOCKIFY_PAGE_SIZE,
+        shard_concurrency: int = CLOCKIFY_SHARD_CONCURRENCY,
+    ) -> None:
         try:
-            self._api_key = require_clockify_api_key()
+            self._api_key = api_key or require_clockify_api_key()
         except RuntimeError as exc:
             raise ClockifyConfigurationError(str(exc)) from exc
         self._api_base_url = CLOCKIFY_API_BASE_URL.rstrip("/")
         self._reports_base_url = CLOCKIFY_REPORTS_BASE_URL.rstrip("/")
         self._workspace_id_override = CLOCKIFY_WORKSPACE_ID
+        self._transport = transport
+        self._page_size = max(page_size, 1)
+        self._shard_concurrency = max(shard_concurrency, 1)
 
     async def get_profile(self) -> ClockifyProfile:
         async with self._get_client() as client:
@@ -79,6 +102,23 @@ class ClockifyClient:
         end_date: date,
         timezone_name: str,
     ) -> str:
+        rows = await self.fetch_detailed_report_rows(
+            start_date=start_date,
+            end_date=end_date,
+            timezone_name=timezone_name,
+        )
+        if not rows:
+            raise ClockifyClientError("Clockify returned no time entries for the selected date range.")
+
+        return self.rows_to_csv(rows)
+
+    async def fetch_detailed_report_rows(
+        self,
+        *,
+        start_date: date,
+        end_date: date,
+        timezone_name: str,
+    ) -> list[dict[str, Any]]:
         if end_date < start_date:
             raise ClockifyClientError("End date must be on or after start date.")
 
@@ -86,54 +126,179 @@ class ClockifyClient:
         profile = await self.get_profile()
         user_map = await self._fetch_workspace_users(profile.workspace_id)
         tag_map = await self._fetch_workspace_tags(profile.workspace_id)
-        start_utc, end_utc = self._date_range_to_utc(start_date, end_date, tzinfo)
+        shards = self._split_date_range(start_date, end_date, CLOCKIFY_SHARD_SIZE)
+        use_checkpoints = len(shards) > 1
+        checkpoint_paths = {
+            shard: self._checkpoint_path(profile.workspace_id, timezone_name, (start_date, end_date), shard)
+            for shard in shards
+        }
+        semaphore = asyncio.Semaphore(self._shard_concurrency)
 
-        rows: list[dict[str, Any]] = []
-        page = 1
-        page_size = 200
         async with self._get_client() as client:
-            try:
-                while True:
-                    payload = {
-                        "dateRangeStart": self._format_utc(start_utc),
-                        "dateRangeEnd": self._format_utc(end_utc),
-                        "dateRangeType": "ABSOLUTE",
-                        "exportType": "JSON",
-                        "timeZone": timezone_name,
-                        "userLocale": "en",
-                        "sortOrder": "ASCENDING",
-                        "detailedFilter": {
-                            "page": page,
-                            "pageSize": page_size,
-                            "sortColumn": "ID",
-                        },
-                    }
-                    data = await self._request_json(
+
+            async def fetch_shard(shard_start: date, shard_end: date) -> list[dict[str, Any]]:
+                checkpoint_path = checkpoint_paths[(shard_start, shard_end)]
+                if use_checkpoints:
+                    checkpointed_rows = self._load_checkpoint(checkpoint_path)
+                    if checkpointed_rows is not None:
+                        return checkpointed_rows
+
+                async with semaphore:
+                    shard_rows = await self._fetch_report_window(
                         client,
-                        "POST",
-                        f"{self._reports_base_url}/workspaces/{profile.workspace_id}/reports/detailed",
-                        json=payload,
+                        profile=profile,
+                        user_map=user_map,
+                        tag_map=tag_map,
+                        tzinfo=tzinfo,
+                        timezone_name=timezone_name,
+                        start_date=shard_start,
+                        end_date=shard_end,
                     )
-                    page_entries = self._extract_entries(data)
-                    rows.extend(self._entries_to_rows(page_entries, user_map, tag_map, tzinfo))
-                    if len(page_entries) < page_size:
-                        break
-                    page += 1
-            except ClockifyHttpError as exc:
-                if exc.status_code != 403:
-                    raise
-                fallback_entries = await self._fetch_workspace_time_entries(
-                    workspace_id=profile.workspace_id,
-                    start_utc=start_utc,
-                    end_utc=end_utc,
-                    fallback_user_id=profile.user_id,
+                if use_checkpoints:
+                    self._save_checkpoint(checkpoint_path, shard_rows)
+                return shard_rows
+
+            # Let every shard finish so the successful ones are checkpointed before reporting a failure.
+            shard_results = await asyncio.gather(
+                *(fetch_shard(shard_start, shard_end) for shard_start, shard_end in shards),
+                return_exceptions=True,
+            )
+
+        for result in shard_results:
+            if isinstance(result, BaseException):
+                raise result
+
+        rows: list[dict[str, Any]] = []
+        seen_entry_ids: set[str] = set()
+        for shard_rows in shard_results:
+            for row in shard_rows:
+                entry_id = row.get("Id")
+                if entry_id:
+                    if entry_id in seen_entry_ids:
+                        continue
+                    seen_entry_ids.add(entry_id)
+                rows.append(row)
+
+        if use_checkpoints:
+            for checkpoint_path in checkpoint_paths.values():
+                checkpoint_path.unlink(missing_ok=True)
+
+        return rows
+
+    async def _fetch_report_window(
+        self,
+        client: httpx.AsyncClient,
+        *,
+        profile: ClockifyProfile,
+        user_map: dict[str, str],
+        tag_map: dict[str, str],
+        tzinfo: ZoneInfo,
+        timezone_name: str,
+        start_date: date,
+        end_date: date,
+    ) -> list[dict[str, Any]]:
+        start_utc, end_utc = self._date_range_to_utc(start_date, end_date, tzinfo)
+
+        report_entries: list[dict[str, Any]] = []
+        page = 1
+        page_size = self._page_size
+        try:
+            while True:
+                payload = {
+                    "dateRangeStart": self._format_utc(start_utc),
+                    "dateRangeEnd": self._format_utc(end_utc),
+                    "dateRangeType": "ABSOLUTE",
+                    "exportType": "JSON",
+                    "timeZone": timezone_name,
+                    "userLocale": "en",
+                    "sortOrder": "ASCENDING",
+                    "detailedFilter": {
+                        "page": page,
+                        "pageSize": page_size,
+                        "sortColumn": "ID",
+                    },
+                }
+                data = await self._request_json(
+                    client,
+                    "POST",
+                    f"{self._reports_base_url}/workspaces/{profile.workspace_id}/reports/detailed",
+                    json=payload,
                 )
-                rows = self._entries_to_rows(fallback_entries, user_map, tag_map, tzinfo)
+                page_entries = self._extract_entries(data)
+                report_entries.extend(page_entries)
+                if len(page_entries) < page_size:
+                    break
+                page += 1
+        except ClockifyHttpError as exc:
+            if exc.status_code != 403:
+                raise
+            report_entries = await self._fetch_workspace_time_entries(
+                workspace_id=profile.workspace_id,
+                start_utc=start_utc,
+                end_utc=end_utc,
+                fallback_user_id=profile.user_id,
+                user_map=user_map,
+            )
 
-        if not rows:
-            raise ClockifyClientError("Clockify returned no time entries for the selected date range.")
+        return self._entries_to_rows(report_entries, user_map, tag_map, tzinfo)
+
+    @staticmethod
+    def _split_date_range(start_date: date, end_date: date, shard_size: str) -> list[tuple[date, date]]:
+        if shard_size not in ("week", "month"):
+            return [(start_date, end_date)]
+
+        shards: list[tuple[date, date]] = []
+        shard_start = start_date
+        while shard_start <= end_date:
+            if shard_size == "week":
+                next_start = shard_start + timedelta(days=7 - shard_start.weekday())
+            elif shard_start.month == 12:
+                next_start = date(shard_start.year + 1, 1, 1)
+            else:
+                next_start = date(shard_start.year, shard_start.month + 1, 1)
+            shard_end = min(next_start - timedelta(days=1), end_date)
+            shards.append((shard_start, shard_end))
+            shard_start = next_start
+        return shards
+
+    def _checkpoint_path(
+        self,
+        workspace_id: str,
+        timezone_name: str,
+        run_range: tuple[date, date],
+        shard: tuple[date, date],
+    ) -> Path:
+        # Keyed on the whole requested range as well, so runs over different ranges that share a month never
+        # reuse or delete each other's checkpoints; a retry of the same range still resumes.
+        key = "|".join(
+            [self._reports_base_url, workspace_id, timezone_name, *(day.isoformat() for day in (*run_range, *shard))]
+        )
+        return CLOCKIFY_CHECKPOINT_DIR / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    @staticmethod
+    def _load_checkpoint(path: Path) -> list[dict[str, Any]] | None:
+        try:
+            stat_result = path.stat()
+        except OSError:
+            return None
+        if time_module.time() - stat_result.st_mtime > CLOCKIFY_CHECKPOINT_TTL_SECONDS:
+            path.unlink(missing_ok=True)
+            return None
 
-        return self._rows_to_csv(rows)
+        try:
+            with path.open(encoding="utf-8") as file_obj:
+                rows = json.load(file_obj)
+        except (OSError, ValueError):
+            return None
+        return rows if isinstance(rows, list) else None
+
+    @staticmethod
+    def _save_checkpoint(path: Path, rows: list[dict[str, Any]]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".tmp")
+        with temp_path.open("w", encoding="utf-8") as file_obj:
+            json.dump(rows, file_obj)
+        temp_path.replace(path)
 
     async def _fetch_workspace_time_entries(
         self,
@@ -142,8 +307,10 @@ class ClockifyClient:
         start_utc: datetime,
         end_utc: datetime,
         fallback_user_id: str | None,
+        user_map: dict[str, str] | None = None,
     ) -> list[dict[str, Any]]:
-        user_map = await self._fetch_workspace_users(workspace_id)
+        if user_map is None:
+            user_map = await self._fetch_workspace_users(workspace_id)
         user_ids = list(user_map)
         if fallback_user_id and fallback_user_id not in user_map:
             user_ids.append(fallback_user_id)
@@ -152,9 +319,11 @@ class ClockifyClient:
         async with self._get_client() as client:
             for user_id in user_ids:
                 page = 1
-                page_size = 200
+                page_size = self._page_size
                 while True:
-                    response = await client.get(
+                    response = await self._send(
+                        client,
+                        "GET",
                         f"{self._api_base_url}/workspaces/{workspace_id}/user/{user_id}/time-entries",
                         params={
                             "start": self._format_utc(start_utc),
@@ -177,10 +346,12 @@ class ClockifyClient:
     async def _fetch_workspace_users(self, workspace_id: str) -> dict[str, str]:
         users: dict[str, str] = {}
         page = 1
-        page_size = 200
+        page_size = self._page_size
         async with self._get_client() as client:
             while True:
-                response = await client.get(
+                response = await self._send(
+                    client,
+                    "GET",
                     f"{self._api_base_url}/workspaces/{workspace_id}/users",
                     params={"page": page, "page-size": page_size},
                 )
@@ -199,10 +370,12 @@ class ClockifyClient:
     async def _fetch_workspace_tags(self, workspace_id: str) -> dict[str, str]:
         tags: dict[str, str] = {}
         page = 1
-        page_size = 200
+        page_size = self._page_size
         async with self._get_client() as client:
             while True:
-                response = await client.get(
+                response = await self._send(
+                    client,
+                    "GET",
                     f"{self._api_base_url}/workspaces/{workspace_id}/tags",
                     params={"page": page, "page-size": page_size},
                 )
@@ -230,7 +403,7 @@ class ClockifyClient:
         raise ClockifyClientError("Clockify detailed report response did not include time entries.")
 
     @staticmethod
-    def _rows_to_csv(rows: list[dict[str, Any]]) -> str:
+    def rows_to_csv(rows: list[dict[str, Any]]) -> str:
         output = io.StringIO()
         writer = csv.DictWriter(
             output,
@@ -244,6 +417,7 @@ class ClockifyClient:
                 "End Time",
                 "Duration (decimal)",
             ],
+            extrasaction="ignore",
         )
         writer.writeheader()
         writer.writerows(rows)
@@ -256,40 +430,63 @@ class ClockifyClient:
         tag_map: dict[str, str],
         tzinfo: ZoneInfo,
     ) -> list[dict[str, Any]]:
-        rows: list[dict[str, Any]] = []
+        columns = self._entries_to_columns(entries, user_map, tag_map, tzinfo)
+        names = list(columns)
+        return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+    def _entries_to_columns(
+        self,
+        entries: list[dict[str, Any]],
+        user_map: dict[str, str],
+        tag_map: dict[str, str],
+        tzinfo: ZoneInfo,
+    ) -> dict[str, list[Any]]:
+        """Convert raw entries into CSV columns, parsing and shifting all timestamps in one batch."""
+        kept_entries: list[dict[str, Any]] = []
+        start_raws: list[str] = []
+        end_raws: list[str] = []
         for entry in entries:
             interval = entry.get("timeInterval") or {}
             start_raw = interval.get("start")
             end_raw = interval.get("end")
             if not start_raw or not end_raw:
                 continue
-
-            start_dt = self._parse_datetime(start_raw).astimezone(tzinfo)
-            end_dt = self._parse_datetime(end_raw).astimezone(tzinfo)
-            duration_hours = round((end_dt - start_dt).total_seconds() / 3600, 6)
-            if duration_hours < 0:
-                continue
-
-            user_name = (
+            kept_entries.append(entry)
+            start_raws.append(start_raw)
+            end_raws.append(end_raw)
+
+        start_utc = pd.to_datetime(start_raws, utc=True, format="ISO8601")
+        end_utc = pd.to_datetime(end_raws, utc=True, format="ISO8601")
+        duration_hours = np.round((end_utc - start_utc).total_seconds().to_numpy() / 3600, 6)
+        keep = duration_hours >= 0
+
+        start_local = self._format_local_datetimes(start_utc[keep], tzinfo)
+        end_local = self._format_local_datetimes(end_utc[keep], tzinfo)
+        kept_entries = [entry for entry, is_kept in zip(kept_entries, keep) if is_kept]
+
+        return {
+            "Id": [entry.get("_id") or entry.get("id") or "" for entry in kept_entries],
+            "User": [
                 entry.get("userName")
                 or (entry.get("user") or {}).get("name")
                 or user_map.get(entry.get("userId", ""))
                 or "Unknown User"
-            )
-            tag_names = self._extract_tag_names(entry, tag_map)
-            rows.append(
-                {
-                    "User": user_name,
-                    "Description": entry.get("description") or "",
-                    "Tags": ", ".join(tag_names),
-                    "Start Date": start_dt.strftime("%d/%m/%Y"),
-                    "Start Time": start_dt.strftime("%H:%M:%S"),
-                    "End Date": end_dt.strftime("%d/%m/%Y"),
-                    "End Time": end_dt.strftime("%H:%M:%S"),
-                    "Duration (decimal)": duration_hours,
-                }
-            )
-        return rows
+                for entry in kept_entries
+            ],
+            "Description": [entry.get("description") or "" for entry in kept_entries],
+            "Tags": [", ".join(self._extract_tag_names(entry, tag_map)) for entry in kept_entries],
+            "Start Date": [value[8:10] + "/" + value[5:7] + "/" + value[0:4] for value in start_local],
+            "Start Time": [value[11:19] for value in start_local],
+            "End Date": [value[8:10] + "/" + value[5:7] + "/" + value[0:4] for value in end_local],
+            "End Time": [value[11:19] for value in end_local],
+            "Duration (decimal)": duration_hours[keep].tolist(),
+        }
+
+    @staticmethod
+    def _format_local_datetimes(values: pd.DatetimeIndex, tzinfo: ZoneInfo) -> list[str]:
+        # Shift to the target zone as a whole array, then render "YYYY-MM-DDTHH:MM:SS" strings in C.
+        local_values = values.tz_convert(tzinfo).tz_localize(None).to_numpy(dtype="datetime64[s]")
+        return np.datetime_as_string(local_values, unit="s").tolist()
 
     @staticmethod
     def _extract_tag_names(entry: dict[str, Any], tag_map: dict[str, str]) -> list[str]:
@@ -324,10 +521,6 @@ class ClockifyClient:
                 unique_names.append(name)
         return unique_names
 
-    @staticmethod
-    def _parse_datetime(value: str) -> datetime:
-        return datetime.fromisoformat(value.replace("Z", "+00:00"))
-
     @staticmethod
     def _format_utc(value: datetime) -> str:
         return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
@@ -347,6 +540,7 @@ class ClockifyClient:
 
     def _get_client(self) -> httpx.AsyncClient:
         return httpx.AsyncClient(
+            transport=self._transport,
             timeout=httpx.Timeout(60.0, connect=20.0),
             headers={
                 "X-Api-Key": self._api_key,
@@ -355,8 +549,22 @@ class ClockifyClient:
             },
         )
 
+    @staticmethod
+    async def _send(client: httpx.AsyncClient, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        for attempt in range(CLOCKIFY_MAX_RETRIES + 1):
+            response = await client.request(method, url, **kwargs)
+            if response.status_code != 429 or attempt == CLOCKIFY_MAX_RETRIES:
+                return response
+
+            try:
+                retry_after = float(response.headers.get("Retry-After", ""))
+            except ValueError:
+                retry_after = 2 ** attempt
+            await asyncio.sleep(min(max(retry_after, 0.0), 30.0))
+        return response
+
     async def _request_json(self, client: httpx.AsyncClient, method: str, url: str, **kwargs: Any) -> dict[str, Any]:
-        response = await client.request(method, url, **kwargs)
+        response = await self._send(client, method, url, **kwargs)
         data = self._parse_json_response(response)
         if not isinstance(data, dict):
             raise ClockifyClientError("Clockify returned an unexpected response format.")
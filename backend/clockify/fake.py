@@ -0,0 +1,218 @@
+import asyncio
+import json
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any
+
+import httpx
+
+
+@dataclass(frozen=True)
+class FakeClockifyConfig:
+    workspace_id: str = "fake-workspace"
+    workspace_name: str = "Fake Workspace"
+    user_count: int = 10
+    tag_count: int = 5
+    start_date: date = date(2026, 1, 1)
+    end_date: date = date(2026, 3, 31)
+    entries_per_user_per_day: int = 6
+    include_weekends: bool = False
+    latency_seconds: float = 0.0
+    latency_jitter_seconds: float = 0.0
+    page_size: int = 200
+    forbid_detailed_report: bool = False
+    rate_limit_every: int = 0
+    rate_limit_retry_after_seconds: float = 0.0
+    seed: int = 7
+
+
+class FakeClockifyApi:
+    def __init__(self, config: FakeClockifyConfig | None = None) -> None:
+        self.config = config or FakeClockifyConfig()
+        self.request_counts: Counter[str] = Counter()
+        self.rate_limited_count = 0
+        self._request_number = 0
+        self._random = random.Random(self.config.seed)
+        self.users = [
+            {"id": f"user-{index:04d}", "name": f"User {index:04d}", "email": f"user{index:04d}@example.com"}
+            for index in range(1, self.config.user_count + 1)
+        ]
+        self.tags = [{"id": f"tag-{index:03d}", "name": f"Tag {index:03d}"} for index in range(1, self.config.tag_count + 1)]
+        self.entries = self._generate_entries()
+        self._window_cache: dict[tuple[str, str, str | None], list[dict[str, Any]]] = {}
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        if self.config.latency_seconds or self.config.latency_jitter_seconds:
+            jitter = self._random.uniform(0, self.config.latency_jitter_seconds)
+            await asyncio.sleep(self.config.latency_seconds + jitter)
+
+        self._request_number += 1
+        if self.config.rate_limit_every and self._request_number % self.config.rate_limit_every == 0:
+            self.rate_limited_count += 1
+            return httpx.Response(
+                429,
+                text="Too many requests",
+                headers={"Retry-After": str(self.config.rate_limit_retry_after_seconds)},
+            )
+
+        path = request.url.path
+        workspace_id = re.escape(self.config.workspace_id)
+        routes = (
+            ("GET", r"^.*/user$", self._get_current_user),
+            ("GET", rf"^.*/workspaces/{workspace_id}$", self._get_workspace),
+            ("GET", rf"^.*/workspaces/{workspace_id}/users$", self._get_users),
+            ("GET", rf"^.*/workspaces/{workspace_id}/tags$", self._get_tags),
+            ("POST", rf"^.*/workspaces/{workspace_id}/reports/detailed$", self._post_detailed_report),
+            ("GET", rf"^.*/workspaces/{workspace_id}/user/(?P<user_id>[^/]+)/time-entries$", self._get_user_time_entries),
+        )
+        for method, pattern, handler in routes:
+            match = re.match(pattern, path)
+            if request.method == method and match:
+                self.request_counts[handler.__name__.lstrip("_")] += 1
+                return handler(request, **match.groupdict())
+
+        self.request_counts["not_found"] += 1
+        return httpx.Response(404, json={"message": f"No fake route for {request.method} {path}"})
+
+    def _generate_entries(self) -> list[dict[str, Any]]:
+        entries: list[dict[str, Any]] = []
+        day = self.config.start_date
+        entry_number = 0
+        while day <= self.config.end_date:
+            if self.config.include_weekends or day.weekday() < 5:
+                for user in self.users:
+                    cursor = datetime.combine(day, time(8, 0), tzinfo=timezone.utc)
+                    for _ in range(self.config.entries_per_user_per_day):
+                        entry_number += 1
+                        # A small share of entries starts before the previous one ended to produce overlaps.
+                        gap_minutes = self._random.choice((-15, 0, 0, 5, 10, 30))
+                        start = cursor + timedelta(minutes=gap_minutes)
+                        end = start + timedelta(minutes=self._random.randint(1, 180))
+                        cursor = end
+                        tag_ids = [tag["id"] for tag in self._random.sample(self.tags, k=min(len(self.tags), 1))]
+                        entries.append(
+                            {
+                                "id": f"entry-{entry_number:08d}",
+                                "description": f"Task {self._random.randint(1, 500)}",
+                                "userId": user["id"],
+                                "userName": user["name"],
+                                "tagIds": tag_ids,
+                                "start": start,
+                                "end": end,
+                            }
+                        )
+            day += timedelta(days=1)
+        return entries
+
+    @staticmethod
+    def _format(value: datetime) -> str:
+        return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    @staticmethod
+    def _parse(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+    @staticmethod
+    def _paginate(items: list[Any], page: int, page_size: int) -> tuple[list[Any], bool]:
+        offset = (max(page, 1) - 1) * page_size
+        page_items = items[offset : offset + page_size]
+        return page_items, offset + page_size >= len(items)
+
+    def _page_params(self, request: httpx.Request) -> tuple[int, int]:
+        page = int(request.url.params.get("page", "1"))
+        page_size = min(int(request.url.params.get("page-size", str(self.config.page_size))), self.config.page_size)
+        return page, page_size
+
+    def _entries_between(self, start_raw: str, end_raw: str, user_id: str | None = None) -> list[dict[str, Any]]:
+        cache_key = (start_raw, end_raw, user_id)
+        if cache_key not in self._window_cache:
+            start, end = self._parse(start_raw), self._parse(end_raw)
+            self._window_cache[cache_key] = [
+                entry
+                for entry in self.entries
+                if start <= entry["start"] <= end and (user_id is None or entry["userId"] == user_id)
+            ]
+        return self._window_cache[cache_key]
+
+    def _get_current_user(self, request: httpx.Request) -> httpx.Response:
+        owner = self.users[0] if self.users else {"id": "owner", "name": "Owner"}
+        return httpx.Response(
+            200,
+            json={
+                "id": owner["id"],
+                "name": owner["name"],
+                "activeWorkspace": self.config.workspace_id,
+                "defaultWorkspace": self.config.workspace_id,
+                "settings": {"timeZone": "UTC"},
+            },
+        )
+
+    def _get_workspace(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"id": self.config.workspace_id, "name": self.config.workspace_name})
+
+    def _get_users(self, request: httpx.Request) -> httpx.Response:
+        page, page_size = self._page_params(request)
+        page_items, last_page = self._paginate(self.users, page, page_size)
+        return httpx.Response(200, json=page_items, headers={"Last-Page": str(last_page).lower()})
+
+    def _get_tags(self, request: httpx.Request) -> httpx.Response:
+        page, page_size = self._page_params(request)
+        page_items, last_page = self._paginate(self.tags, page, page_size)
+        return httpx.Response(200, json=page_items, headers={"Last-Page": str(last_page).lower()})
+
+    def _post_detailed_report(self, request: httpx.Request) -> httpx.Response:
+        if self.config.forbid_detailed_report:
+            return httpx.Response(403, text="Detailed reports are not available on this plan.")
+
+        payload = json.loads(request.content or b"{}")
+        detailed_filter = payload.get("detailedFilter") or {}
+        page = int(detailed_filter.get("page", 1))
+        page_size = min(int(detailed_filter.get("pageSize", self.config.page_size)), self.config.page_size)
+        entries = self._entries_between(payload["dateRangeStart"], payload["dateRangeEnd"])
+        page_items, _ = self._paginate(entries, page, page_size)
+        tag_names = {tag["id"]: tag["name"] for tag in self.tags}
+        return httpx.Response(
+            200,
+            json={
+                "totals": [{"entriesCount": len(entries)}],
+                "timeentries": [
+                    {
+                        "_id": entry["id"],
+                        "description": entry["description"],
+                        "userId": entry["userId"],
+                        "userName": entry["userName"],
+                        "tags": [{"id": tag_id, "name": tag_names[tag_id]} for tag_id in entry["tagIds"]],
+                        "timeInterval": {
+                            "start": self._format(entry["start"]),
+                            "end": self._format(entry["end"]),
+                            "duration": int((entry["end"] - entry["start"]).total_seconds()),
+                        },
+                    }
+                    for entry in page_items
+                ],
+            },
+        )
+
+    def _get_user_time_entries(self, request: httpx.Request, user_id: str) -> httpx.Response:
+        page, page_size = self._page_params(request)
+        entries = self._entries_between(request.url.params["start"], request.url.params["end"], user_id=user_id)
+        page_items, _ = self._paginate(entries, page, page_size)
+        return httpx.Response(
+            200,
+            json=[
+                {
+                    "id": entry["id"],
+                    "description": entry["description"],
+                    "userId": entry["userId"],
+                    "tagIds": entry["tagIds"],
+                    "timeInterval": {"start": self._format(entry["start"]), "end": self._format(entry["end"])},
+                }
+                for entry in page_items
+            ],
+        )
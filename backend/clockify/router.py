@@ -1,12 +1,18 @@
+import asyncio
+from concurrent.futures import Future
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from backend.auth import get_current_user, require_roles
 from backend.clockify.client import ClockifyClient, ClockifyClientError, ClockifyConfigurationError
 from backend.clockify.schemas import ClockifyAuditRequest, ClockifyProfileResponse
-from backend.clockify.service import execute_clockify_audit
-from backend.database import get_db
-from backend.models import Role, User
+from backend.clockify.service import audit_job_key, execute_clockify_audit
+from backend.database import SessionLocal, get_async_db
+from backend.jobs import JobCancelledError, audit_job_runner, create_audit_job
+from backend.models import AuditJob, Role, User
+from backend.schemas import AuditJobRead
 
 
 router = APIRouter(prefix="/api/in/clockify", tags=["clockify"], dependencies=[Depends(get_current_user)])
@@ -30,26 +36,62 @@ async def get_clockify_profile(_: User = Depends(require_roles(Role.ADMIN))) ->
     )
 
 
-@router.post("/audit")
-async def audit_from_clockify(
+async def _submit_clockify_audit_job(
     payload: ClockifyAuditRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(Role.ADMIN)),
-):
+    current_user: User,
+) -> tuple[int, Future]:
     normalized_session_name = payload.session_name.strip() if payload.session_name else None
     if normalized_session_name and current_user.role != Role.ADMIN:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can name sessions.")
+    created_by_user_id = current_user.id
 
-    try:
+    async def run_audit(job_db: Session, progress) -> dict:
         results, _ = await execute_clockify_audit(
-            db=db,
+            db=job_db,
             start_date=payload.start_date,
             end_date=payload.end_date,
             timezone_name=payload.timezone,
             big_task_hours=payload.big_task_hours,
-            created_by_user_id=current_user.id,
+            created_by_user_id=created_by_user_id,
             session_name=normalized_session_name,
+            progress=progress,
         )
+        return results
+
+    def create_job() -> int:
+        with SessionLocal() as job_db:
+            return create_audit_job(
+                job_db,
+                kind="clockify_audit",
+                params=payload.model_dump(mode="json"),
+                created_by_user_id=created_by_user_id,
+            ).id
+
+    key = audit_job_key(
+        start_date=payload.start_date,
+        end_date=payload.end_date,
+        timezone_name=payload.timezone,
+        big_task_hours=payload.big_task_hours,
+        target=("new_session", normalized_session_name),
+    )
+    return await audit_job_runner.submit_or_join(key, create_job, run_audit)
+
+
+@router.post("/audit")
+async def audit_from_clockify(
+    payload: ClockifyAuditRequest,
+    current_user: User = Depends(require_roles(Role.ADMIN)),
+):
+    _, future = await _submit_clockify_audit_job(payload, current_user)
+    try:
+        results = await asyncio.wrap_future(future)
+    except JobCancelledError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    except asyncio.CancelledError as exc:
+        # A job cancelled while still queued never runs, so its future is cancelled instead of raising.
+        if not future.cancelled():
+            raise
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Audit job was cancelled.") from exc
     except ClockifyConfigurationError as exc:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
     except ClockifyClientError as exc:
@@ -59,4 +101,14 @@ async def audit_from_clockify(
     except Exception as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Processing error: {exc}") from exc
 
-    return results
\ No newline at end of file
+    return results
+
+
+@router.post("/audit/jobs", response_model=AuditJobRead, status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_audit_from_clockify(
+    payload: ClockifyAuditRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_roles(Role.ADMIN)),
+):
+    job_id, _ = await _submit_clockify_audit_job(payload, current_user)
+    return AuditJobRead.model_validate(await db.get(AuditJob, job_id))
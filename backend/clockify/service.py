@@ -1,10 +1,45 @@
-from datetime import date, datetime
+from datetime import date, datetime, timezone
 
+from sqlalchemy import exists, func, select
 from sqlalchemy.orm import Session
 
+from backend.analytics import entry_spans, merge_spans, refresh_user_weeks, session_entry_spans
+from backend.archive import discard_session_archive, restore_session_entries
 from backend.clockify.client import ClockifyClient, ClockifyClientError, ClockifyConfigurationError
-from backend.models import AuditSession, AuditSessionTimeEntry
-from time_audit import generate_time_audit
+from backend.clockify.sync import (
+    RawEntryDiff,
+    apply_session_analysis,
+    apply_window_rows,
+    build_raw_entry_values,
+    merge_user_analysis,
+    raw_entries_to_rows,
+    refresh_window,
+    replace_time_entries_for_days,
+)
+from backend.jobs import ProgressCallback
+from backend.models import AuditSession, AuditSessionTimeEntry, ClockifyRawEntry
+from backend.public import OUTPUT_DIR, forget_run_manifest, manifest_for_run
+from backend.rollups import refresh_user_rollups, replace_session_rollups
+from backend.settings import CLOCKIFY_REFRESH_LOOKBACK_DAYS, CLOCKIFY_WORKSPACE_ID, REPORT_LAYOUT
+from backend.time_entries import build_time_entry_values, replace_session_entries
+from time_audit import generate_time_audit, update_run_reports
+
+
+def audit_job_key(
+    *,
+    start_date: date,
+    end_date: date,
+    timezone_name: str,
+    big_task_hours: float,
+    target: tuple,
+) -> tuple:
+    # Every request uses the one configured API key, so the pinned workspace (or its active one) is fixed.
+    workspace = CLOCKIFY_WORKSPACE_ID or "active"
+    return (workspace, start_date.isoformat(), end_date.isoformat(), timezone_name, float(big_task_hours), *target)
+
+
+def _ignore_progress(progress: float, message: str, *, cancellable: bool = True) -> None:
+    return None
 
 
 def serialize_session_reference(session: AuditSession) -> dict:
@@ -16,35 +51,6 @@ def serialize_session_reference(session: AuditSession) -> dict:
     }
 
 
-def _parse_report_datetime(value: str) -> datetime:
-    return datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
-
-
-def _build_time_entry_rows(report_by_user_by_date: dict) -> list[AuditSessionTimeEntry]:
-    time_entries: list[AuditSessionTimeEntry] = []
-    for user_name, dates in (report_by_user_by_date or {}).items():
-        for items in (dates or {}).values():
-            for item in items or []:
-                start_raw = item.get("start_datetime")
-                end_raw = item.get("end_datetime")
-                duration_hours = item.get("duration")
-                if not start_raw or not end_raw or duration_hours is None:
-                    continue
-
-                time_entries.append(
-                    AuditSessionTimeEntry(
-                        user_name=user_name,
-                        description=item.get("description") or "",
-                        start_datetime=_parse_report_datetime(start_raw),
-                        end_datetime=_parse_report_datetime(end_raw),
-                        duration_hours=float(duration_hours),
-                    )
-                )
-
-    time_entries.sort(key=lambda entry: (entry.user_name, entry.start_datetime, entry.end_datetime, entry.description))
-    return time_entries
-
-
 async def execute_clockify_audit(
     *,
     db: Session,
@@ -55,28 +61,39 @@ async def execute_clockify_audit(
     created_by_user_id: int | None = None,
     session_name: str | None = None,
     existing_session: AuditSession | None = None,
+    progress: ProgressCallback | None = None,
 ) -> tuple[dict, AuditSession]:
+    report_progress = progress or _ignore_progress
+    report_progress(0.05, "Fetching Clockify profile")
     client = ClockifyClient()
     profile = await client.get_profile()
-    csv_content = await client.fetch_detailed_report_csv(
+    report_progress(0.1, "Fetching Clockify time entries")
+    rows = await client.fetch_detailed_report_rows(
         start_date=start_date,
         end_date=end_date,
         timezone_name=timezone_name,
     )
+    if not rows:
+        raise ClockifyClientError("Clockify returned no time entries for the selected date range.")
+    synced_at = datetime.now(timezone.utc)
 
+    report_progress(0.6, f"Analyzing {len(rows)} time entries")
     results = generate_time_audit(
-        csv_content=csv_content,
+        csv_content=client.rows_to_csv(rows),
         big_task_hours=big_task_hours,
-        output_dir="output",
+        output_dir=str(OUTPUT_DIR),
         run_dir_name=existing_session.run_dir if existing_session is not None else None,
         write_reports=True,
         retention_hours=24,
+        report_layout=REPORT_LAYOUT,
     )
 
     run_dir = results.get("run_dir")
     if not run_dir:
         raise RuntimeError("Audit completed without a run directory.")
+    forget_run_manifest(run_dir)
 
+    report_progress(0.85, "Saving session", cancellable=False)
     if existing_session is None:
         if created_by_user_id is None:
             raise RuntimeError("A creator is required when persisting a new session.")
@@ -91,10 +108,6 @@ async def execute_clockify_audit(
             end_date=end_date,
             timezone=timezone_name,
             big_task_hours=big_task_hours,
-            time_stats=results.get("time_stats"),
-            overlap_per_user=results.get("overlap_per_user"),
-            small_tasks_per_user=results.get("small_tasks_per_user"),
-            big_tasks_per_user=results.get("big_tasks_per_user"),
             created_by_user_id=created_by_user_id,
         )
     else:
@@ -107,18 +120,142 @@ async def execute_clockify_audit(
         audit_session.end_date = end_date
         audit_session.timezone = timezone_name
         audit_session.big_task_hours = big_task_hours
-        audit_session.time_stats = results.get("time_stats")
-        audit_session.overlap_per_user = results.get("overlap_per_user")
-        audit_session.small_tasks_per_user = results.get("small_tasks_per_user")
-        audit_session.big_tasks_per_user = results.get("big_tasks_per_user")
         if session_name is not None:
             audit_session.name = session_name or None
 
-    audit_session.time_entries = _build_time_entry_rows(results.get("report_by_user_by_date") or {})
-
+    audit_session.report_files = results.get("report_files") or []
+    time_entry_values = build_time_entry_values(results.get("report_by_user_by_date") or {})
+    apply_session_analysis(audit_session, results, entry_count=len(time_entry_values))
+    audit_session.last_synced_at = synced_at
     db.add(audit_session)
+    db.flush()
+    previous_spans = session_entry_spans(db, audit_session.id)
+    if audit_session.entries_archived_at is not None:
+        discard_session_archive(db, audit_session)
+    replace_session_entries(
+        db,
+        audit_session.id,
+        time_entry_values,
+        raw_entries=build_raw_entry_values(rows, synced_at),
+    )
+    replace_session_rollups(db, audit_session.id, time_entry_values)
+    refresh_user_weeks(db, merge_spans(previous_spans, entry_spans(time_entry_values)))
+    db.expire(audit_session, ["time_entries", "raw_entries"])
     db.commit()
     db.refresh(audit_session)
 
     results["session"] = serialize_session_reference(audit_session)
-    return results, audit_session
\ No newline at end of file
+    return results, audit_session
+
+
+def _session_has_raw_entries(db: Session, audit_session: AuditSession) -> bool:
+    return db.execute(
+        select(exists().where(ClockifyRawEntry.audit_session_id == audit_session.id))
+    ).scalar()
+
+
+async def sync_clockify_session(
+    *,
+    db: Session,
+    audit_session: AuditSession,
+    full_refresh: bool = False,
+    progress: ProgressCallback | None = None,
+) -> tuple[dict, AuditSession]:
+    """Refresh a persisted session, re-fetching only its recent window when raw entries are available.
+
+    Sessions without stored raw entries, sessions whose run directory is gone and explicit
+    ``full_refresh`` requests fall back to re-running the whole audit.
+    """
+    run_path = OUTPUT_DIR / audit_session.run_dir
+    if full_refresh or not run_path.is_dir() or not _session_has_raw_entries(db, audit_session):
+        return await execute_clockify_audit(
+            db=db,
+            start_date=audit_session.start_date,
+            end_date=audit_session.end_date,
+            timezone_name=audit_session.timezone,
+            big_task_hours=audit_session.big_task_hours or 8.0,
+            session_name=audit_session.name,
+            existing_session=audit_session,
+            progress=progress,
+        )
+
+    report_progress = progress or _ignore_progress
+    synced_at = datetime.now(timezone.utc)
+    window = refresh_window(audit_session, CLOCKIFY_REFRESH_LOOKBACK_DAYS)
+    if window is not None:
+        report_progress(0.1, f"Fetching Clockify time entries from {window[0].isoformat()}")
+        rows = await ClockifyClient().fetch_detailed_report_rows(
+            start_date=window[0],
+            end_date=window[1],
+            timezone_name=audit_session.timezone,
+        )
+        # Progress is written on its own connection, and on SQLite the writes below hold the only write lock
+        # until the final commit, so this is the last update the job can report.
+        report_progress(0.5, f"Applying {len(rows)} fetched entries and recomputing changed users")
+        diff = apply_window_rows(db, audit_session, rows, window[0], window[1], synced_at)
+    else:
+        diff = RawEntryDiff()
+
+    if audit_session.entries_archived_at is not None:
+        restore_session_entries(db, audit_session)
+
+    affected_users = diff.affected_users
+    if affected_users:
+        user_entries = db.execute(
+            select(ClockifyRawEntry).where(
+                ClockifyRawEntry.audit_session_id == audit_session.id,
+                ClockifyRawEntry.user_name.in_(affected_users),
+            )
+        ).scalars().all()
+        partial_results: dict = {}
+        if user_entries:
+            partial_results = generate_time_audit(
+                csv_content=ClockifyClient.rows_to_csv(raw_entries_to_rows(user_entries)),
+                big_task_hours=audit_session.big_task_hours or 8.0,
+                write_reports=False,
+            )
+
+        report_by_user_by_date = partial_results.get("report_by_user_by_date") or {}
+        merged_results = merge_user_analysis(audit_session, partial_results, affected_users)
+        audit_session.report_files = update_run_reports(
+            str(OUTPUT_DIR),
+            audit_session.run_dir,
+            report_by_user_by_date,
+            removed_users=[user for user in affected_users if user not in report_by_user_by_date],
+        )
+        forget_run_manifest(audit_session.run_dir)
+        replace_time_entries_for_days(
+            db,
+            audit_session,
+            diff.affected_days,
+            build_time_entry_values(report_by_user_by_date),
+        )
+        refresh_user_rollups(db, audit_session.id, affected_users)
+        refresh_user_weeks(db, {user: (min(days), max(days)) for user, days in diff.affected_days.items() if days})
+        entry_count = db.execute(
+            select(func.count()).where(AuditSessionTimeEntry.audit_session_id == audit_session.id)
+        ).scalar_one()
+        apply_session_analysis(audit_session, merged_results, entry_count)
+    elif audit_session.report_files is None:
+        # Sessions saved before manifests were stored in the database.
+        audit_session.report_files = manifest_for_run(run_path)
+
+    # Raw and time entries were changed through the session, not through the relationship collections.
+    db.expire(audit_session, ["time_entries", "raw_entries"])
+    audit_session.last_synced_at = synced_at
+    db.commit()
+    db.refresh(audit_session)
+
+    analysis = audit_session.analysis
+    results = {
+        "overlap_per_user": analysis.overlap_per_user if analysis else None,
+        "time_stats": analysis.time_stats if analysis else None,
+        "small_tasks_per_user": analysis.small_tasks_per_user if analysis else None,
+        "big_tasks_per_user": analysis.big_tasks_per_user if analysis else None,
+        "big_task_hours": audit_session.big_task_hours,
+        "report_files": audit_session.report_files or [],
+        "run_dir": audit_session.run_dir,
+        "sync": diff.as_dict(),
+        "session": serialize_session_reference(audit_session),
+    }
+    return results, audit_session
@@ -0,0 +1,252 @@
+import hashlib
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.orm import Session
+
+from backend.models import AuditSession, AuditSessionAnalysis, AuditSessionTimeEntry, ClockifyRawEntry
+from backend.time_entries import bulk_insert
+
+
+ANALYSIS_KEYS = ("overlap_per_user", "small_tasks_per_user", "big_tasks_per_user")
+ANALYSIS_FIELDS = ("time_stats", *ANALYSIS_KEYS)
+# Stays well below SQLite's bound-parameter limit for IN lists.
+ENTRY_ID_CHUNK_SIZE = 500
+
+
+@dataclass
+class RawEntryDiff:
+    added: int = 0
+    updated: int = 0
+    deleted: int = 0
+    affected_days: dict[str, set[date]] = field(default_factory=lambda: defaultdict(set))
+
+    @property
+    def affected_users(self) -> list[str]:
+        return sorted(self.affected_days)
+
+    def as_dict(self) -> dict:
+        return {
+            "added": self.added,
+            "updated": self.updated,
+            "deleted": self.deleted,
+            "affected_users": self.affected_users,
+            "affected_days": sum(len(days) for days in self.affected_days.values()),
+        }
+
+
+def _parse_row_datetime(row_date: str, row_time: str) -> datetime:
+    return datetime.strptime(f"{row_date} {row_time}", "%d/%m/%Y %H:%M:%S")
+
+
+def fingerprint_row(row: dict[str, Any]) -> str:
+    payload = [
+        row.get("User") or "",
+        row.get("Description") or "",
+        row.get("Tags") or "",
+        row.get("Start Date") or "",
+        row.get("Start Time") or "",
+        row.get("End Date") or "",
+        row.get("End Time") or "",
+        round(float(row.get("Duration (decimal)") or 0), 6),
+    ]
+    return hashlib.sha256(json.dumps(payload).encode("utf-8")).hexdigest()
+
+
+def _raw_entry_values(row: dict[str, Any]) -> dict[str, Any]:
+    fingerprint = fingerprint_row(row)
+    return {
+        "clockify_entry_id": str(row.get("Id") or fingerprint)[:64],
+        "fingerprint": fingerprint,
+        "user_name": row["User"],
+        "description": row.get("Description") or "",
+        "tags": row.get("Tags") or "",
+        "start_datetime": _parse_row_datetime(row["Start Date"], row["Start Time"]),
+        "end_datetime": _parse_row_datetime(row["End Date"], row["End Time"]),
+        "duration_hours": float(row["Duration (decimal)"]),
+    }
+
+
+def build_raw_entry_values(rows: list[dict[str, Any]], seen_at: datetime) -> list[dict[str, Any]]:
+    entries_by_id: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        values = _raw_entry_values(row)
+        entries_by_id[values["clockify_entry_id"]] = {**values, "last_seen_at": seen_at}
+    return list(entries_by_id.values())
+
+
+def raw_entries_to_rows(entries: list[ClockifyRawEntry]) -> list[dict[str, Any]]:
+    return [
+        {
+            "Id": entry.clockify_entry_id,
+            "User": entry.user_name,
+            "Description": entry.description,
+            "Tags": entry.tags,
+            "Start Date": entry.start_datetime.strftime("%d/%m/%Y"),
+            "Start Time": entry.start_datetime.strftime("%H:%M:%S"),
+            "End Date": entry.end_datetime.strftime("%d/%m/%Y"),
+            "End Time": entry.end_datetime.strftime("%H:%M:%S"),
+            "Duration (decimal)": entry.duration_hours,
+        }
+        for entry in sorted(entries, key=lambda item: (item.user_name, item.start_datetime, item.clockify_entry_id))
+    ]
+
+
+def refresh_window(audit_session: AuditSession, lookback_days: int) -> tuple[date, date] | None:
+    """Return the local date range that has to be fetched again, or None when nothing is recent enough."""
+    reference = audit_session.last_synced_at or datetime.now(timezone.utc)
+    window_start = max(audit_session.start_date, reference.date() - timedelta(days=lookback_days))
+    if window_start > audit_session.end_date:
+        return None
+    return window_start, audit_session.end_date
+
+
+def apply_window_rows(
+    db: Session,
+    audit_session: AuditSession,
+    rows: list[dict[str, Any]],
+    window_start: date,
+    window_end: date,
+    seen_at: datetime,
+) -> RawEntryDiff:
+    """Upsert the fetched rows of one window and delete stored entries that disappeared from it."""
+    window_start_dt = datetime.combine(window_start, time.min)
+    window_end_dt = datetime.combine(window_end + timedelta(days=1), time.min)
+    stored_entries = db.execute(
+        select(ClockifyRawEntry).where(
+            ClockifyRawEntry.audit_session_id == audit_session.id,
+            ClockifyRawEntry.start_datetime >= window_start_dt,
+            ClockifyRawEntry.start_datetime < window_end_dt,
+        )
+    ).scalars().all()
+    stored_by_id = {entry.clockify_entry_id: entry for entry in stored_entries}
+
+    fetched_values: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        values = _raw_entry_values(row)
+        fetched_values.setdefault(values["clockify_entry_id"], values)
+
+    # Entries may have been stored outside of the window before their start moved into it; load them in chunks.
+    outside_ids = [entry_id for entry_id in fetched_values if entry_id not in stored_by_id]
+    moved_by_id: dict[str, ClockifyRawEntry] = {}
+    for offset in range(0, len(outside_ids), ENTRY_ID_CHUNK_SIZE):
+        moved_by_id.update(
+            (entry.clockify_entry_id, entry)
+            for entry in db.execute(
+                select(ClockifyRawEntry).where(
+                    ClockifyRawEntry.audit_session_id == audit_session.id,
+                    ClockifyRawEntry.clockify_entry_id.in_(outside_ids[offset:offset + ENTRY_ID_CHUNK_SIZE]),
+                )
+            ).scalars()
+        )
+
+    diff = RawEntryDiff()
+    for entry_id, values in fetched_values.items():
+        stored = stored_by_id.get(entry_id) or moved_by_id.get(entry_id)
+        if stored is None:
+            db.add(ClockifyRawEntry(audit_session_id=audit_session.id, last_seen_at=seen_at, **values))
+            diff.added += 1
+            diff.affected_days[values["user_name"]].add(values["start_datetime"].date())
+            continue
+
+        stored.last_seen_at = seen_at
+        if stored.fingerprint == values["fingerprint"]:
+            continue
+
+        diff.updated += 1
+        diff.affected_days[stored.user_name].add(stored.start_datetime.date())
+        diff.affected_days[values["user_name"]].add(values["start_datetime"].date())
+        for key, value in values.items():
+            setattr(stored, key, value)
+
+    for entry_id, stored in stored_by_id.items():
+        if entry_id in fetched_values:
+            continue
+        diff.deleted += 1
+        diff.affected_days[stored.user_name].add(stored.start_datetime.date())
+        db.delete(stored)
+
+    db.flush()
+    return diff
+
+
+def apply_session_analysis(audit_session: AuditSession, results: dict, entry_count: int) -> None:
+    """Store the analysis blobs on the side table and the summary projection on the session row."""
+    values = {key: results.get(key) for key in ANALYSIS_FIELDS}
+    if audit_session.analysis is None:
+        audit_session.analysis = AuditSessionAnalysis(**values)
+    else:
+        for key, value in values.items():
+            setattr(audit_session.analysis, key, value)
+
+    time_stats = values["time_stats"] or {}
+    audit_session.entry_count = entry_count
+    audit_session.total_hours = float(time_stats.get("total_time") or 0.0)
+    audit_session.user_count = len(time_stats.get("time_per_user") or {})
+    audit_session.overlap_count = sum(len(overlaps or []) for overlaps in (values["overlap_per_user"] or {}).values())
+
+
+def merge_user_analysis(audit_session: AuditSession, partial_results: dict, affected_users: list[str]) -> dict:
+    """Replace the analysis of the affected users with freshly computed values, keeping everyone else."""
+    analysis = audit_session.analysis
+    merged_results: dict = {}
+    for key in ANALYSIS_KEYS:
+        merged = {
+            user: value
+            for user, value in ((getattr(analysis, key) if analysis else None) or {}).items()
+            if user not in affected_users
+        }
+        merged.update(partial_results.get(key) or {})
+        merged_results[key] = dict(sorted(merged.items()))
+
+    time_per_user = {
+        user: value
+        for user, value in (((analysis.time_stats if analysis else None) or {}).get("time_per_user") or {}).items()
+        if user not in affected_users
+    }
+    time_per_user.update(((partial_results.get("time_stats") or {}).get("time_per_user")) or {})
+    merged_results["time_stats"] = {
+        "total_time": float(sum(time_per_user.values())),
+        "time_per_user": dict(sorted(time_per_user.items())),
+    }
+    return merged_results
+
+
+def replace_time_entries_for_days(
+    db: Session,
+    audit_session: AuditSession,
+    affected_days: dict[str, set[date]],
+    time_entries: list[dict[str, Any]],
+) -> None:
+    """Swap the stored time entries of the affected (user, day) pairs for the recomputed ones."""
+    for user_name, days in affected_days.items():
+        day_ranges = [
+            and_(
+                AuditSessionTimeEntry.start_datetime >= datetime.combine(day, time.min),
+                AuditSessionTimeEntry.start_datetime < datetime.combine(day + timedelta(days=1), time.min),
+            )
+            for day in sorted(days)
+        ]
+        db.execute(
+            delete(AuditSessionTimeEntry).where(
+                AuditSessionTimeEntry.audit_session_id == audit_session.id,
+                AuditSessionTimeEntry.user_name == user_name,
+                or_(*day_ranges),
+            ),
+            execution_options={"synchronize_session": False},
+        )
+
+    bulk_insert(
+        db,
+        AuditSessionTimeEntry.__table__,
+        audit_session.id,
+        (
+            time_entry
+            for time_entry in time_entries
+            if time_entry["start_datetime"].date() in affected_days.get(time_entry["user_name"], ())
+        ),
+    )
@@ -1,21 +1,68 @@
-import os
-
-from sqlalchemy import create_engine, inspect, select
+from sqlalchemy import Engine, create_engine, event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from backend.settings import (
     ADMIN_SEED_FULL_NAME,
     ADMIN_SEED_USERNAME,
+    ASYNC_DATABASE_URL,
+    DATABASE_MAX_OVERFLOW,
+    DATABASE_POOL_SIZE,
     DATABASE_URL,
+    SQLITE_BUSY_TIMEOUT_MS,
     require_admin_seed_password,
 )
 
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
+def _sync_database_url(url: str) -> str:
+    # psycopg (v3) serves both the sync and async engines, so plain PostgreSQL URLs don't need psycopg2.
+    for prefix in ("postgres:", "postgresql:"):
+        if url.startswith(prefix):
+            return url.replace(prefix, "postgresql+psycopg:", 1)
+    return url
+
+
+def _async_database_url(url: str) -> str:
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    return _sync_database_url(url)
+
+
+def _configure_sqlite(engine_to_configure: Engine) -> None:
+    @event.listens_for(engine_to_configure, "connect")
+    def set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+        # WAL lets readers proceed while a writer commits; busy_timeout makes writers wait instead of failing.
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+SYNC_DATABASE_URL = _sync_database_url(DATABASE_URL)
+IS_SQLITE = SYNC_DATABASE_URL.startswith("sqlite")
+connect_args = {"check_same_thread": False} if IS_SQLITE else {}
+engine = create_engine(SYNC_DATABASE_URL, connect_args=connect_args, pool_pre_ping=not IS_SQLITE)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL or _async_database_url(DATABASE_URL),
+    pool_size=DATABASE_POOL_SIZE,
+    max_overflow=DATABASE_MAX_OVERFLOW,
+    pool_pre_ping=not IS_SQLITE,
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
+if IS_SQLITE:
+    _configure_sqlite(engine)
+    _configure_sqlite(async_engine.sync_engine)
+
+
+async def async_has_table(db: AsyncSession, table_name: str) -> bool:
+    return await db.run_sync(lambda sync_session: inspect(sync_session.connection()).has_table(table_name))
+
 
 def init_db() -> None:
     with engine.connect():
@@ -55,3 +102,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,270 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import inspect, update
+from sqlalchemy.orm import Session
+
+from backend.database import SessionLocal, engine
+from backend.models import AuditJob, JobStatus
+from backend.settings import AUDIT_JOB_RESULT_TTL_SECONDS, AUDIT_JOB_WORKERS
+
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[..., None]
+JobTarget = Callable[[Session, ProgressCallback], Awaitable[dict]]
+JobKey = tuple[Any, ...]
+
+ACTIVE_JOB_STATUSES = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+class JobCancelledError(Exception):
+    pass
+
+
+class JobConflictError(Exception):
+    pass
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def summarize_job_result(results: dict) -> dict[str, Any]:
+    return {
+        "session": results.get("session"),
+        "run_dir": results.get("run_dir"),
+        "report_file_count": len(results.get("report_files") or []),
+        "sync": results.get("sync"),
+    }
+
+
+def create_audit_job(
+    db: Session,
+    *,
+    kind: str,
+    params: dict[str, Any],
+    created_by_user_id: int,
+    audit_session_id: int | None = None,
+) -> AuditJob:
+    job = AuditJob(
+        kind=kind,
+        status=JobStatus.QUEUED,
+        progress=0.0,
+        message="Queued",
+        params=params,
+        audit_session_id=audit_session_id,
+        created_by_user_id=created_by_user_id,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+class AuditJobRunner:
+    """Runs audit jobs on a thread pool so fetches, analysis and commits stay off the event loop.
+
+    Each job gets its own event loop (for the async Clockify client) and its own database session.
+    Progress and the final state are written to the ``audit_jobs`` row as the job advances.
+    """
+
+    def __init__(self, max_workers: int, result_ttl_seconds: float = 0.0) -> None:
+        self._max_workers = max(max_workers, 1)
+        self._result_ttl_seconds = max(result_ttl_seconds, 0.0)
+        # Re-entrant: done callbacks run inline when a future has already finished.
+        self._lock = threading.RLock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._futures: dict[int, Future] = {}
+        self._cancel_events: dict[int, threading.Event] = {}
+        # Resolves to the (job id, future) of the job submitted for a key, once its row exists.
+        self._in_flight: dict[JobKey, Future] = {}
+        # Maps an exclusive key (one session, say) to the in-flight job key holding it.
+        self._exclusive: dict[JobKey, JobKey] = {}
+        self._recent: dict[JobKey, tuple[int, Future, float, int | None]] = {}
+
+    def submit(self, job_id: int, target: JobTarget) -> Future:
+        with self._lock:
+            return self._submit_locked(job_id, target)
+
+    async def submit_or_join(
+        self,
+        key: JobKey,
+        create_job: Callable[[], int],
+        target: JobTarget,
+        exclusive_key: JobKey | None = None,
+    ) -> tuple[int, Future]:
+        """Single-flight submission: identical requests share one in-flight job and its result.
+
+        A job that finished successfully less than the result TTL ago is shared as well. Jobs with the same
+        ``exclusive_key`` but a different ``key`` are rejected with ``JobConflictError`` while one is in flight.
+        """
+        with self._lock:
+            ticket = self._in_flight.get(key)
+            if ticket is None:
+                recent = self._recent.get(key)
+                if recent is not None:
+                    job_id, future, finished_at, _ = recent
+                    if time.monotonic() - finished_at <= self._result_ttl_seconds:
+                        return job_id, future
+                    del self._recent[key]
+                if exclusive_key is not None:
+                    if exclusive_key in self._exclusive:
+                        raise JobConflictError("Another job for this target is still running.")
+                    self._exclusive[exclusive_key] = key
+                # Reserve the key; the job row is created on a worker thread so the event loop never waits on it.
+                ticket = Future()
+                self._in_flight[key] = ticket
+                loop = asyncio.get_running_loop()
+                loop.run_in_executor(None, self._start, key, exclusive_key, ticket, create_job, target)
+        # Shielded so a disconnecting client doesn't cancel the ticket other requests share.
+        return await asyncio.shield(asyncio.wrap_future(ticket))
+
+    def _start(
+        self,
+        key: JobKey,
+        exclusive_key: JobKey | None,
+        ticket: Future,
+        create_job: Callable[[], int],
+        target: JobTarget,
+    ) -> None:
+        try:
+            job_id = create_job()
+            with self._lock:
+                future = self._submit_locked(job_id, target)
+        except BaseException as exc:
+            with self._lock:
+                self._release(key, exclusive_key)
+            ticket.set_exception(exc)
+            return
+        ticket.set_result((job_id, future))
+        future.add_done_callback(lambda done: self._settle(key, exclusive_key, job_id, done))
+
+    def forget_session(self, session_id: int) -> None:
+        """Drops shared results of jobs that wrote ``session_id``; call it after any other write to the session."""
+        with self._lock:
+            for recent_key, (_, _, _, recent_session_id) in list(self._recent.items()):
+                if recent_session_id == session_id:
+                    del self._recent[recent_key]
+
+    def _submit_locked(self, job_id: int, target: JobTarget) -> Future:
+        cancel_event = threading.Event()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="audit-job")
+        future = self._executor.submit(self._run, job_id, target, cancel_event)
+        self._futures[job_id] = future
+        self._cancel_events[job_id] = cancel_event
+        future.add_done_callback(lambda _: self._forget(job_id))
+        return future
+
+    def _release(self, key: JobKey, exclusive_key: JobKey | None) -> None:
+        self._in_flight.pop(key, None)
+        if exclusive_key is not None and self._exclusive.get(exclusive_key) == key:
+            del self._exclusive[exclusive_key]
+
+    def _settle(self, key: JobKey, exclusive_key: JobKey | None, job_id: int, future: Future) -> None:
+        with self._lock:
+            self._release(key, exclusive_key)
+            now = time.monotonic()
+            for recent_key, (_, _, finished_at, _) in list(self._recent.items()):
+                if now - finished_at > self._result_ttl_seconds:
+                    del self._recent[recent_key]
+            if future.cancelled() or future.exception() is not None:
+                return
+            session_id = (future.result().get("session") or {}).get("id")
+            if session_id is not None:
+                # The job rewrote the session, so results shared for it under other keys are stale.
+                self.forget_session(session_id)
+            if self._result_ttl_seconds:
+                self._recent[key] = (job_id, future, now, session_id)
+
+    def cancel(self, job_id: int) -> bool:
+        with self._lock:
+            future = self._futures.get(job_id)
+            cancel_event = self._cancel_events.get(job_id)
+        if future is None or cancel_event is None:
+            return False
+
+        cancel_event.set()
+        self._update(job_id, cancel_requested=True)
+        if future.cancel():
+            self._update(job_id, status=JobStatus.CANCELLED, message="Cancelled before start", finished_at=_now())
+        return True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+            cancel_events = list(self._cancel_events.values())
+        for cancel_event in cancel_events:
+            cancel_event.set()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _forget(self, job_id: int) -> None:
+        with self._lock:
+            self._futures.pop(job_id, None)
+            self._cancel_events.pop(job_id, None)
+
+    def _run(self, job_id: int, target: JobTarget, cancel_event: threading.Event) -> dict:
+        def report(progress: float, message: str, *, cancellable: bool = True) -> None:
+            if cancellable and cancel_event.is_set():
+                raise JobCancelledError("Audit job was cancelled.")
+            self._update(job_id, progress=max(0.0, min(progress, 1.0)), message=message[:255])
+
+        self._update(job_id, status=JobStatus.RUNNING, message="Started", started_at=_now())
+        try:
+            with SessionLocal() as db:
+                results = asyncio.run(target(db, report))
+        except JobCancelledError:
+            self._update(job_id, status=JobStatus.CANCELLED, message="Cancelled", finished_at=_now())
+            raise
+        except Exception as exc:
+            logger.exception("Audit job %s failed", job_id)
+            self._update(job_id, status=JobStatus.FAILED, message="Failed", error=str(exc), finished_at=_now())
+            raise
+
+        session_reference = results.get("session") or {}
+        self._update(
+            job_id,
+            status=JobStatus.SUCCEEDED,
+            progress=1.0,
+            message="Completed",
+            result=summarize_job_result(results),
+            audit_session_id=session_reference.get("id"),
+            finished_at=_now(),
+        )
+        return results
+
+    @staticmethod
+    def _update(job_id: int, **values: Any) -> None:
+        with SessionLocal() as db:
+            db.execute(update(AuditJob).where(AuditJob.id == job_id).values(**values))
+            db.commit()
+
+
+def fail_interrupted_jobs() -> None:
+    """Jobs only live in this process, so anything still active at startup was interrupted by a restart."""
+    if not inspect(engine).has_table("audit_jobs"):
+        return
+
+    with SessionLocal() as db:
+        db.execute(
+            update(AuditJob)
+            .where(AuditJob.status.in_(ACTIVE_JOB_STATUSES))
+            .values(
+                status=JobStatus.FAILED,
+                message="Interrupted",
+                error="The server restarted before the job finished.",
+                finished_at=_now(),
+            )
+        )
+        db.commit()
+
+
+audit_job_runner = AuditJobRunner(AUDIT_JOB_WORKERS, result_ttl_seconds=AUDIT_JOB_RESULT_TTL_SECONDS)
@@ -0,0 +1,177 @@
+import base64
+import json
+import os
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+
+TAIL_BLOCK_SIZE = 64 * 1024
+# Inodes are reused after rotation deletes the oldest backup, so cursors also check the start of the file.
+HEAD_CHECK_BYTES = 128
+# Upper bound on what one "since cursor" read returns; a client that is further behind keeps following the cursor.
+MAX_READ_BYTES = 1024 * 1024
+
+
+@dataclass
+class LogChunk:
+    content: str
+    line_count: int
+    cursor: str
+    # More complete lines were already written past ``cursor``.
+    has_more: bool = False
+    # The cursor's file was rotated away or truncated, so lines between it and ``content`` were lost.
+    reset: bool = False
+
+
+def encode_log_cursor(inode: int, offset: int, head: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([inode, offset, head]).encode("utf-8")).decode("ascii")
+
+
+def decode_log_cursor(cursor: str) -> tuple[int, int, int]:
+    try:
+        inode, offset, head = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return int(inode), max(int(offset), 0), int(head)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+
+
+def _head_checksum(handle, offset: int) -> int:
+    handle.seek(0)
+    return zlib.crc32(handle.read(min(offset, HEAD_CHECK_BYTES)))
+
+
+def _cursor_for(handle, offset: int) -> str:
+    return encode_log_cursor(os.fstat(handle.fileno()).st_ino, offset, _head_checksum(handle, offset))
+
+
+def _is_cursor_file(handle, inode: int, offset: int, head: int) -> bool:
+    stat_result = os.fstat(handle.fileno())
+    return (
+        stat_result.st_ino == inode
+        and offset <= stat_result.st_size
+        and _head_checksum(handle, offset) == head
+    )
+
+
+def rotated_log_files(path: Path, backup_count: int) -> list[Path]:
+    """``path`` followed by its ``RotatingFileHandler`` backups, newest first."""
+    files = [path]
+    for index in range(1, backup_count + 1):
+        backup = path.with_name(f"{path.name}.{index}")
+        if not backup.is_file():
+            break
+        files.append(backup)
+    return files
+
+
+def _complete_length(handle, size: int) -> int:
+    """Length of ``handle`` up to and including its last newline, at most ``size``."""
+    position = size
+    while position > 0:
+        block = min(TAIL_BLOCK_SIZE, position)
+        position -= block
+        handle.seek(position)
+        newline = handle.read(block).rfind(b"\n")
+        if newline != -1:
+            return position + newline + 1
+    return 0
+
+
+def _last_lines(handle, end: int, max_lines: int) -> list[bytes]:
+    """The last ``max_lines`` newline-terminated lines before ``end``, read in blocks from the end."""
+    if max_lines <= 0 or end <= 0:
+        return []
+    blocks: list[bytes] = []
+    newlines = 0
+    position = end
+    # One newline more than needed guarantees the first kept line starts inside the blocks read.
+    while position > 0 and newlines <= max_lines:
+        block = min(TAIL_BLOCK_SIZE, position)
+        position -= block
+        handle.seek(position)
+        data = handle.read(block)
+        blocks.append(data)
+        newlines += data.count(b"\n")
+    lines = b"".join(reversed(blocks)).split(b"\n")[:-1]
+    return [line + b"\n" for line in lines[-max_lines:]]
+
+
+def tail_log(path: Path, max_lines: int, backup_count: int = 0) -> LogChunk:
+    """The last ``max_lines`` complete lines of a log, continuing into rotated backups when it is short.
+
+    Reads backwards from the end, so the cost depends on ``max_lines`` rather than on the file size.
+    The returned cursor points just past the last complete line of ``path``.
+    """
+    collected: list[bytes] = []
+    cursor = None
+    for log_file in rotated_log_files(path, backup_count):
+        try:
+            with log_file.open("rb") as handle:
+                end = _complete_length(handle, os.fstat(handle.fileno()).st_size)
+                if cursor is None:
+                    cursor = _cursor_for(handle, end)
+                collected[:0] = _last_lines(handle, end, max_lines - len(collected))
+        except FileNotFoundError:
+            # Rotated while we were reading; what was collected so far is still a valid tail.
+            break
+        if len(collected) >= max_lines:
+            break
+    return LogChunk(
+        content=b"".join(collected).decode("utf-8", errors="replace"),
+        line_count=len(collected),
+        cursor=cursor or encode_log_cursor(0, 0, 0),
+    )
+
+
+def _read_complete(handle, offset: int, limit: int) -> tuple[bytes, bool]:
+    """Complete lines from ``offset``, at most ``limit`` bytes unless a single line is longer."""
+    handle.seek(offset)
+    data = handle.read(limit + 1)
+    truncated = len(data) > limit
+    data = data[:limit]
+    newline = data.rfind(b"\n")
+    if newline != -1:
+        return data[:newline + 1], truncated
+    # A single line longer than ``limit`` is returned in pieces so the cursor still moves.
+    return (data, True) if truncated else (b"", False)
+
+
+def read_log_since(path: Path, cursor: str, backup_count: int = 0, limit: int = MAX_READ_BYTES) -> LogChunk:
+    """Complete lines written to a log after ``cursor``, reading at most ``limit`` bytes.
+
+    When ``path`` was rotated since the cursor was issued, the rest of the rotated file is read first.
+    A cursor whose file is gone (or was truncated) restarts at the beginning of ``path`` with ``reset`` set.
+    """
+    inode, offset, head = decode_log_cursor(cursor)
+    with path.open("rb") as handle:
+        reset = False
+        if not _is_cursor_file(handle, inode, offset, head):
+            for backup in rotated_log_files(path, backup_count)[1:]:
+                try:
+                    with backup.open("rb") as backup_handle:
+                        if not _is_cursor_file(backup_handle, inode, offset, head):
+                            continue
+                        data, has_more = _read_complete(backup_handle, offset, limit)
+                except FileNotFoundError:
+                    continue
+                if data or has_more:
+                    return LogChunk(
+                        content=data.decode("utf-8", errors="replace"),
+                        line_count=data.count(b"\n"),
+                        cursor=encode_log_cursor(inode, offset + len(data), head),
+                        has_more=True,
+                    )
+                break
+            else:
+                reset = True
+            offset = 0
+
+        data, has_more = _read_complete(handle, offset, limit)
+        return LogChunk(
+            content=data.decode("utf-8", errors="replace"),
+            line_count=data.count(b"\n"),
+            cursor=_cursor_for(handle, offset + len(data)),
+            has_more=has_more,
+            reset=reset,
+        )
@@ -11,6 +11,7 @@ APP_LOG_FILE = Path(os.getenv("TIME_AUDIT_LOG_FILE", LOG_DIR / "time-audit.log")
 APP_LOG_LEVEL = os.getenv("TIME_AUDIT_LOG_LEVEL", "INFO").upper()
 APP_LOG_MAX_BYTES = int(os.getenv("TIME_AUDIT_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
 APP_LOG_BACKUP_COUNT = int(os.getenv("TIME_AUDIT_LOG_BACKUP_COUNT", "5"))
+APP_LOG_STREAM_POLL_SECONDS = float(os.getenv("TIME_AUDIT_LOG_STREAM_POLL_SECONDS", "1"))
 
 
 def _has_file_handler(logger: logging.Logger) -> bool:
@@ -9,10 +9,11 @@ from starlette.responses import Response
 
 from backend.auth import router as auth_router
 from backend.clockify import router as clockify_router
-from backend.database import DATABASE_URL, init_db
+from backend.database import engine, init_db
+from backend.jobs import audit_job_runner, fail_interrupted_jobs
 from backend.logging_config import APP_LOG_FILE, configure_application_logging
 from backend.private import router as private_router
-from backend.public import router as public_router
+from backend.public import router as public_router, shutdown_csv_audit_pool
 
 
 configure_application_logging()
@@ -22,8 +23,11 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     init_db()
+    fail_interrupted_jobs()
     logger.info("Application startup complete. Log file: %s", APP_LOG_FILE)
     yield
+    audit_job_runner.shutdown()
+    shutdown_csv_audit_pool()
 
 
 app = FastAPI(title="Time Audit API", lifespan=lifespan)
@@ -45,7 +49,8 @@ app.include_router(private_router)
 
 @app.get("/api/health")
 async def health():
-    return {"status": "ok", "database_url": DATABASE_URL}
+    # Server URLs carry credentials; only the SQLite file path is useful to show unmasked.
+    return {"status": "ok", "database_url": engine.url.render_as_string(hide_password=True)}
 
 # Serve the built SPA for non-API routes, including direct deep links like /login.
 FRONTEND_DIST = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "frontend", "dist"))
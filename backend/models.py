@@ -3,7 +3,22 @@ from datetime import date
 from enum import Enum
 from typing import Any
 
-from sqlalchemy import JSON, Boolean, Date, DateTime, Enum as SqlEnum, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Date,
+    DateTime,
+    Enum as SqlEnum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.database import Base
@@ -22,6 +37,21 @@ ROLE_ENUM = SqlEnum(
 )
 
 
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+JOB_STATUS_ENUM = SqlEnum(
+    JobStatus,
+    native_enum=False,
+    values_callable=lambda enum_class: [member.value for member in enum_class],
+)
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -37,6 +67,11 @@ class User(Base):
 
 class AuditSession(Base):
     __tablename__ = "audit_sessions"
+    __table_args__ = (
+        Index("ix_audit_sessions_created_by_user_id_id", "created_by_user_id", "id"),
+        Index("ix_audit_sessions_clockify_workspace_id_id", "clockify_workspace_id", "id"),
+        Index("ix_audit_sessions_start_date_end_date", "start_date", "end_date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str | None] = mapped_column(String(255), nullable=True)
@@ -48,24 +83,68 @@ class AuditSession(Base):
     end_date: Mapped[date | None] = mapped_column(Date(), nullable=True)
     timezone: Mapped[str | None] = mapped_column(String(128), nullable=True)
     big_task_hours: Mapped[float | None] = mapped_column(Float(), nullable=True)
-    time_stats: Mapped[dict[str, Any] | None] = mapped_column(JSON(), nullable=True)
-    overlap_per_user: Mapped[dict[str, Any] | None] = mapped_column(JSON(), nullable=True)
-    small_tasks_per_user: Mapped[dict[str, Any] | None] = mapped_column(JSON(), nullable=True)
-    big_tasks_per_user: Mapped[dict[str, Any] | None] = mapped_column(JSON(), nullable=True)
+    entry_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    total_hours: Mapped[float] = mapped_column(Float(), nullable=False, default=0.0, server_default="0")
+    user_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    overlap_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    report_files: Mapped[list[dict[str, Any]] | None] = mapped_column(JSON(), nullable=True)
     created_by_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_synced_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    entries_archived_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     created_by: Mapped[User] = relationship(back_populates="audit_sessions")
+    analysis: Mapped["AuditSessionAnalysis | None"] = relationship(
+        back_populates="audit_session",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        uselist=False,
+    )
     time_entries: Mapped[list["AuditSessionTimeEntry"]] = relationship(
         back_populates="audit_session",
         cascade="all, delete-orphan",
         passive_deletes=True,
         order_by="AuditSessionTimeEntry.start_datetime",
     )
+    raw_entries: Mapped[list["ClockifyRawEntry"]] = relationship(
+        back_populates="audit_session",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    entry_archive: Mapped["AuditSessionEntryArchive | None"] = relationship(
+        back_populates="audit_session",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        uselist=False,
+    )
+
+
+class AuditSessionAnalysis(Base):
+    __tablename__ = "audit_session_analyses"
+
+    audit_session_id: Mapped[int] = mapped_column(
+        ForeignKey("audit_sessions.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    time_stats: Mapped[dict[str, Any] | None] = mapped_column(JSON(), nullable=True)
+    overlap_per_user: Mapped[dict[str, Any] | None] = mapped_column(JSON(), nullable=True)
+    small_tasks_per_user: Mapped[dict[str, Any] | None] = mapped_column(JSON(), nullable=True)
+    big_tasks_per_user: Mapped[dict[str, Any] | None] = mapped_column(JSON(), nullable=True)
+
+    audit_session: Mapped[AuditSession] = relationship(back_populates="analysis")
 
 
 class AuditSessionTimeEntry(Base):
     __tablename__ = "audit_session_time_entries"
+    __table_args__ = (
+        Index(
+            "ix_audit_session_time_entries_session_user_start",
+            "audit_session_id",
+            "user_name",
+            "start_datetime",
+        ),
+        Index("ix_audit_session_time_entries_user_start", "user_name", "start_datetime"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     audit_session_id: Mapped[int] = mapped_column(
@@ -75,8 +154,123 @@ class AuditSessionTimeEntry(Base):
     )
     user_name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     description: Mapped[str] = mapped_column(Text(), nullable=False, default="", server_default="")
+    tags: Mapped[str] = mapped_column(Text(), nullable=False, default="", server_default="")
     start_datetime: Mapped[datetime] = mapped_column(DateTime(), nullable=False, index=True)
     end_datetime: Mapped[datetime] = mapped_column(DateTime(), nullable=False)
     duration_hours: Mapped[float] = mapped_column(Float(), nullable=False)
 
-    audit_session: Mapped[AuditSession] = relationship(back_populates="time_entries")
\ No newline at end of file
+    audit_session: Mapped[AuditSession] = relationship(back_populates="time_entries")
+
+
+class AuditSessionEntryArchive(Base):
+    """A session's time entries packed into one compressed columnar blob (see ``backend.archive``)."""
+
+    __tablename__ = "audit_session_entry_archives"
+
+    audit_session_id: Mapped[int] = mapped_column(
+        ForeignKey("audit_sessions.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    format_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    entry_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    first_start: Mapped[datetime] = mapped_column(DateTime(), nullable=False)
+    last_start: Mapped[datetime] = mapped_column(DateTime(), nullable=False)
+    # {user_name: [first start day, last start day]}, so analytics can tell which archives to decode.
+    user_spans: Mapped[dict[str, list[str]]] = mapped_column(JSON, nullable=False)
+    original_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    archived_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary(), nullable=False, deferred=True)
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    audit_session: Mapped[AuditSession] = relationship(back_populates="entry_archive")
+
+
+class AuditSessionUserDayRollup(Base):
+    __tablename__ = "audit_session_user_day_rollups"
+
+    audit_session_id: Mapped[int] = mapped_column(
+        ForeignKey("audit_sessions.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    day: Mapped[date] = mapped_column(Date(), primary_key=True)
+    hours: Mapped[float] = mapped_column(Float(), nullable=False)
+    entry_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    overlap_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    first_start: Mapped[datetime] = mapped_column(DateTime(), nullable=False)
+    last_end: Mapped[datetime] = mapped_column(DateTime(), nullable=False)
+
+
+class AuditSessionUserRollup(Base):
+    __tablename__ = "audit_session_user_rollups"
+
+    audit_session_id: Mapped[int] = mapped_column(
+        ForeignKey("audit_sessions.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    hours: Mapped[float] = mapped_column(Float(), nullable=False)
+    entry_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    overlap_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    day_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    first_start: Mapped[datetime] = mapped_column(DateTime(), nullable=False)
+    last_end: Mapped[datetime] = mapped_column(DateTime(), nullable=False)
+
+
+class AnalyticsUserWeek(Base):
+    """Hours per user and ISO week across every session, counting entries shared by overlapping sessions once."""
+
+    __tablename__ = "analytics_user_weeks"
+    __table_args__ = (Index("ix_analytics_user_weeks_week_start", "week_start"),)
+
+    user_name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    week_start: Mapped[date] = mapped_column(Date(), primary_key=True)
+    hours: Mapped[float] = mapped_column(Float(), nullable=False)
+    entry_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    day_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class ClockifyRawEntry(Base):
+    __tablename__ = "clockify_raw_entries"
+    __table_args__ = (UniqueConstraint("audit_session_id", "clockify_entry_id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    audit_session_id: Mapped[int] = mapped_column(
+        ForeignKey("audit_sessions.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    clockify_entry_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    user_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[str] = mapped_column(Text(), nullable=False, default="", server_default="")
+    tags: Mapped[str] = mapped_column(Text(), nullable=False, default="", server_default="")
+    start_datetime: Mapped[datetime] = mapped_column(DateTime(), nullable=False, index=True)
+    end_datetime: Mapped[datetime] = mapped_column(DateTime(), nullable=False)
+    duration_hours: Mapped[float] = mapped_column(Float(), nullable=False)
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    audit_session: Mapped[AuditSession] = relationship(back_populates="raw_entries")
+
+
+class AuditJob(Base):
+    __tablename__ = "audit_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)
+    status: Mapped[JobStatus] = mapped_column(JOB_STATUS_ENUM, nullable=False, default=JobStatus.QUEUED, index=True)
+    progress: Mapped[float] = mapped_column(Float(), nullable=False, default=0.0, server_default="0")
+    message: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    params: Mapped[dict[str, Any] | None] = mapped_column(JSON(), nullable=True)
+    result: Mapped[dict[str, Any] | None] = mapped_column(JSON(), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text(), nullable=True)
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default="0")
+    audit_session_id: Mapped[int | None] = mapped_column(
+        ForeignKey("audit_sessions.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+    created_by_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
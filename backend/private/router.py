@@ -1,35 +1,100 @@
-from collections import deque
-from datetime import datetime, timezone
-from pathlib import Path
-
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import inspect, select
-from sqlalchemy.orm import Session
-
+import asyncio
+import json
+from concurrent.futures import Future
+from datetime import date, datetime, time, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from backend.analytics import refresh_user_weeks, session_entry_spans, user_total_query, user_week_query
+from backend.archive import (
+    archive_may_match,
+    archive_old_sessions,
+    decode_entries,
+    decoded_archive_cache,
+    filter_archived_entries,
+    serialize_archive,
+)
 from backend.auth import get_current_user, require_roles
+from backend.calendar_lanes import (
+    LANE_GROUPINGS,
+    MAX_WINDOW_DAYS,
+    lane_entry_query,
+    layout_calendar_lanes,
+    month_bounds,
+)
 from backend.clockify.client import ClockifyClientError, ClockifyConfigurationError
-from backend.clockify.service import execute_clockify_audit
-from backend.database import engine, get_db
-from backend.logging_config import APP_LOG_FILE
-from backend.models import AuditSession, Role, User
-from backend.schemas import ApplicationLogRead, AuditSessionRead, AuditSessionUpdate, UserCreate, UserRead, UserUpdate
-from backend.public import OUTPUT_DIR, build_reports_zip_response, manifest_for_run, remove_run_directory
+from backend.clockify.service import audit_job_key, sync_clockify_session
+from backend.database import SessionLocal, async_has_table, get_async_db
+from backend.jobs import ACTIVE_JOB_STATUSES, JobCancelledError, JobConflictError, audit_job_runner, create_audit_job
+from backend.log_tail import decode_log_cursor, read_log_since, tail_log
+from backend.logging_config import APP_LOG_BACKUP_COUNT, APP_LOG_FILE, APP_LOG_STREAM_POLL_SECONDS
+from backend.models import (
+    AuditJob,
+    AuditSession,
+    AuditSessionEntryArchive,
+    AuditSessionUserDayRollup,
+    AuditSessionUserRollup,
+    Role,
+    User,
+)
+from backend.schemas import (
+    AnalyticsUserTotalRead,
+    AnalyticsUserWeekRead,
+    ApplicationLogRead,
+    AuditJobRead,
+    AuditSessionAnalysisRead,
+    AuditSessionRead,
+    AuditSessionUpdate,
+    CalendarLaneEvent,
+    CalendarLaneLayout,
+    CalendarMonthDay,
+    CalendarMonthSummary,
+    EntryArchiveRead,
+    EntryArchiveReport,
+    TimeEntryPage,
+    TimeEntryRead,
+    TimeEntrySearchHit,
+    TimeEntrySearchPage,
+    UserCreate,
+    UserDayRollupRead,
+    UserRead,
+    UserRollupRead,
+    UserUpdate,
+)
+from backend.public import (
+    OUTPUT_DIR,
+    build_reports_zip_response,
+    manifest_for_run,
+    remove_run_directory,
+    report_file_members,
+)
+from backend.search import encode_search_cursor, entry_search_query
 from backend.security import get_password_hash
+from backend.settings import ARCHIVE_AFTER_DAYS
+from backend.time_entries import encode_time_entry_cursor, split_tags, time_entry_query
 
 
 router = APIRouter(prefix="/api/in", tags=["private"], dependencies=[Depends(get_current_user)])
 
+LOG_STREAM_KEEPALIVE_SECONDS = 15.0
 
-def _tail_log_file(path: Path, max_lines: int) -> tuple[str, int]:
-    collected_lines: deque[str] = deque(maxlen=max_lines)
-    with path.open("r", encoding="utf-8", errors="replace") as handle:
-        for line in handle:
-            collected_lines.append(line)
-    content = "".join(collected_lines)
-    return content, len(collected_lines)
 
+def _read_log(max_lines: int, cursor: str | None):
+    if cursor:
+        return read_log_since(APP_LOG_FILE, cursor, APP_LOG_BACKUP_COUNT)
+    return tail_log(APP_LOG_FILE, max_lines, APP_LOG_BACKUP_COUNT)
 
-def _serialize_audit_session(session: AuditSession, report_files: list[dict]) -> AuditSessionRead:
+
+def _serialize_audit_session(
+    session: AuditSession,
+    report_files: list[dict],
+    run_available: bool = True,
+) -> AuditSessionRead:
     return AuditSessionRead(
         id=session.id,
         name=session.name,
@@ -43,23 +108,20 @@ def _serialize_audit_session(session: AuditSession, report_files: list[dict]) ->
         end_date=session.end_date.isoformat() if session.end_date else None,
         timezone=session.timezone,
         big_task_hours=session.big_task_hours,
-        time_stats=session.time_stats,
-        overlap_per_user=session.overlap_per_user,
-        small_tasks_per_user=session.small_tasks_per_user,
-        big_tasks_per_user=session.big_tasks_per_user,
+        entry_count=session.entry_count,
+        total_hours=session.total_hours,
+        user_count=session.user_count,
+        overlap_count=session.overlap_count,
+        entries_archived_at=session.entries_archived_at,
         is_legacy=False,
+        run_available=run_available,
     )
-def _sort_timestamp(value: datetime | None) -> datetime:
-    if value is None:
-        return datetime.min.replace(tzinfo=timezone.utc)
-    if value.tzinfo is None:
-        return value.replace(tzinfo=timezone.utc)
-    return value.astimezone(timezone.utc)
 
 
 @router.get("/logs", response_model=ApplicationLogRead)
 async def read_application_logs(
     lines: int = Query(200, ge=50, le=2000),
+    cursor: str | None = Query(None, description="Return only the lines written after this next_cursor."),
     _: User = Depends(require_roles(Role.ADMIN)),
 ):
     if not APP_LOG_FILE.is_file():
@@ -68,54 +130,512 @@ async def read_application_logs(
             path=str(APP_LOG_FILE),
         )
 
+    try:
+        chunk = await run_in_threadpool(_read_log, lines, cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     stat_result = APP_LOG_FILE.stat()
-    content, line_count = _tail_log_file(APP_LOG_FILE, lines)
     return ApplicationLogRead(
         available=True,
         path=str(APP_LOG_FILE),
-        content=content,
-        line_count=line_count,
+        content=chunk.content,
+        line_count=chunk.line_count,
         updated_at=datetime.fromtimestamp(stat_result.st_mtime, tz=timezone.utc),
         size_bytes=stat_result.st_size,
+        next_cursor=chunk.cursor,
+        has_more=chunk.has_more,
+        reset=chunk.reset,
     )
 
 
-@router.get("/runs")
-async def list_runs(db: Session = Depends(get_db)):
-    items: list[AuditSessionRead] = []
-
-    if inspect(engine).has_table("audit_sessions"):
-        sessions = db.execute(
-            select(AuditSession).order_by(AuditSession.created_at.desc(), AuditSession.id.desc())
-        ).scalars().all()
-        for session in sessions:
-            run_path = OUTPUT_DIR / session.run_dir
-            if not run_path.is_dir():
+async def _iter_log_events(request: Request, cursor: str | None):
+    idle_seconds = 0.0
+    while not await request.is_disconnected():
+        chunk = None
+        if APP_LOG_FILE.is_file():
+            # Without a cursor the stream starts at the current end of the log.
+            chunk = await run_in_threadpool(_read_log, 0, cursor)
+            if cursor is None:
+                cursor = chunk.cursor
+                chunk = None
+
+        if chunk is not None and (chunk.content or chunk.reset):
+            cursor = chunk.cursor
+            payload = {"content": chunk.content, "line_count": chunk.line_count, "reset": chunk.reset}
+            yield f"id: {cursor}\nevent: lines\ndata: {json.dumps(payload)}\n\n"
+            idle_seconds = 0.0
+            if chunk.has_more:
                 continue
-            items.append(_serialize_audit_session(session, manifest_for_run(run_path)))
+        elif idle_seconds >= LOG_STREAM_KEEPALIVE_SECONDS:
+            yield ": keepalive\n\n"
+            idle_seconds = 0.0
+
+        await asyncio.sleep(APP_LOG_STREAM_POLL_SECONDS)
+        idle_seconds += APP_LOG_STREAM_POLL_SECONDS
 
-    items.sort(key=lambda item: _sort_timestamp(item.created_at), reverse=True)
-    return {"items": [item.model_dump() for item in items]}
+
+@router.get("/logs/stream")
+async def stream_application_logs(
+    request: Request,
+    cursor: str | None = Query(None, description="Resume after this cursor; defaults to the Last-Event-ID header."),
+    _: User = Depends(require_roles(Role.ADMIN)),
+):
+    """Follow the application log as Server-Sent Events: one ``lines`` event per batch of new lines."""
+    cursor = cursor or request.headers.get("last-event-id") or None
+    if cursor:
+        try:
+            decode_log_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return StreamingResponse(
+        _iter_log_events(request, cursor),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _missing_run_dirs(run_dirs: list[str]) -> set[str]:
+    return {run_dir for run_dir in run_dirs if not (OUTPUT_DIR / run_dir).is_dir()}
+
+
+@router.get("/runs")
+async def list_runs(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: int | None = Query(None, description="Return sessions older than this session id."),
+    created_by_user_id: int | None = Query(None),
+    workspace_id: str | None = Query(None),
+    start_date: date | None = Query(None, description="Only sessions whose range ends on or after this date."),
+    end_date: date | None = Query(None, description="Only sessions whose range starts on or before this date."),
+    run_dir: str | None = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Session ids grow with creation time, so id order is creation order and a stable keyset cursor.
+    query = select(AuditSession).options(joinedload(AuditSession.created_by)).order_by(AuditSession.id.desc())
+    if cursor is not None:
+        query = query.where(AuditSession.id < cursor)
+    if created_by_user_id is not None:
+        query = query.where(AuditSession.created_by_user_id == created_by_user_id)
+    if workspace_id:
+        query = query.where(AuditSession.clockify_workspace_id == workspace_id)
+    if start_date is not None:
+        query = query.where(AuditSession.end_date >= start_date)
+    if end_date is not None:
+        query = query.where(AuditSession.start_date <= end_date)
+    if run_dir:
+        query = query.where(AuditSession.run_dir == run_dir)
+
+    sessions = (await db.execute(query.limit(limit + 1))).scalars().all()
+    page = sessions[:limit]
+    # One stat per listed session; their stored manifests would only point at files that 404.
+    missing_run_dirs = await run_in_threadpool(_missing_run_dirs, [session.run_dir for session in page])
+    return {
+        "items": [
+            _serialize_audit_session(
+                session,
+                [] if session.run_dir in missing_run_dirs else session.report_files or [],
+                run_available=session.run_dir not in missing_run_dirs,
+            ).model_dump()
+            for session in page
+        ],
+        "next_cursor": page[-1].id if len(sessions) > limit else None,
+    }
 
 
 @router.delete("/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_audit_session(
     session_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: User = Depends(require_roles(Role.ADMIN)),
 ):
-    if not inspect(engine).has_table("audit_sessions"):
+    if not await async_has_table(db, "audit_sessions"):
         raise HTTPException(status_code=404, detail="Audit sessions are not available yet.")
 
-    session_record = db.execute(
-        select(AuditSession).where(AuditSession.id == session_id)
+    session_record = (
+        await db.execute(select(AuditSession).where(AuditSession.id == session_id))
+    ).scalar_one_or_none()
+    if session_record is None:
+        raise HTTPException(status_code=404, detail="Audit session not found.")
+
+    await run_in_threadpool(remove_run_directory, session_record.run_dir)
+    spans = await db.run_sync(session_entry_spans, session_id)
+    await db.delete(session_record)
+    await db.flush()
+    await db.run_sync(refresh_user_weeks, spans)
+    await db.commit()
+    audit_job_runner.forget_session(session_id)
+
+
+@router.get("/sessions/{session_id}/analysis", response_model=AuditSessionAnalysisRead)
+async def read_audit_session_analysis(session_id: int, db: AsyncSession = Depends(get_async_db)):
+    session_record = (
+        await db.execute(
+            select(AuditSession).options(selectinload(AuditSession.analysis)).where(AuditSession.id == session_id)
+        )
     ).scalar_one_or_none()
     if session_record is None:
         raise HTTPException(status_code=404, detail="Audit session not found.")
 
-    remove_run_directory(session_record.run_dir)
-    db.delete(session_record)
-    db.commit()
+    analysis = session_record.analysis
+    return AuditSessionAnalysisRead(
+        audit_session_id=session_record.id,
+        big_task_hours=session_record.big_task_hours,
+        time_stats=analysis.time_stats if analysis else None,
+        overlap_per_user=analysis.overlap_per_user if analysis else None,
+        small_tasks_per_user=analysis.small_tasks_per_user if analysis else None,
+        big_tasks_per_user=analysis.big_tasks_per_user if analysis else None,
+    )
+
+
+async def _require_audit_session_id(db: AsyncSession, session_id: int) -> None:
+    session_exists = (
+        await db.execute(select(AuditSession.id).where(AuditSession.id == session_id))
+    ).scalar_one_or_none()
+    if session_exists is None:
+        raise HTTPException(status_code=404, detail="Audit session not found.")
+
+
+async def _archived_session_entries(
+    db: AsyncSession,
+    session_id: int,
+    users: list[str],
+    first_day: date | None,
+    last_day: date | None,
+) -> list[dict] | None:
+    """Decoded archive entries of a session, None when it is not archived.
+
+    The stored user spans answer requests that cannot match without touching the blob.
+    """
+    archive = (
+        await db.execute(
+            select(AuditSessionEntryArchive.archived_at, AuditSessionEntryArchive.user_spans).where(
+                AuditSessionEntryArchive.audit_session_id == session_id
+            )
+        )
+    ).one_or_none()
+    if archive is None:
+        return None
+    if not archive_may_match(archive.user_spans, users, first_day, last_day):
+        return []
+
+    key = (session_id, archive.archived_at)
+    entries = decoded_archive_cache.get(key)
+    if entries is None:
+        data = (
+            await db.execute(
+                select(AuditSessionEntryArchive.data).where(AuditSessionEntryArchive.audit_session_id == session_id)
+            )
+        ).scalar_one_or_none()
+        if data is None:
+            # Restored by a refresh since the first query.
+            return None
+        entries = await run_in_threadpool(decode_entries, data)
+        decoded_archive_cache.put(key, entries)
+    return entries
+
+
+@router.get("/sessions/{session_id}/entries", response_model=TimeEntryPage)
+async def list_audit_session_time_entries(
+    session_id: int,
+    users: list[str] | None = Query(None),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    q: str | None = Query(None, max_length=200, description="Case-insensitive description substring."),
+    limit: int = Query(500, ge=1, le=5000),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    await _require_audit_session_id(db, session_id)
+    users = [user.strip() for user in users or [] if user.strip()]
+    search = q.strip() if q else None
+
+    archived = await _archived_session_entries(db, session_id, users, start_date, end_date)
+    try:
+        if archived is not None:
+            # Archived sessions are read straight from their blob.
+            entries = filter_archived_entries(
+                archived,
+                users=users,
+                start_date=start_date,
+                end_date=end_date,
+                search=search,
+                cursor=cursor,
+            )[: limit + 1]
+        else:
+            query = time_entry_query(
+                session_id,
+                users=users,
+                start_date=start_date,
+                end_date=end_date,
+                search=search,
+                cursor=cursor,
+            )
+            entries = (await db.execute(query.limit(limit + 1))).mappings().all()
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    page = entries[:limit]
+    return TimeEntryPage(
+        items=[TimeEntryRead(**{**entry, "tags": split_tags(entry["tags"])}) for entry in page],
+        next_cursor=(
+            encode_time_entry_cursor(page[-1]["user_name"], page[-1]["start_datetime"], page[-1]["id"])
+            if len(entries) > limit
+            else None
+        ),
+    )
+
+
+@router.get("/sessions/{session_id}/calendar/lanes", response_model=CalendarLaneLayout)
+async def read_audit_session_calendar_lanes(
+    session_id: int,
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    users: list[str] | None = Query(None),
+    group_by: str = Query("day", description="'day' shares lanes between users, 'user' lays out each user alone."),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Entries cut at midnight and placed in overlap lanes, ready for the week and day calendar views."""
+    if group_by not in LANE_GROUPINGS:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of: {', '.join(LANE_GROUPINGS)}.")
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date.")
+    if (end_date - start_date).days >= MAX_WINDOW_DAYS:
+        raise HTTPException(status_code=400, detail=f"The window may span at most {MAX_WINDOW_DAYS} days.")
+    await _require_audit_session_id(db, session_id)
+    users = [user.strip() for user in users or [] if user.strip()]
+
+    # Entries that start before the window can still reach into it, so only its end bounds the spans.
+    archived = await _archived_session_entries(db, session_id, users, None, end_date)
+    if archived is not None:
+        window_start = datetime.combine(start_date, time.min)
+        window_end = datetime.combine(end_date + timedelta(days=1), time.min)
+        entries = [
+            entry
+            for entry in archived
+            if (not users or entry["user_name"] in users)
+            and entry["start_datetime"] < window_end
+            and entry["end_datetime"] > window_start
+        ]
+    else:
+        query = lane_entry_query(session_id, start_date, end_date, users=users)
+        entries = (await db.execute(query)).mappings().all()
+
+    events = layout_calendar_lanes(entries, start_date, end_date, group_by)
+    return CalendarLaneLayout(
+        start_date=start_date,
+        end_date=end_date,
+        group_by=group_by,
+        events=[
+            CalendarLaneEvent(
+                id=f"{event['id']}-{event['day'].isoformat()}",
+                entry_id=event["id"],
+                user_name=event["user_name"],
+                description=event["description"],
+                tags=split_tags(event["tags"]),
+                start_datetime=event["start_datetime"],
+                end_datetime=event["end_datetime"],
+                duration_hours=event["duration_hours"],
+                day=event["day"],
+                start_minutes=event["start_minutes"],
+                end_minutes=event["end_minutes"],
+                lane_index=event["lane_index"],
+                lane_count=event["lane_count"],
+            )
+            for event in events
+        ],
+    )
+
+
+@router.get("/sessions/{session_id}/calendar/month", response_model=CalendarMonthSummary)
+async def read_audit_session_calendar_month(
+    session_id: int,
+    month: str = Query(..., description="YYYY-MM"),
+    users: list[str] | None = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Per user/day totals for the month calendar, read from the stored day rollups instead of the entries."""
+    try:
+        start_date, end_date = month_bounds(month)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    await _require_audit_session_id(db, session_id)
+    users = [user.strip() for user in users or [] if user.strip()]
+
+    query = (
+        select(AuditSessionUserDayRollup)
+        .where(
+            AuditSessionUserDayRollup.audit_session_id == session_id,
+            AuditSessionUserDayRollup.day >= start_date,
+            AuditSessionUserDayRollup.day <= end_date,
+        )
+        .order_by(AuditSessionUserDayRollup.day, AuditSessionUserDayRollup.user_name)
+    )
+    if users:
+        query = query.where(AuditSessionUserDayRollup.user_name.in_(users))
+    rollups = (await db.execute(query)).scalars().all()
+    return CalendarMonthSummary(
+        month=start_date.strftime("%Y-%m"),
+        start_date=start_date,
+        end_date=end_date,
+        days=[
+            CalendarMonthDay(
+                user_name=rollup.user_name,
+                day=rollup.day,
+                hours=rollup.hours,
+                entry_count=rollup.entry_count,
+                overlap_count=rollup.overlap_count,
+                has_overlap=rollup.overlap_count > 0,
+                first_start=rollup.first_start,
+                last_end=rollup.last_end,
+            )
+            for rollup in rollups
+        ],
+    )
+
+
+def _archive_report(archives: list[dict]) -> EntryArchiveReport:
+    items = [EntryArchiveRead(**archive) for archive in archives]
+    return EntryArchiveReport(
+        items=items,
+        entry_count=sum(item.entry_count for item in items),
+        original_bytes=sum(item.original_bytes for item in items),
+        archived_bytes=sum(item.archived_bytes for item in items),
+        saved_bytes=sum(item.saved_bytes for item in items),
+    )
+
+
+def _archive_old_sessions(older_than_days: int) -> list[dict]:
+    with SessionLocal() as db:
+        archived = archive_old_sessions(db, older_than_days)
+    for item in archived:
+        audit_job_runner.forget_session(item["audit_session_id"])
+    return archived
+
+
+@router.get("/archives", response_model=EntryArchiveReport)
+async def read_entry_archive_report(db: AsyncSession = Depends(get_async_db)):
+    archives = (
+        await db.execute(select(AuditSessionEntryArchive).order_by(AuditSessionEntryArchive.audit_session_id))
+    ).scalars().all()
+    return _archive_report([serialize_archive(archive) for archive in archives])
+
+
+@router.post("/archives", response_model=EntryArchiveReport)
+async def archive_old_audit_sessions(
+    older_than_days: int = Query(ARCHIVE_AFTER_DAYS, ge=0),
+    _: User = Depends(require_roles(Role.ADMIN)),
+):
+    """Pack the time entries of sessions not synced for ``older_than_days`` into compressed archives."""
+    return _archive_report(await run_in_threadpool(_archive_old_sessions, older_than_days))
+
+
+@router.get("/search/entries", response_model=TimeEntrySearchPage)
+async def search_time_entries(
+    q: str = Query(..., min_length=1, max_length=200, description="Words that must all appear in the description."),
+    session_ids: list[int] | None = Query(None),
+    users: list[str] | None = Query(None),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        query = entry_search_query(
+            db.bind.dialect.name,
+            q,
+            session_ids=session_ids,
+            users=[user.strip() for user in users or [] if user.strip()],
+            start_date=start_date,
+            end_date=end_date,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    page = rows[:limit]
+    return TimeEntrySearchPage(
+        items=[
+            TimeEntrySearchHit(
+                id=entry.id,
+                user_name=entry.user_name,
+                description=entry.description,
+                tags=split_tags(entry.tags),
+                start_datetime=entry.start_datetime,
+                end_datetime=entry.end_datetime,
+                duration_hours=entry.duration_hours,
+                audit_session_id=entry.audit_session_id,
+                session_name=session_name,
+                run_dir=run_dir,
+                rank=rank,
+            )
+            for entry, session_name, run_dir, rank in page
+        ],
+        next_cursor=encode_search_cursor(page[-1].rank, page[-1][0].id) if len(rows) > limit else None,
+    )
+
+
+@router.get("/sessions/{session_id}/rollups/users", response_model=list[UserRollupRead])
+async def list_audit_session_user_rollups(session_id: int, db: AsyncSession = Depends(get_async_db)):
+    await _require_audit_session_id(db, session_id)
+    rollups = (
+        await db.execute(
+            select(AuditSessionUserRollup)
+            .where(AuditSessionUserRollup.audit_session_id == session_id)
+            .order_by(AuditSessionUserRollup.user_name)
+        )
+    ).scalars().all()
+    return [UserRollupRead.model_validate(rollup) for rollup in rollups]
+
+
+@router.get("/sessions/{session_id}/rollups/days", response_model=list[UserDayRollupRead])
+async def list_audit_session_day_rollups(
+    session_id: int,
+    users: list[str] | None = Query(None),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    await _require_audit_session_id(db, session_id)
+    query = (
+        select(AuditSessionUserDayRollup)
+        .where(AuditSessionUserDayRollup.audit_session_id == session_id)
+        .order_by(AuditSessionUserDayRollup.user_name, AuditSessionUserDayRollup.day)
+    )
+    if users:
+        query = query.where(AuditSessionUserDayRollup.user_name.in_(users))
+    if start_date is not None:
+        query = query.where(AuditSessionUserDayRollup.day >= start_date)
+    if end_date is not None:
+        query = query.where(AuditSessionUserDayRollup.day <= end_date)
+    rollups = (await db.execute(query)).scalars().all()
+    return [UserDayRollupRead.model_validate(rollup) for rollup in rollups]
+
+
+@router.get("/analytics/users/weeks", response_model=list[AnalyticsUserWeekRead])
+async def list_analytics_user_weeks(
+    users: list[str] | None = Query(None),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    weeks = (
+        await db.execute(user_week_query(users=users, start_date=start_date, end_date=end_date))
+    ).scalars().all()
+    return [AnalyticsUserWeekRead.model_validate(week) for week in weeks]
+
+
+@router.get("/analytics/users", response_model=list[AnalyticsUserTotalRead])
+async def list_analytics_user_totals(
+    users: list[str] | None = Query(None),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rows = (
+        await db.execute(user_total_query(users=users, start_date=start_date, end_date=end_date))
+    ).mappings().all()
+    return [AnalyticsUserTotalRead(**row) for row in rows]
 
 
 @router.get("/reports/{run_dir}")
@@ -134,40 +654,41 @@ async def list_private_run_reports(run_dir: str):
 async def update_audit_session(
     session_id: int,
     payload: AuditSessionUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: User = Depends(require_roles(Role.ADMIN)),
 ):
-    if not inspect(engine).has_table("audit_sessions"):
+    if not await async_has_table(db, "audit_sessions"):
         raise HTTPException(status_code=404, detail="Audit sessions are not available yet.")
 
-    session_record = db.execute(
-        select(AuditSession).where(AuditSession.id == session_id)
+    session_record = (
+        await db.execute(
+            select(AuditSession)
+            .options(selectinload(AuditSession.created_by))
+            .where(AuditSession.id == session_id)
+        )
     ).scalar_one_or_none()
     if session_record is None:
         raise HTTPException(status_code=404, detail="Audit session not found.")
 
     normalized_name = payload.name.strip() if payload.name else None
     session_record.name = normalized_name or None
-    db.add(session_record)
-    db.commit()
-    db.refresh(session_record)
+    await db.commit()
+    audit_job_runner.forget_session(session_id)
 
-    run_path = OUTPUT_DIR / session_record.run_dir
-    report_files = manifest_for_run(run_path) if run_path.is_dir() else []
-    return _serialize_audit_session(session_record, report_files)
+    return _serialize_audit_session(session_record, session_record.report_files or [])
 
 
-@router.post("/sessions/{session_id}/refresh")
-async def refresh_audit_session(
+async def _submit_session_refresh_job(
+    db: AsyncSession,
     session_id: int,
-    db: Session = Depends(get_db),
-    _: User = Depends(require_roles(Role.ADMIN)),
-):
-    if not inspect(engine).has_table("audit_sessions"):
+    full: bool,
+    current_user: User,
+) -> tuple[int, Future]:
+    if not await async_has_table(db, "audit_sessions"):
         raise HTTPException(status_code=404, detail="Audit sessions are not available yet.")
 
-    session_record = db.execute(
-        select(AuditSession).where(AuditSession.id == session_id)
+    session_record = (
+        await db.execute(select(AuditSession).where(AuditSession.id == session_id))
     ).scalar_one_or_none()
     if session_record is None:
         raise HTTPException(status_code=404, detail="Audit session not found.")
@@ -176,16 +697,70 @@ async def refresh_audit_session(
     if session_record.start_date is None or session_record.end_date is None or not session_record.timezone:
         raise HTTPException(status_code=400, detail="Session query parameters are incomplete.")
 
+    async def run_refresh(job_db: Session, progress) -> dict:
+        audit_session = job_db.execute(
+            select(AuditSession).where(AuditSession.id == session_id)
+        ).scalar_one_or_none()
+        if audit_session is None:
+            raise RuntimeError("Audit session was deleted before the refresh started.")
+
+        results, _ = await sync_clockify_session(
+            db=job_db,
+            audit_session=audit_session,
+            full_refresh=full,
+            progress=progress,
+        )
+        return results
+
+    created_by_user_id = current_user.id
+
+    def create_job() -> int:
+        with SessionLocal() as job_db:
+            return create_audit_job(
+                job_db,
+                kind="session_refresh",
+                params={"session_id": session_id, "full": full},
+                created_by_user_id=created_by_user_id,
+                audit_session_id=session_id,
+            ).id
+
+    # A full and an incremental refresh are different requests; only one may run per session, since both
+    # write the same run directory.
+    key = audit_job_key(
+        start_date=session_record.start_date,
+        end_date=session_record.end_date,
+        timezone_name=session_record.timezone,
+        big_task_hours=session_record.big_task_hours or 8.0,
+        target=("session", session_id, full),
+    )
     try:
-        results, _ = await execute_clockify_audit(
-            db=db,
-            start_date=session_record.start_date,
-            end_date=session_record.end_date,
-            timezone_name=session_record.timezone,
-            big_task_hours=session_record.big_task_hours or 8.0,
-            session_name=session_record.name,
-            existing_session=session_record,
+        return await audit_job_runner.submit_or_join(
+            key, create_job, run_refresh, exclusive_key=("session", session_id)
         )
+    except JobConflictError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another refresh of this session is still running.",
+        ) from exc
+
+
+@router.post("/sessions/{session_id}/refresh")
+async def refresh_audit_session(
+    session_id: int,
+    full: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_roles(Role.ADMIN)),
+):
+    _, future = await _submit_session_refresh_job(db, session_id, full, current_user)
+    try:
+        results = await asyncio.wrap_future(future)
+    except JobCancelledError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    except asyncio.CancelledError as exc:
+        # A job cancelled while still queued never runs, so its future is cancelled instead of raising.
+        if not future.cancelled():
+            raise
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Audit job was cancelled.") from exc
     except ClockifyConfigurationError as exc:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
     except ClockifyClientError as exc:
@@ -198,11 +773,69 @@ async def refresh_audit_session(
     return results
 
 
+@router.post(
+    "/sessions/{session_id}/refresh/jobs",
+    response_model=AuditJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def enqueue_audit_session_refresh(
+    session_id: int,
+    full: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_roles(Role.ADMIN)),
+):
+    job_id, _ = await _submit_session_refresh_job(db, session_id, full, current_user)
+    return AuditJobRead.model_validate(await db.get(AuditJob, job_id))
+
+
+@router.get("/jobs", response_model=list[AuditJobRead])
+async def list_audit_jobs(
+    active: bool = Query(False),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+    _: User = Depends(require_roles(Role.ADMIN)),
+):
+    query = select(AuditJob).order_by(AuditJob.id.desc()).limit(limit)
+    if active:
+        query = query.where(AuditJob.status.in_(ACTIVE_JOB_STATUSES))
+    jobs = (await db.execute(query)).scalars().all()
+    return [AuditJobRead.model_validate(job) for job in jobs]
+
+
+@router.get("/jobs/{job_id}", response_model=AuditJobRead)
+async def read_audit_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    _: User = Depends(require_roles(Role.ADMIN)),
+):
+    job = (await db.execute(select(AuditJob).where(AuditJob.id == job_id))).scalar_one_or_none()
+    if job is None:
+        raise HTTPException(status_code=404, detail="Audit job not found.")
+    return AuditJobRead.model_validate(job)
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=AuditJobRead)
+async def cancel_audit_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    _: User = Depends(require_roles(Role.ADMIN)),
+):
+    job = (await db.execute(select(AuditJob).where(AuditJob.id == job_id))).scalar_one_or_none()
+    if job is None:
+        raise HTTPException(status_code=404, detail="Audit job not found.")
+    # The runner records the cancellation through the sync engine.
+    if job.status not in ACTIVE_JOB_STATUSES or not await run_in_threadpool(audit_job_runner.cancel, job_id):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Audit job is no longer running.")
+
+    await db.refresh(job)
+    return AuditJobRead.model_validate(job)
+
+
 @router.get("/reports/files/{relative_path:path}")
-async def download_private_report_file(relative_path: str):
+async def download_private_report_file(relative_path: str, request: Request):
     from backend.public import download_report_file
 
-    return await download_report_file(relative_path)
+    return await download_report_file(relative_path, request)
 
 
 @router.get("/reports/{run_dir}/zip")
@@ -212,6 +845,18 @@ async def download_private_run_reports_zip(run_dir: str):
     return await download_run_reports_zip(run_dir)
 
 
+@router.get("/reports/{run_dir}/entries")
+async def stream_private_run_report_entries(
+    run_dir: str,
+    users: list[str] | None = Query(None),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+):
+    from backend.public import stream_run_report_entries
+
+    return await stream_run_report_entries(run_dir, users, start_date, end_date)
+
+
 @router.get("/reports/{run_dir}/selected-zip")
 async def download_private_selected_reports_zip(
     run_dir: str,
@@ -229,9 +874,11 @@ async def download_private_selected_reports_zip(
         raise HTTPException(status_code=400, detail="At least one user must be selected")
 
     selected_report_names = [
-        report["filename"]
+        name
         for report in manifest_for_run(run_path)
-        if report.get("user") in requested_users and report.get("filename")
+        if report.get("user") in requested_users
+        for name in report_file_members(report)
+        if (run_path / name).is_file()
     ]
     if not selected_report_names:
         raise HTTPException(status_code=404, detail="No matching reports found for the selected users")
@@ -242,20 +889,20 @@ async def download_private_selected_reports_zip(
 
 @router.get("/users", response_model=list[UserRead])
 async def list_users(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: User = Depends(require_roles(Role.ADMIN)),
 ):
-    users = db.execute(select(User).order_by(User.username.asc())).scalars().all()
+    users = (await db.execute(select(User).order_by(User.username.asc()))).scalars().all()
     return [UserRead.model_validate(user) for user in users]
 
 
 @router.post("/users", response_model=UserRead, status_code=status.HTTP_201_CREATED)
 async def create_user(
     payload: UserCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: User = Depends(require_roles(Role.ADMIN)),
 ):
-    existing = db.execute(select(User).where(User.username == payload.username)).scalar_one_or_none()
+    existing = (await db.execute(select(User).where(User.username == payload.username))).scalar_one_or_none()
     if existing is not None:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Username already exists.")
 
@@ -267,8 +914,8 @@ async def create_user(
         is_active=payload.is_active,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return UserRead.model_validate(user)
 
 
@@ -276,10 +923,10 @@ async def create_user(
 async def update_user(
     user_id: int,
     payload: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_roles(Role.ADMIN)),
 ):
-    user = db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
+    user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
     if user is None:
         raise HTTPException(status_code=404, detail="User not found.")
 
@@ -294,7 +941,5 @@ async def update_user(
             raise HTTPException(status_code=400, detail="You cannot deactivate your own account.")
         user.is_active = payload.is_active
 
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
     return UserRead.model_validate(user)
\ No newline at end of file
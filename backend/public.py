@@ -1,19 +1,45 @@
+import asyncio
+import gzip
+import hashlib
 import io
 import json
 import os
 import shutil
+import tempfile
 import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import lru_cache
 from pathlib import Path
+from threading import Lock
+from typing import IO, Iterator
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
-from fastapi.responses import FileResponse, Response
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.datastructures import FormData, UploadFile
+from starlette.types import Message, Receive
 
+from backend.settings import CSV_AUDIT_WORKERS, CSV_UPLOAD_MAX_BYTES, MANIFEST_CACHE_SIZE, REPORT_LAYOUT
 from time_audit import generate_time_audit
 
 
 router = APIRouter(tags=["public"])
 
 OUTPUT_DIR = Path("output")
+# Full-run archives are cached inside the run directory as reports-<key>.zip, next to manifest.json.
+REPORTS_ZIP_PREFIX = "reports-"
+ZIP_CHUNK_SIZE = 256 * 1024
+# Report files smaller than this are sent as they are; the gzip framing is not worth it.
+GZIP_MIN_BYTES = 1024
+IMMUTABLE_MAX_AGE_SECONDS = 365 * 24 * 60 * 60
+GZIP_MAGIC = b"\x1f\x8b"
+# Room for the multipart boundaries and part headers around an upload of the maximum size.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+_csv_audit_lock = Lock()
+_csv_audit_executor: ThreadPoolExecutor | None = None
 
 
 def ensure_output_dir() -> None:
@@ -28,7 +54,57 @@ def safe_relative_output_path(relative_path: str) -> Path:
     return candidate
 
 
-def manifest_for_run(run_path: Path) -> list[dict]:
+class ManifestCache:
+    """Bounded LRU of parsed run manifests, keyed by run path and validated by the manifest's mtime and size.
+
+    Runs without a manifest are validated by the run directory's own mtime instead, which changes whenever a
+    report file is added or removed.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._lock = Lock()
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[tuple, list[dict]]] = OrderedDict()
+
+    def get(self, key: str, stamp: tuple) -> list[dict] | None:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None or cached[0] != stamp:
+                return None
+            self._entries.move_to_end(key)
+            return cached[1]
+
+    def put(self, key: str, stamp: tuple, report_files: list[dict]) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (stamp, report_files)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+manifest_cache = ManifestCache(MANIFEST_CACHE_SIZE)
+
+
+def _manifest_cache_key(run_path: Path) -> str:
+    return os.path.abspath(run_path)
+
+
+def forget_run_manifest(run_dir: str) -> None:
+    """Drop a run's cached manifest after its reports were written, rewritten or removed."""
+    manifest_cache.forget(_manifest_cache_key(OUTPUT_DIR / run_dir))
+
+
+def _read_manifest(run_path: Path) -> list[dict]:
     manifest_path = run_path / "manifest.json"
     if manifest_path.exists():
         with open(manifest_path, encoding="utf-8") as file_obj:
@@ -50,51 +126,509 @@ def manifest_for_run(run_path: Path) -> list[dict]:
     return report_files
 
 
+def manifest_for_run(run_path: Path) -> list[dict]:
+    key = _manifest_cache_key(run_path)
+    try:
+        stat = (run_path / "manifest.json").stat()
+        stamp = ("manifest", stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        stat = run_path.stat()
+        stamp = ("listing", stat.st_mtime_ns)
+
+    report_files = manifest_cache.get(key, stamp)
+    if report_files is None:
+        report_files = _read_manifest(run_path)
+        manifest_cache.put(key, stamp, report_files)
+    # Callers may store or edit the list; the cached copy stays untouched.
+    return [dict(report_file) for report_file in report_files]
+
+
+def _is_run_member(name: str) -> bool:
+    path = Path(name)
+    return bool(name) and not path.is_absolute() and ".." not in path.parts
+
+
+def report_file_members(report_file: dict, start_date: date | None = None, end_date: date | None = None) -> list[str]:
+    """Files holding a user's report, relative to the run directory: its shards, or the single report file.
+
+    For sharded reports the dates skip shards whose month or week lies outside the range.
+    """
+    if "shards" not in report_file:
+        filename = report_file.get("filename") or ""
+        return [filename] if _is_run_member(filename) else []
+
+    return [
+        shard["filename"]
+        for shard in report_file["shards"]
+        if _is_run_member(shard.get("filename") or "")
+        and (start_date is None or shard["end_date"] >= start_date.isoformat())
+        and (end_date is None or shard["start_date"] <= end_date.isoformat())
+    ]
+
+
+def load_user_report(
+    run_path: Path,
+    report_file: dict,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> dict:
+    """A user's date -> tasks report, merged from its shards when the run is sharded."""
+    report: dict = {}
+    for name in report_file_members(report_file, start_date, end_date):
+        try:
+            with open(run_path / name, encoding="utf-8") as file_obj:
+                report.update(json.load(file_obj))
+        except FileNotFoundError:
+            continue
+    return report
+
+
 def remove_run_directory(run_dir: str) -> None:
     run_path = OUTPUT_DIR / run_dir
     if run_path.exists() and not run_path.is_dir():
         raise HTTPException(status_code=500, detail="Stored session path is invalid.")
     if run_path.is_dir():
         shutil.rmtree(run_path)
+    forget_run_manifest(run_dir)
+
+
+class _ZipSink:
+    """Unseekable write target: zipfile then writes data descriptors and never seeks back."""
 
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
 
-def build_reports_zip_response(run_path: Path, report_names: list[str], archive_name: str) -> Response:
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_reports_zip(run_path: Path, report_names: list[str]) -> Iterator[bytes]:
+    """Yield a DEFLATE ZIP of the reports chunk by chunk, holding at most one chunk in memory."""
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name in report_names:
+            info = zipfile.ZipInfo.from_file(run_path / name, arcname=name)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with open(run_path / name, "rb") as source, archive.open(info, mode="w") as target:
+                while chunk := source.read(ZIP_CHUNK_SIZE):
+                    target.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    yield sink.drain()
+
+
+def reports_zip_cache_path(run_path: Path, report_names: list[str]) -> Path:
+    """Cache file for these reports; any added, removed or rewritten report changes the key."""
+    digest = hashlib.sha256()
+    for name in report_names:
+        stat = (run_path / name).stat()
+        digest.update(f"{name}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return run_path / f"{REPORTS_ZIP_PREFIX}{digest.hexdigest()[:16]}.zip"
+
+
+def _iter_and_cache_reports_zip(run_path: Path, report_names: list[str], cache_path: Path) -> Iterator[bytes]:
+    # Written to a private temporary file and renamed into place only once complete, so an aborted
+    # download or a concurrent one never leaves a truncated cache behind.
+    fd, temp_name = tempfile.mkstemp(prefix=f".{REPORTS_ZIP_PREFIX}", suffix=".tmp", dir=run_path)
+    try:
+        with os.fdopen(fd, "wb") as cache_file:
+            for chunk in iter_reports_zip(run_path, report_names):
+                cache_file.write(chunk)
+                yield chunk
+        for stale_path in run_path.glob(f"{REPORTS_ZIP_PREFIX}*.zip"):
+            if stale_path != cache_path:
+                stale_path.unlink(missing_ok=True)
+        os.replace(temp_name, cache_path)
+    finally:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+
+
+def build_reports_zip_response(
+    run_path: Path,
+    report_names: list[str],
+    archive_name: str,
+    *,
+    cache: bool = False,
+) -> Response:
     if not report_names:
         raise HTTPException(status_code=404, detail="No reports found for this run")
 
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
-        for name in report_names:
-            archive.write(run_path / name, arcname=name)
+    headers = {"Content-Disposition": f'attachment; filename="{archive_name}"'}
+    if not cache:
+        return StreamingResponse(
+            iter_reports_zip(run_path, report_names),
+            media_type="application/zip",
+            headers=headers,
+        )
 
-    zip_buffer.seek(0)
-    return Response(
-        content=zip_buffer.getvalue(),
+    cache_path = reports_zip_cache_path(run_path, report_names)
+    if cache_path.is_file():
+        return FileResponse(cache_path, media_type="application/zip", filename=archive_name)
+    return StreamingResponse(
+        _iter_and_cache_reports_zip(run_path, report_names, cache_path),
         media_type="application/zip",
-        headers={"Content-Disposition": f'attachment; filename="{archive_name}"'},
+        headers=headers,
     )
 
 
-@router.post("/api/audit")
-async def audit_csv(
-    file: UploadFile = File(...),
-    big_task_hours: float = 8.0,
-):
-    if not file.filename or not file.filename.lower().endswith(".csv"):
-        raise HTTPException(status_code=400, detail="File must be a CSV")
+def _ndjson_line(record: dict) -> str:
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+def iter_report_records(
+    run_path: Path,
+    report_files: list[dict],
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> Iterator[bytes]:
+    """Yield a run's reports as NDJSON: one ``manifest`` record, then one ``day`` record per user and report date.
+
+    The dates keep only tasks starting inside the range; each user's records are sent as one chunk.
+    """
+    start_key = start_date.isoformat() if start_date is not None else None
+    end_key = end_date.isoformat() if end_date is not None else None
+    yield _ndjson_line({"type": "manifest", "run_dir": run_path.name, "report_files": report_files}).encode("utf-8")
+
+    for report_file in report_files:
+        report = load_user_report(run_path, report_file, start_date, end_date)
+
+        lines = []
+        for date_key, tasks in report.items():
+            if start_key is not None or end_key is not None:
+                tasks = [
+                    task
+                    for task in tasks
+                    if (start_key is None or task["start_datetime"][:10] >= start_key)
+                    and (end_key is None or task["start_datetime"][:10] <= end_key)
+                ]
+            if tasks:
+                record = {"type": "day", "user": report_file.get("user"), "date": date_key, "tasks": tasks}
+                lines.append(_ndjson_line(record))
+        if lines:
+            yield "".join(lines).encode("utf-8")
+
+
+def build_report_records_response(
+    run_path: Path,
+    users: list[str] | None,
+    start_date: date | None,
+    end_date: date | None,
+) -> StreamingResponse:
+    if start_date is not None and end_date is not None and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must be on or before end_date")
+
+    report_files = manifest_for_run(run_path)
+    requested_users = {user.strip() for user in users or [] if user.strip()}
+    if requested_users:
+        report_files = [report for report in report_files if report.get("user") in requested_users]
+    return StreamingResponse(
+        iter_report_records(run_path, report_files, start_date, end_date),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "private, no-cache"},
+    )
+
 
-    ensure_output_dir()
-    content = await file.read()
+@lru_cache(maxsize=4096)
+def _file_digest(path: str, size: int, mtime_ns: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file_obj:
+        while chunk := file_obj.read(ZIP_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+def report_file_etag(path: Path) -> str:
+    """Strong ETag over the file's bytes, hashed once per (size, mtime) of the file."""
+    stat = path.stat()
+    return f'"{_file_digest(str(path), stat.st_size, stat.st_mtime_ns)}"'
+
+
+def gzip_variant(path: Path) -> Path | None:
+    """Return ``<name>.gz`` next to the file, compressing it first when missing or stale.
+
+    The variant carries the source's mtime, so a rewritten report is recompressed on its next request.
+    """
+    stat = path.stat()
+    if stat.st_size < GZIP_MIN_BYTES:
+        return None
+
+    gz_path = path.with_name(f"{path.name}.gz")
     try:
+        if gz_path.stat().st_mtime_ns == stat.st_mtime_ns:
+            return gz_path
+    except FileNotFoundError:
+        pass
+
+    fd, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with open(path, "rb") as source, os.fdopen(fd, "wb") as target:
+            with gzip.GzipFile(filename="", mode="wb", fileobj=target, mtime=0) as compressed:
+                shutil.copyfileobj(source, compressed, ZIP_CHUNK_SIZE)
+        os.utime(temp_name, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(temp_name, gz_path)
+    finally:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+    return gz_path
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                if float(value) == 0:
+                    continue
+            except ValueError:
+                continue
+        return True
+    return False
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, and the gzip variant is the same resource content.
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip().removeprefix("W/")
+        if candidate == "*" or candidate.replace("-gzip\"", "\"") == etag:
+            return True
+    return False
+
+
+def _report_cache_headers(request: Request, etag: str) -> dict[str, str]:
+    # Sessions rewrite their report files on refresh, so plain URLs are revalidated on every use (a 304
+    # without a body when unchanged); a URL pinned to the current ETag with ?v= can be cached for good.
+    version = request.query_params.get("v")
+    pinned = version is not None and f'"{version}"' == etag
+    return {
+        "Cache-Control": (
+            f"private, max-age={IMMUTABLE_MAX_AGE_SECONDS}, immutable" if pinned else "private, no-cache"
+        ),
+        "Vary": "Accept-Encoding",
+    }
+
+
+def _not_modified(request: Request, etag: str, headers: dict[str, str]) -> Response | None:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={**headers, "ETag": etag})
+    return None
+
+
+def report_file_response(request: Request, file_path: Path, etag: str, gz_path: Path | None) -> Response:
+    headers = _report_cache_headers(request, etag)
+    not_modified = _not_modified(request, etag, headers)
+    if not_modified is not None:
+        return not_modified
+
+    if gz_path is not None and accepts_gzip(request.headers.get("accept-encoding", "")):
+        return FileResponse(
+            gz_path,
+            media_type="application/json",
+            filename=file_path.name,
+            headers={**headers, "ETag": f'{etag[:-1]}-gzip"', "Content-Encoding": "gzip"},
+        )
+    return FileResponse(
+        file_path,
+        media_type="application/json",
+        filename=file_path.name,
+        headers={**headers, "ETag": etag},
+    )
+
+
+def _sharded_report_file(relative_path: str) -> tuple[Path, dict] | None:
+    """The run and manifest entry of a sharded report requested by its whole-report path."""
+    run_dir, _, filename = relative_path.partition("/")
+    run_path = OUTPUT_DIR / run_dir
+    if not run_dir or not filename or "/" in filename or not run_path.is_dir():
+        return None
+    for report_file in manifest_for_run(run_path):
+        if report_file.get("filename") == filename and "shards" in report_file:
+            return run_path, report_file
+    return None
+
+
+def sharded_report_response(request: Request, run_path: Path, report_file: dict) -> Response:
+    """Serve a sharded user's whole report, assembled from its shards, with an ETag over the shards' contents."""
+    digest = hashlib.sha256()
+    for name in report_file_members(report_file):
+        path = run_path / name
+        if path.is_file():
+            digest.update(f"{name}\0{report_file_etag(path)}\n".encode("utf-8"))
+    etag = f'"{digest.hexdigest()[:32]}"'
+    headers = _report_cache_headers(request, etag)
+    not_modified = _not_modified(request, etag, headers)
+    if not_modified is not None:
+        return not_modified
+
+    return Response(
+        content=json.dumps(load_user_report(run_path, report_file), indent=4),
+        media_type="application/json",
+        headers={
+            **headers,
+            "ETag": etag,
+            "Content-Disposition": f'attachment; filename="{report_file["filename"]}"',
+        },
+    )
+
+
+def _report_file_representations(file_path: Path) -> tuple[str, Path | None]:
+    return report_file_etag(file_path), gzip_variant(file_path)
+
+
+class UploadTooLargeError(Exception):
+    pass
+
+
+class _LimitedReader(io.RawIOBase):
+    """Read-through wrapper that fails once more than ``limit`` bytes were read from ``source``."""
+
+    def __init__(self, source: IO[bytes], limit: int) -> None:
+        self._source = source
+        self._limit = limit
+        self._consumed = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._source.read(len(buffer))
+        self._consumed += len(data)
+        if self._consumed > self._limit:
+            raise UploadTooLargeError()
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def _limited_receive(receive: Receive, limit: int) -> Receive:
+    """ASGI ``receive`` that fails once the request body grows past ``limit`` bytes."""
+    received = 0
+
+    async def receive_within_limit() -> Message:
+        nonlocal received
+        message = await receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > limit:
+                raise UploadTooLargeError()
+        return message
+
+    return receive_within_limit
+
+
+async def read_upload_form(request: Request, limit: int) -> FormData:
+    """Parse a multipart body of at most ``limit`` bytes, rejecting larger ones before they are spooled.
+
+    A declared ``Content-Length`` over the limit fails without reading the body; chunked bodies fail as soon
+    as the received bytes pass it.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+        raise UploadTooLargeError()
+    limited_request = Request(request.scope, _limited_receive(request.receive, limit))
+    return await limited_request.form(max_files=1, max_fields=10)
+
+
+def open_csv_upload(source: IO[bytes], limit: int) -> io.TextIOWrapper:
+    """Text stream over an uploaded CSV, gunzipped when it is gzip-compressed.
+
+    Both the upload and the decompressed CSV are capped at ``limit`` bytes, so a small archive cannot expand
+    without bound.
+    """
+    source.seek(0)
+    compressed = source.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+    source.seek(0)
+    raw: IO[bytes] = io.BufferedReader(_LimitedReader(source, limit))
+    if compressed:
+        raw = io.BufferedReader(_LimitedReader(gzip.GzipFile(fileobj=raw, mode="rb"), limit))
+    return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+
+
+def _run_csv_audit(source: IO[bytes], big_task_hours: float) -> dict:
+    with open_csv_upload(source, CSV_UPLOAD_MAX_BYTES) as csv_file:
         return generate_time_audit(
-            csv_content=content.decode("utf-8"),
+            csv_content=csv_file,
             big_task_hours=big_task_hours,
             output_dir=str(OUTPUT_DIR),
             write_reports=True,
             retention_hours=24,
+            report_layout=REPORT_LAYOUT,
         )
-    except Exception as exc:
-        raise HTTPException(status_code=400, detail=f"Processing error: {exc}") from exc
+
+
+def _csv_audit_pool() -> ThreadPoolExecutor:
+    global _csv_audit_executor
+    with _csv_audit_lock:
+        if _csv_audit_executor is None:
+            _csv_audit_executor = ThreadPoolExecutor(
+                max_workers=max(CSV_AUDIT_WORKERS, 1),
+                thread_name_prefix="csv-audit",
+            )
+        return _csv_audit_executor
+
+
+def shutdown_csv_audit_pool() -> None:
+    global _csv_audit_executor
+    with _csv_audit_lock:
+        executor, _csv_audit_executor = _csv_audit_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+@router.post("/api/audit")
+async def audit_csv(request: Request, big_task_hours: float = 8.0):
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"CSV uploads are limited to {CSV_UPLOAD_MAX_BYTES // (1024 * 1024)} MB.",
+    )
+    # The form is parsed here rather than through a File() parameter, so an oversized body is rejected
+    # before it is spooled to disk.
+    try:
+        form = await read_upload_form(request, CSV_UPLOAD_MAX_BYTES + MULTIPART_OVERHEAD_BYTES)
+    except UploadTooLargeError as exc:
+        raise too_large from exc
+
+    try:
+        file = form.get("file")
+        if not isinstance(file, UploadFile):
+            raise HTTPException(status_code=400, detail="A CSV file is required")
+        filename = (file.filename or "").lower()
+        if not filename.endswith((".csv", ".csv.gz")):
+            raise HTTPException(status_code=400, detail="File must be a CSV")
+        if file.size is not None and file.size > CSV_UPLOAD_MAX_BYTES:
+            raise too_large
+
+        ensure_output_dir()
+        # The upload is already spooled to a temporary file by the multipart parser; it is parsed from there
+        # on the CSV worker pool instead of being read into memory on the event loop.
+        try:
+            results = await asyncio.wrap_future(
+                _csv_audit_pool().submit(_run_csv_audit, file.file, big_task_hours)
+            )
+        except UploadTooLargeError as exc:
+            raise too_large from exc
+        except Exception as exc:
+            raise HTTPException(status_code=400, detail=f"Processing error: {exc}") from exc
+    finally:
+        await form.close()
+    forget_run_manifest(results["run_dir"])
+    return results
 
 
 @router.get("/api/reports/{run_dir}")
@@ -118,16 +652,44 @@ async def download_run_reports_zip(run_dir: str):
     if not run_path.is_dir():
         raise HTTPException(status_code=404, detail="Run directory not found")
 
-    report_names = [
-        name for name in sorted(os.listdir(run_path)) if name.endswith("_report.json")
-    ]
-    return build_reports_zip_response(run_path, report_names, f"{run_dir}_reports.zip")
+    report_names = sorted(
+        name
+        for report_file in manifest_for_run(run_path)
+        for name in report_file_members(report_file)
+        if (run_path / name).is_file()
+    )
+    return build_reports_zip_response(run_path, report_names, f"{run_dir}_reports.zip", cache=True)
+
+
+@router.get("/api/reports/{run_dir}/entries")
+async def stream_run_report_entries(
+    run_dir: str,
+    users: list[str] | None = Query(None),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+):
+    if "/" in run_dir or ".." in run_dir:
+        raise HTTPException(status_code=400, detail="Invalid run directory")
+
+    run_path = OUTPUT_DIR / run_dir
+    if not run_path.is_dir():
+        raise HTTPException(status_code=404, detail="Run directory not found")
+
+    return build_report_records_response(run_path, users, start_date, end_date)
 
 
 @router.get("/api/reports/files/{relative_path:path}")
-async def download_report_file(relative_path: str):
+async def download_report_file(relative_path: str, request: Request):
     if ".." in relative_path:
         raise HTTPException(status_code=400, detail="Invalid report path")
 
-    file_path = safe_relative_output_path(relative_path)
-    return FileResponse(file_path, media_type="application/json", filename=file_path.name)
\ No newline at end of file
+    try:
+        file_path = safe_relative_output_path(relative_path)
+    except HTTPException:
+        sharded = _sharded_report_file(relative_path)
+        if sharded is None:
+            raise
+        return await run_in_threadpool(sharded_report_response, request, *sharded)
+
+    etag, gz_path = await run_in_threadpool(_report_file_representations, file_path)
+    return report_file_response(request, file_path, etag, gz_path)
\ No newline at end of file
@@ -0,0 +1,102 @@
+from collections import defaultdict
+from datetime import date
+from typing import Any, Iterable
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from backend.models import AuditSessionTimeEntry, AuditSessionUserDayRollup, AuditSessionUserRollup
+from backend.time_entries import bulk_insert
+
+
+def compute_rollups(time_entries: Iterable[dict[str, Any]]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Aggregate entries into per user/day and per user rows.
+
+    Overlaps follow ``generate_time_audit``: consecutive entries of a user, ordered by start, end and
+    description, where the earlier one ends after the later one starts. Each overlap is counted on the
+    later entry's day.
+    """
+    entries_by_user: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for entry in time_entries:
+        entries_by_user[entry["user_name"]].append(entry)
+
+    day_rows: list[dict[str, Any]] = []
+    user_rows: list[dict[str, Any]] = []
+    for user_name in sorted(entries_by_user):
+        entries = sorted(
+            entries_by_user[user_name],
+            key=lambda entry: (entry["start_datetime"], entry["end_datetime"], entry["description"]),
+        )
+        days: dict[date, dict[str, Any]] = {}
+        previous_end = None
+        for entry in entries:
+            day = entry["start_datetime"].date()
+            row = days.get(day)
+            if row is None:
+                row = days[day] = {
+                    "user_name": user_name,
+                    "day": day,
+                    "hours": 0.0,
+                    "entry_count": 0,
+                    "overlap_count": 0,
+                    "first_start": entry["start_datetime"],
+                    "last_end": entry["end_datetime"],
+                }
+            row["hours"] += float(entry["duration_hours"])
+            row["entry_count"] += 1
+            row["last_end"] = max(row["last_end"], entry["end_datetime"])
+            if previous_end is not None and previous_end > entry["start_datetime"]:
+                row["overlap_count"] += 1
+            previous_end = entry["end_datetime"]
+
+        user_days = list(days.values())
+        day_rows.extend(user_days)
+        user_rows.append(
+            {
+                "user_name": user_name,
+                "hours": sum(row["hours"] for row in user_days),
+                "entry_count": len(entries),
+                "overlap_count": sum(row["overlap_count"] for row in user_days),
+                "day_count": len(user_days),
+                "first_start": entries[0]["start_datetime"],
+                "last_end": max(row["last_end"] for row in user_days),
+            }
+        )
+    return day_rows, user_rows
+
+
+def replace_session_rollups(
+    db: Session,
+    audit_session_id: int,
+    time_entries: Iterable[dict[str, Any]],
+    users: list[str] | None = None,
+) -> None:
+    """Rewrite the rollups of a session (or only of ``users``) from the given entries in the current transaction."""
+    day_rows, user_rows = compute_rollups(time_entries)
+    for model in (AuditSessionUserDayRollup, AuditSessionUserRollup):
+        statement = delete(model).where(model.audit_session_id == audit_session_id)
+        if users is not None:
+            statement = statement.where(model.user_name.in_(users))
+        db.execute(statement, execution_options={"synchronize_session": False})
+
+    bulk_insert(db, AuditSessionUserDayRollup.__table__, audit_session_id, day_rows)
+    bulk_insert(db, AuditSessionUserRollup.__table__, audit_session_id, user_rows)
+
+
+def refresh_user_rollups(db: Session, audit_session_id: int, users: list[str]) -> None:
+    """Recompute the rollups of ``users`` from their stored entries; overlaps can span the swapped days."""
+    if not users:
+        return
+    time_entries = db.execute(
+        select(
+            AuditSessionTimeEntry.user_name,
+            AuditSessionTimeEntry.description,
+            AuditSessionTimeEntry.start_datetime,
+            AuditSessionTimeEntry.end_datetime,
+            AuditSessionTimeEntry.duration_hours,
+        ).where(
+            AuditSessionTimeEntry.audit_session_id == audit_session_id,
+            AuditSessionTimeEntry.user_name.in_(users),
+        )
+    ).mappings()
+    replace_session_rollups(db, audit_session_id, time_entries, users=users)
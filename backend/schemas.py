@@ -1,9 +1,9 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
 from pydantic import BaseModel, ConfigDict
 
-from backend.models import Role
+from backend.models import JobStatus, Role
 
 
 class UserRead(BaseModel):
@@ -51,21 +51,185 @@ class AuditSessionRead(BaseModel):
     end_date: Optional[str] = None
     timezone: Optional[str] = None
     big_task_hours: Optional[float] = None
+    entry_count: int = 0
+    total_hours: float = 0.0
+    user_count: int = 0
+    overlap_count: int = 0
+    entries_archived_at: Optional[datetime] = None
+    is_legacy: bool = False
+    # False once the output retention sweep removed the run directory; a refresh rebuilds it.
+    run_available: bool = True
+
+
+class AuditSessionAnalysisRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    audit_session_id: int
+    big_task_hours: Optional[float] = None
     time_stats: Optional[dict] = None
     overlap_per_user: Optional[dict] = None
     small_tasks_per_user: Optional[dict] = None
     big_tasks_per_user: Optional[dict] = None
-    is_legacy: bool = False
+
+
+class EntryArchiveRead(BaseModel):
+    audit_session_id: int
+    entry_count: int
+    original_bytes: int
+    archived_bytes: int
+    saved_bytes: int
+    archived_at: Optional[datetime] = None
+
+
+class EntryArchiveReport(BaseModel):
+    items: list[EntryArchiveRead]
+    entry_count: int
+    original_bytes: int
+    archived_bytes: int
+    saved_bytes: int
 
 
 class AuditSessionUpdate(BaseModel):
     name: Optional[str] = None
 
 
+class TimeEntryRead(BaseModel):
+    id: int
+    user_name: str
+    description: str
+    tags: list[str]
+    start_datetime: datetime
+    end_datetime: datetime
+    duration_hours: float
+
+
+class TimeEntryPage(BaseModel):
+    items: list[TimeEntryRead]
+    next_cursor: Optional[str] = None
+
+
+class TimeEntrySearchHit(TimeEntryRead):
+    audit_session_id: int
+    session_name: Optional[str] = None
+    run_dir: str
+    rank: float
+
+
+class TimeEntrySearchPage(BaseModel):
+    items: list[TimeEntrySearchHit]
+    next_cursor: Optional[str] = None
+
+
+class CalendarLaneEvent(BaseModel):
+    id: str
+    entry_id: int
+    user_name: str
+    description: str
+    tags: list[str]
+    start_datetime: datetime
+    end_datetime: datetime
+    duration_hours: float
+    day: date
+    start_minutes: float
+    end_minutes: float
+    lane_index: int
+    lane_count: int
+
+
+class CalendarLaneLayout(BaseModel):
+    start_date: date
+    end_date: date
+    group_by: str
+    events: list[CalendarLaneEvent]
+
+
+class CalendarMonthDay(BaseModel):
+    user_name: str
+    day: date
+    hours: float
+    entry_count: int
+    overlap_count: int
+    has_overlap: bool
+    first_start: datetime
+    last_end: datetime
+
+
+class CalendarMonthSummary(BaseModel):
+    month: str
+    start_date: date
+    end_date: date
+    days: list[CalendarMonthDay]
+
+
+class UserDayRollupRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    user_name: str
+    day: date
+    hours: float
+    entry_count: int
+    overlap_count: int
+    first_start: datetime
+    last_end: datetime
+
+
+class UserRollupRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    user_name: str
+    hours: float
+    entry_count: int
+    overlap_count: int
+    day_count: int
+    first_start: datetime
+    last_end: datetime
+
+
+class AnalyticsUserWeekRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    user_name: str
+    week_start: date
+    hours: float
+    entry_count: int
+    day_count: int
+
+
+class AnalyticsUserTotalRead(BaseModel):
+    user_name: str
+    hours: float
+    entry_count: int
+    day_count: int
+    week_count: int
+    first_week_start: date
+    last_week_start: date
+
+
 class ApplicationLogRead(BaseModel):
     available: bool = False
     path: str
     content: str = ""
     line_count: int = 0
     updated_at: Optional[datetime] = None
-    size_bytes: int = 0
\ No newline at end of file
+    size_bytes: int = 0
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    reset: bool = False
+
+
+class AuditJobRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    kind: str
+    status: JobStatus
+    progress: float
+    message: Optional[str] = None
+    params: Optional[dict] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    audit_session_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,116 @@
+import base64
+import json
+import re
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import Float, Select, and_, cast, func, literal, literal_column, or_, select, table
+
+from backend.models import AuditSession, AuditSessionTimeEntry
+from backend.time_entries import escape_like
+
+
+# Created by migration 20260414_0013: an FTS5 table kept in sync by triggers on SQLite, a GIN index on PostgreSQL.
+FTS_TABLE = "audit_session_time_entries_fts"
+FTS_INDEX = "ix_audit_session_time_entries_description_fts"
+TS_CONFIG = "simple"
+
+_WORD = re.compile(r"\w", re.UNICODE)
+
+
+def search_terms(text: str) -> list[str]:
+    return [term for term in text.split() if _WORD.search(term)]
+
+
+def encode_search_cursor(rank: float, entry_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([rank, entry_id]).encode("utf-8")).decode("ascii")
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        rank, entry_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(rank), int(entry_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+
+
+def _fts5_query(terms: list[str]) -> str:
+    # Every term becomes a quoted phrase, so FTS5 operators and punctuation in the input are matched literally.
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def _ranked_matches(dialect_name: str, terms: list[str]):
+    """Return (entry id, rank, match condition, join target) for the dialect; a lower rank is a better match."""
+    if dialect_name == "sqlite":
+        fts = table(FTS_TABLE, literal_column("rowid"))
+        fts_name = literal_column(FTS_TABLE)
+        return fts.c.rowid, func.bm25(fts_name), fts_name.op("MATCH")(_fts5_query(terms)), fts
+
+    if dialect_name == "postgresql":
+        # Must match the indexed expression exactly for the GIN index to be used.
+        vector = func.to_tsvector(literal_column(f"'{TS_CONFIG}'"), AuditSessionTimeEntry.description)
+        query = func.plainto_tsquery(literal_column(f"'{TS_CONFIG}'"), " ".join(terms))
+        # ts_rank is a real; as a double it survives the JSON cursor round trip exactly.
+        rank = -cast(func.ts_rank(vector, query), Float)
+        return AuditSessionTimeEntry.id, rank, vector.op("@@")(query), None
+
+    # No full-text index elsewhere: every term must appear somewhere in the description.
+    condition = and_(
+        *(AuditSessionTimeEntry.description.ilike(f"%{escape_like(term)}%", escape="\\") for term in terms)
+    )
+    return AuditSessionTimeEntry.id, literal(0.0), condition, None
+
+
+def entry_search_query(
+    dialect_name: str,
+    text: str,
+    *,
+    session_ids: list[int] | None = None,
+    users: list[str] | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    cursor: str | None = None,
+) -> Select:
+    """Entries of every session whose description contains all words of ``text``, best match first.
+
+    Rows carry the entry, its session (id, name, run directory) and ``rank``; ties are broken by entry id.
+    """
+    terms = search_terms(text)
+    if not terms:
+        raise ValueError("Search text must contain at least one word.")
+
+    entry_id, rank, condition, fts = _ranked_matches(dialect_name, terms)
+    matches = select(entry_id.label("entry_id"), rank.label("rank")).where(condition)
+    if fts is not None:
+        matches = matches.select_from(fts).join(AuditSessionTimeEntry, AuditSessionTimeEntry.id == entry_id)
+    if session_ids:
+        matches = matches.where(AuditSessionTimeEntry.audit_session_id.in_(session_ids))
+    if users:
+        matches = matches.where(AuditSessionTimeEntry.user_name.in_(users))
+    if start_date is not None:
+        matches = matches.where(AuditSessionTimeEntry.start_datetime >= datetime.combine(start_date, time.min))
+    if end_date is not None:
+        matches = matches.where(
+            AuditSessionTimeEntry.start_datetime < datetime.combine(end_date + timedelta(days=1), time.min)
+        )
+    matches = matches.subquery("matches")
+
+    query = (
+        select(
+            AuditSessionTimeEntry,
+            AuditSession.name.label("session_name"),
+            AuditSession.run_dir,
+            matches.c.rank,
+        )
+        .join(matches, matches.c.entry_id == AuditSessionTimeEntry.id)
+        .join(AuditSession, AuditSession.id == AuditSessionTimeEntry.audit_session_id)
+        .order_by(matches.c.rank, matches.c.entry_id)
+    )
+    if cursor:
+        cursor_rank, cursor_id = decode_search_cursor(cursor)
+        query = query.where(
+            or_(
+                matches.c.rank > cursor_rank,
+                and_(matches.c.rank == cursor_rank, matches.c.entry_id > cursor_id),
+            )
+        )
+    return query
@@ -9,6 +9,10 @@ load_dotenv(BASE_DIR / ".env")
 
 DEFAULT_DATABASE_URL = f"sqlite:///{BASE_DIR / 'time_audit.db'}"
 DATABASE_URL = os.getenv("TIME_AUDIT_DATABASE_URL", DEFAULT_DATABASE_URL)
+ASYNC_DATABASE_URL = os.getenv("TIME_AUDIT_ASYNC_DATABASE_URL")
+DATABASE_POOL_SIZE = int(os.getenv("TIME_AUDIT_DATABASE_POOL_SIZE", "5"))
+DATABASE_MAX_OVERFLOW = int(os.getenv("TIME_AUDIT_DATABASE_MAX_OVERFLOW", "10"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("TIME_AUDIT_SQLITE_BUSY_TIMEOUT_MS", "5000"))
 ADMIN_SEED_USERNAME = "admin"
 ADMIN_SEED_FULL_NAME = "Administrator"
 ADMIN_SEED_PASSWORD = os.getenv("TIME_AUDIT_ADMIN_PASSWORD")
@@ -19,6 +23,22 @@ CLOCKIFY_REPORTS_BASE_URL = os.getenv(
     "https://reports.api.clockify.me/v1",
 )
 CLOCKIFY_WORKSPACE_ID = os.getenv("TIME_AUDIT_CLOCKIFY_WORKSPACE_ID")
+CLOCKIFY_REFRESH_LOOKBACK_DAYS = int(os.getenv("TIME_AUDIT_CLOCKIFY_REFRESH_LOOKBACK_DAYS", "14"))
+CLOCKIFY_PAGE_SIZE = int(os.getenv("TIME_AUDIT_CLOCKIFY_PAGE_SIZE", "200"))
+CLOCKIFY_MAX_RETRIES = int(os.getenv("TIME_AUDIT_CLOCKIFY_MAX_RETRIES", "3"))
+CLOCKIFY_SHARD_SIZE = os.getenv("TIME_AUDIT_CLOCKIFY_SHARD_SIZE", "month").lower()
+CLOCKIFY_SHARD_CONCURRENCY = int(os.getenv("TIME_AUDIT_CLOCKIFY_SHARD_CONCURRENCY", "4"))
+CLOCKIFY_CHECKPOINT_DIR = Path(os.getenv("TIME_AUDIT_CLOCKIFY_CHECKPOINT_DIR", BASE_DIR / "checkpoints" / "clockify"))
+CLOCKIFY_CHECKPOINT_TTL_SECONDS = int(os.getenv("TIME_AUDIT_CLOCKIFY_CHECKPOINT_TTL_SECONDS", str(6 * 60 * 60)))
+BULK_INSERT_BATCH_SIZE = int(os.getenv("TIME_AUDIT_BULK_INSERT_BATCH_SIZE", "5000"))
+AUDIT_JOB_WORKERS = int(os.getenv("TIME_AUDIT_AUDIT_JOB_WORKERS", "2"))
+AUDIT_JOB_RESULT_TTL_SECONDS = float(os.getenv("TIME_AUDIT_AUDIT_JOB_RESULT_TTL_SECONDS", "0"))
+ARCHIVE_AFTER_DAYS = int(os.getenv("TIME_AUDIT_ARCHIVE_AFTER_DAYS", "180"))
+ARCHIVE_CACHE_SIZE = int(os.getenv("TIME_AUDIT_ARCHIVE_CACHE_SIZE", "8"))
+MANIFEST_CACHE_SIZE = int(os.getenv("TIME_AUDIT_MANIFEST_CACHE_SIZE", "256"))
+REPORT_LAYOUT = os.getenv("TIME_AUDIT_REPORT_LAYOUT", "single").lower()
+CSV_UPLOAD_MAX_BYTES = int(os.getenv("TIME_AUDIT_CSV_UPLOAD_MAX_BYTES", str(50 * 1024 * 1024)))
+CSV_AUDIT_WORKERS = int(os.getenv("TIME_AUDIT_CSV_AUDIT_WORKERS", "2"))
 
 
 def require_admin_seed_password() -> str:
@@ -30,4 +50,4 @@ def require_admin_seed_password() -> str:
 def require_clockify_api_key() -> str:
     if not CLOCKIFY_API_KEY:
         raise RuntimeError("TIME_AUDIT_CLOCKIFY_API_KEY must be set in .env before fetching Clockify reports.")
-    return CLOCKIFY_API_KEY
\ No newline at end of file
+    return CLOCKIFY_API_KEY
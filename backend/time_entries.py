@@ -0,0 +1,204 @@
+import base64
+import itertools
+import json
+from datetime import date, datetime, time, timedelta
+from typing import Any, Iterable
+
+from sqlalchemy import Select, Table, delete, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from backend.models import AuditSessionTimeEntry, ClockifyRawEntry
+from backend.settings import BULK_INSERT_BATCH_SIZE
+
+
+TAG_SEPARATOR = ", "
+TIME_ENTRY_COLUMNS = (
+    AuditSessionTimeEntry.id,
+    AuditSessionTimeEntry.user_name,
+    AuditSessionTimeEntry.description,
+    AuditSessionTimeEntry.tags,
+    AuditSessionTimeEntry.start_datetime,
+    AuditSessionTimeEntry.end_datetime,
+    AuditSessionTimeEntry.duration_hours,
+)
+
+
+def join_tags(tags: list[str]) -> str:
+    return TAG_SEPARATOR.join(tags)
+
+
+def split_tags(tags: str) -> list[str]:
+    return [tag.strip() for tag in (tags or "").split(",") if tag.strip()]
+
+
+def _parse_report_datetime(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+
+
+def build_time_entry_values(report_by_user_by_date: dict) -> list[dict[str, Any]]:
+    time_entries: list[dict[str, Any]] = []
+    for user_name, dates in (report_by_user_by_date or {}).items():
+        for items in (dates or {}).values():
+            for item in items or []:
+                start_raw = item.get("start_datetime")
+                end_raw = item.get("end_datetime")
+                duration_hours = item.get("duration")
+                if not start_raw or not end_raw or duration_hours is None:
+                    continue
+
+                time_entries.append(
+                    {
+                        "user_name": user_name,
+                        "description": item.get("description") or "",
+                        "tags": join_tags(item.get("tags") or []),
+                        "start_datetime": _parse_report_datetime(start_raw),
+                        "end_datetime": _parse_report_datetime(end_raw),
+                        "duration_hours": float(duration_hours),
+                    }
+                )
+
+    time_entries.sort(
+        key=lambda entry: (entry["user_name"], entry["start_datetime"], entry["end_datetime"], entry["description"])
+    )
+    return time_entries
+
+
+def supports_copy(db: Session) -> bool:
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg"
+
+
+def copy_insert(db: Session, table: Table, audit_session_id: int, rows: Iterable[dict[str, Any]]) -> int:
+    """Stream rows into ``table`` with PostgreSQL ``COPY ... FROM STDIN`` inside the session's transaction."""
+    rows = iter(rows)
+    first_row = next(rows, None)
+    if first_row is None:
+        return 0
+
+    value_columns = [column for column in first_row if column != "audit_session_id"]
+    preparer = db.get_bind().dialect.identifier_preparer
+    column_list = ", ".join(preparer.quote(column) for column in ["audit_session_id", *value_columns])
+    statement = f"COPY {preparer.format_table(table)} ({column_list}) FROM STDIN"
+
+    copied = 0
+    driver_connection = db.connection().connection.driver_connection
+    with driver_connection.cursor() as cursor, cursor.copy(statement) as copy:
+        for row in itertools.chain([first_row], rows):
+            copy.write_row([audit_session_id, *(row[column] for column in value_columns)])
+            copied += 1
+    return copied
+
+
+def batched_insert(
+    db: Session,
+    table: Table,
+    audit_session_id: int,
+    rows: Iterable[dict[str, Any]],
+    batch_size: int = BULK_INSERT_BATCH_SIZE,
+) -> int:
+    """Insert rows with Core ``executemany`` in batches, skipping the ORM unit of work and identity map."""
+    statement = insert(table)
+    batch_size = max(batch_size, 1)
+    batch: list[dict[str, Any]] = []
+    inserted = 0
+    for row in rows:
+        batch.append({**row, "audit_session_id": audit_session_id})
+        if len(batch) >= batch_size:
+            db.execute(statement, batch)
+            inserted += len(batch)
+            batch = []
+    if batch:
+        db.execute(statement, batch)
+        inserted += len(batch)
+    return inserted
+
+
+def bulk_insert(
+    db: Session,
+    table: Table,
+    audit_session_id: int,
+    rows: Iterable[dict[str, Any]],
+    batch_size: int = BULK_INSERT_BATCH_SIZE,
+) -> int:
+    """Load rows with ``COPY`` on PostgreSQL (psycopg) and with batched inserts everywhere else."""
+    if supports_copy(db):
+        return copy_insert(db, table, audit_session_id, rows)
+    return batched_insert(db, table, audit_session_id, rows, batch_size)
+
+
+def replace_session_entries(
+    db: Session,
+    audit_session_id: int,
+    time_entries: Iterable[dict[str, Any]],
+    raw_entries: Iterable[dict[str, Any]] | None = None,
+    batch_size: int = BULK_INSERT_BATCH_SIZE,
+) -> int:
+    """Swap every stored time entry (and, when given, raw entry) of a session in the current transaction.
+
+    Loaded ``time_entries``/``raw_entries`` collections are stale afterwards and must be expired by the caller.
+    """
+    db.execute(
+        delete(AuditSessionTimeEntry).where(AuditSessionTimeEntry.audit_session_id == audit_session_id),
+        execution_options={"synchronize_session": False},
+    )
+    if raw_entries is not None:
+        db.execute(
+            delete(ClockifyRawEntry).where(ClockifyRawEntry.audit_session_id == audit_session_id),
+            execution_options={"synchronize_session": False},
+        )
+        bulk_insert(db, ClockifyRawEntry.__table__, audit_session_id, raw_entries, batch_size)
+    return bulk_insert(db, AuditSessionTimeEntry.__table__, audit_session_id, time_entries, batch_size)
+
+
+def encode_time_entry_cursor(user_name: str, start_datetime: datetime, entry_id: int) -> str:
+    payload = [user_name, start_datetime.isoformat(), entry_id]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def decode_time_entry_cursor(cursor: str) -> tuple[str, datetime, int]:
+    try:
+        user_name, start_raw, entry_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(user_name), datetime.fromisoformat(start_raw), int(entry_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def time_entry_query(
+    audit_session_id: int,
+    *,
+    users: list[str] | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    search: str | None = None,
+    cursor: str | None = None,
+) -> Select:
+    """Entry rows of one session in (user, start, id) order, which the session/user/start index serves directly."""
+    query = (
+        select(*TIME_ENTRY_COLUMNS)
+        .where(AuditSessionTimeEntry.audit_session_id == audit_session_id)
+        .order_by(AuditSessionTimeEntry.user_name, AuditSessionTimeEntry.start_datetime, AuditSessionTimeEntry.id)
+    )
+    if users:
+        query = query.where(AuditSessionTimeEntry.user_name.in_(users))
+    if start_date is not None:
+        query = query.where(AuditSessionTimeEntry.start_datetime >= datetime.combine(start_date, time.min))
+    if end_date is not None:
+        query = query.where(
+            AuditSessionTimeEntry.start_datetime < datetime.combine(end_date + timedelta(days=1), time.min)
+        )
+    if search:
+        query = query.where(AuditSessionTimeEntry.description.ilike(f"%{escape_like(search)}%", escape="\\"))
+    if cursor:
+        query = query.where(
+            tuple_(
+                AuditSessionTimeEntry.user_name,
+                AuditSessionTimeEntry.start_datetime,
+                AuditSessionTimeEntry.id,
+            )
+            > decode_time_entry_cursor(cursor)
+        )
+    return query
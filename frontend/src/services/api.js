@@ -24,6 +24,13 @@ export const clearSession = () => {
   window.localStorage.removeItem(STORAGE_KEY)
 }
 
+const handleUnauthorized = () => {
+  clearSession()
+  if (window.location.pathname.startsWith('/in')) {
+    window.location.assign('/login')
+  }
+}
+
 const api = axios.create()
 
 api.interceptors.request.use((config) => {
@@ -39,13 +46,78 @@ api.interceptors.response.use(
   (response) => response,
   (error) => {
     if (error.response?.status === 401) {
-      clearSession()
-      if (window.location.pathname.startsWith('/in')) {
-        window.location.assign('/login')
-      }
+      handleUnauthorized()
     }
     return Promise.reject(error)
   }
 )
 
+// Failed responses reject with an axios-like error, so callers can keep reading error.response.data.detail.
+const openTextStream = async (url, { params, signal } = {}) => {
+  const query = params ? `?${new URLSearchParams(params)}` : ''
+  const session = getStoredSession()
+  const response = await fetch(`${url}${query}`, {
+    headers: session?.token ? { Authorization: `Bearer ${session.token}` } : {},
+    signal,
+  })
+
+  if (!response.ok) {
+    if (response.status === 401) {
+      handleUnauthorized()
+    }
+    const data = await response.json().catch(() => ({}))
+    const error = new Error(data?.detail || `Request failed with status code ${response.status}`)
+    error.response = { status: response.status, data }
+    throw error
+  }
+
+  return response.body.pipeThrough(new TextDecoderStream()).getReader()
+}
+
+// Reads an NDJSON response line by line and hands every parsed record to onRecord as soon as it arrives.
+export const streamNdjson = async (url, { params, onRecord, signal } = {}) => {
+  const reader = await openTextStream(url, { params, signal })
+  let buffer = ''
+  for (;;) {
+    const { value, done } = await reader.read()
+    if (done) break
+
+    buffer += value
+    const lines = buffer.split('\n')
+    buffer = lines.pop()
+    lines.forEach((line) => {
+      if (line.trim()) onRecord(JSON.parse(line))
+    })
+  }
+  if (buffer.trim()) onRecord(JSON.parse(buffer))
+}
+
+// Reads a Server-Sent Events response and hands every event ({ id, event, data }) to onEvent.
+// EventSource cannot send the bearer token, so the stream is read with fetch like the NDJSON ones.
+export const streamServerEvents = async (url, { params, onEvent, signal } = {}) => {
+  const reader = await openTextStream(url, { params, signal })
+  let buffer = ''
+  for (;;) {
+    const { value, done } = await reader.read()
+    if (done) break
+
+    buffer += value.replace(/\r\n?/g, '\n')
+    const blocks = buffer.split('\n\n')
+    buffer = blocks.pop()
+    blocks.forEach((block) => {
+      const event = { id: '', event: 'message', data: '' }
+      const dataLines = []
+      block.split('\n').forEach((line) => {
+        if (!line || line.startsWith(':')) return
+        const separator = line.indexOf(':')
+        const field = separator === -1 ? line : line.slice(0, separator)
+        const fieldValue = separator === -1 ? '' : line.slice(separator + 1).replace(/^ /, '')
+        if (field === 'data') dataLines.push(fieldValue)
+        else if (field === 'id' || field === 'event') event[field] = fieldValue
+      })
+      if (dataLines.length) onEvent({ ...event, data: dataLines.join('\n') })
+    })
+  }
+}
+
 export default api
\ No newline at end of file
@@ -1,6 +1,6 @@
-import api, { getStoredSession } from '../../services/api'
+import api, { getStoredSession, streamNdjson } from '../../services/api'
 import { addDays, calendarHourHeight, clamp, sortedRowsByTime, startOfDay, toCalendarKey } from '../../utils/calendarUtils'
-import { buildFlatRows, downloadBlob, todayKey, userColorPalette } from './helpers'
+import { buildEntryRows, buildFlatRows, downloadBlob, todayKey, userColorPalette } from './helpers'
 import { clearSelectionState, resetStoreState } from './mutations'
 
 export const reportReviewActions = {
@@ -54,16 +54,94 @@ export const reportReviewActions = {
     }
   },
 
-  selectCalendarDay(day) {
-    if (!day.items.length) return
+  async selectCalendarDay(day) {
+    if (!day.entryCount) return
     this.focusedDateKey = day.key
     this.selectedDayKey = day.key
-    this.selectedDayItems = day.items
+    this.selectedDayItems = day.summaries ? [] : day.items
     this.dayDialogOpen = true
+    if (!day.summaries) return
+
+    // Aggregated months hold no entries; fetch the day's entries on drill-in.
+    const items = await this.loadDayEntries(day.key)
+    if (this.selectedDayKey === day.key) {
+      this.selectedDayItems = items
+    }
+  },
+
+  async loadDayEntries(dayKey) {
+    const query = this.calendarMonthQuery
+    if (!query) return []
+
+    const entries = []
+    let cursor = null
+    try {
+      do {
+        const params = new URLSearchParams([
+          ['start_date', dayKey],
+          ['end_date', dayKey],
+          ['limit', '5000'],
+          ...query.users.map((user) => ['users', user]),
+        ])
+        if (cursor) params.append('cursor', cursor)
+        const { data } = await api.get(`/api/in/sessions/${query.sessionId}/entries`, { params })
+        entries.push(...(data.items || []))
+        cursor = data.next_cursor
+      } while (cursor)
+    } catch (requestError) {
+      this.error = requestError.response?.data?.detail || 'Could not load the entries of this day.'
+    }
+    return sortedRowsByTime(buildEntryRows(entries))
   },
 
-  openCurrentRunAnalysisDialog() {
+  async loadCalendarMonthSummaries() {
+    const query = this.calendarMonthQuery
+    if (!query || this.calendarMonthSummaries?.key === query.key) return
+
+    try {
+      const responses = await Promise.all(query.months.map((month) => api.get(
+        `/api/in/sessions/${query.sessionId}/calendar/month`,
+        { params: new URLSearchParams([['month', month], ...query.users.map((user) => ['users', user])]) },
+      )))
+      if (this.calendarMonthQuery?.key === query.key) {
+        this.calendarMonthSummaries = { key: query.key, days: responses.flatMap(({ data }) => data.days || []) }
+      }
+    } catch {
+      this.calendarMonthSummaries = null
+    }
+  },
+
+  async openCurrentRunAnalysisDialog() {
     this.currentRunAnalysisDialogOpen = true
+    if (!this.currentRun?.id || this.currentRunAnalysis?.audit_session_id === this.currentRun.id) return
+
+    this.currentRunAnalysis = null
+    try {
+      const { data } = await api.get(`/api/in/sessions/${this.currentRun.id}/analysis`)
+      this.currentRunAnalysis = data
+    } catch {
+      this.currentRunAnalysis = null
+    }
+  },
+
+  async loadCalendarLanes() {
+    const query = this.calendarLaneQuery
+    if (!query || this.calendarLanes?.key === query.key) return
+
+    try {
+      const { data } = await api.get(`/api/in/sessions/${query.sessionId}/calendar/lanes`, {
+        params: new URLSearchParams([
+          ...Object.entries(query.params).filter(([name]) => name !== 'users'),
+          ...query.params.users.map((user) => ['users', user]),
+        ]),
+      })
+      // A slower response for a window the user already left must not replace the current one.
+      if (this.calendarLaneQuery?.key === query.key) {
+        this.calendarLanes = { key: query.key, events: data.events || [] }
+      }
+    } catch {
+      this.calendarLanes = null
+    }
   },
 
   clearCalendarFilters() {
@@ -149,45 +227,56 @@ export const reportReviewActions = {
     this.calendarMode = 'day'
   },
 
-  async loadReport() {
+  async loadReport({ keepSelection = false } = {}) {
     if (!this.runDir) {
       this.error = 'Missing run directory.'
       this.rows = []
+      this.loading = false
       return
     }
 
     this.loading = true
     this.error = ''
     this.rows = []
-    this.reportFiles = []
+    this.rowsRunDir = this.runDir
+    if (!keepSelection) {
+      this.reportFiles = []
+    }
     try {
-      const { data: runData } = await api.get(`/api/in/reports/${this.runDir}`)
-      const files = runData?.report_files || []
-      this.reportFiles = files
-      if (!files.length) {
-        this.rows = []
-        clearSelectionState(this.$state)
-        return
+      // One streamed request for the manifest and every user's report; rows render as they arrive.
+      const flatRows = []
+      let lastRenderAt = 0
+      const renderRows = (done) => {
+        this.rows = sortedRowsByTime(flatRows)
+        if (this.selectedUser && !this.activeLegendUsers.length) {
+          this.activeLegendUsers = flatRows.some((row) => row.user === this.selectedUser) ? [this.selectedUser] : []
+        }
+        // With a selected user, wait for the whole run before falling back to the first legend user.
+        if (this.calendarMode === 'week' && !this.activeLegendUsers.length && (done || !this.selectedUser)) {
+          this.activeLegendUsers = this.legendUsers.length ? [this.legendUsers[0]] : []
+        }
+        this.syncFocusedDate()
+        this.loading = false
+        lastRenderAt = Date.now()
       }
 
-      const reportResponses = await Promise.all(
-        files.map(async (rf) => {
-          const response = await api.get(`/api/in/reports/files/${rf.relative_path}`)
-          return { user: rf.user, report: response.data }
-        })
-      )
-
-      const flatRows = buildFlatRows(reportResponses)
-
-      this.rows = sortedRowsByTime(flatRows)
-      clearSelectionState(this.$state)
-      if (this.selectedUser) {
-        this.activeLegendUsers = flatRows.some((row) => row.user === this.selectedUser) ? [this.selectedUser] : []
-      }
-      if (this.calendarMode === 'week' && !this.activeLegendUsers.length) {
-        this.activeLegendUsers = this.legendUsers.length ? [this.legendUsers[0]] : []
-      }
-      this.syncFocusedDate()
+      await streamNdjson(`/api/in/reports/${this.runDir}/entries`, {
+        onRecord: (record) => {
+          if (record.type === 'manifest') {
+            this.reportFiles = record.report_files || []
+            if (!keepSelection) {
+              clearSelectionState(this.$state)
+            }
+            return
+          }
+
+          flatRows.push(...buildFlatRows([{ user: record.user, report: { [record.date]: record.tasks } }]))
+          if (Date.now() - lastRenderAt > 150) {
+            renderRows(false)
+          }
+        },
+      })
+      renderRows(true)
     } catch (requestError) {
       this.error = requestError.response?.data?.detail || 'Could not load run reports.'
     } finally {
@@ -231,16 +320,44 @@ export const reportReviewActions = {
 
   async loadCurrentRun() {
     this.currentRun = null
+    this.currentRunAnalysis = null
+    this.calendarLanes = null
+    this.calendarMonthSummaries = null
     if (!this.runDir) return
 
     try {
-      const { data } = await api.get('/api/in/runs')
-      this.currentRun = (data.items || []).find((item) => item.run_dir === this.runDir) || null
+      const { data } = await api.get('/api/in/runs', { params: { run_dir: this.runDir, limit: 1 } })
+      this.currentRun = (data.items || [])[0] || null
     } catch {
       this.currentRun = null
     }
   },
 
+  async loadContext() {
+    this.loading = true
+    await this.loadCurrentRun()
+    if (this.rowsNeeded) {
+      await this.loadReport()
+      return
+    }
+
+    // The month view is served from the session's rollups; rows are loaded once another view needs them.
+    this.error = ''
+    this.rows = []
+    this.rowsRunDir = ''
+    this.reportFiles = this.currentRun.report_files || []
+    clearSelectionState(this.$state)
+    if (this.reportFiles.some((reportFile) => reportFile.user === this.selectedUser)) {
+      this.activeLegendUsers = [this.selectedUser]
+    }
+    this.loading = false
+  },
+
+  async ensureReportRows() {
+    if (!this.rowsNeeded || this.loading || this.rowsRunDir === this.runDir) return
+    await this.loadReport({ keepSelection: true })
+  },
+
   async refreshCurrentSession() {
     if (!this.canRefreshCurrentRun) return
 
@@ -248,7 +365,9 @@ export const reportReviewActions = {
     this.error = ''
     try {
       await api.post(`/api/in/sessions/${this.currentRun.id}/refresh`)
-      await Promise.all([this.loadCurrentRun(), this.loadReport()])
+      await this.loadContext()
+      // loadCurrentRun dropped the cached lanes and month summaries, and their query keys did not change.
+      await Promise.all([this.loadCalendarLanes(), this.loadCalendarMonthSummaries()])
     } catch (requestError) {
       this.error = requestError.response?.data?.detail || 'Could not refresh session.'
     } finally {
@@ -269,8 +388,7 @@ export const reportReviewActions = {
       return
     }
 
-    void this.loadCurrentRun()
-    void this.loadReport()
+    void this.loadContext()
   },
 
   resetStore() {
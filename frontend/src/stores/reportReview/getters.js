@@ -18,7 +18,7 @@ import {
   weekdayLongFormatter,
   weekdayShortFormatter,
 } from '../../utils/calendarUtils'
-import { sortDateKeys, todayKey, userColorPalette } from './helpers'
+import { buildLaneRows, buildMonthSummariesByDay, sortDateKeys, todayKey, userColorPalette } from './helpers'
 
 export const reportReviewGetters = {
   runDir: (state) => {
@@ -33,6 +33,9 @@ export const reportReviewGetters = {
     return Boolean(run?.id && run?.start_date && run?.end_date && run?.timezone)
   },
 
+  // A stored session's month view renders server aggregates, so only the other views need the report rows.
+  rowsNeeded: (state) => !(state.currentRun?.id && state.viewMode === 'calendar' && state.calendarMode === 'month'),
+
   userFilteredRows: (state) => state.rows,
 
   effectiveLegendUsers() {
@@ -120,8 +123,12 @@ export const reportReviewGetters = {
       }))
   },
 
-  legendUsers() {
-    return Array.from(new Set(this.userFilteredRows.map((row) => row.user))).sort()
+  legendUsers(state) {
+    // Without rows (month view of a stored session) the run's report files name its users.
+    const users = this.userFilteredRows.length
+      ? this.userFilteredRows.map((row) => row.user)
+      : state.reportFiles.map((reportFile) => reportFile.user)
+    return Array.from(new Set(users)).sort()
   },
 
   showTodayShortcut(state) {
@@ -252,8 +259,42 @@ export const reportReviewGetters = {
     return this.weekCalendarBounds.totalHours * calendarHourHeight
   },
 
+  calendarLaneQuery(state) {
+    const sessionId = state.currentRun?.id
+    if (!sessionId || state.viewMode !== 'calendar' || !this.focusedDate) return null
+
+    const weekMode = this.calendarMode === 'week'
+    if (!weekMode && this.calendarMode !== 'day') return null
+
+    const params = {
+      start_date: weekMode ? this.weekDays[0].key : this.focusedDateKey,
+      end_date: weekMode ? this.weekDays[this.weekDays.length - 1].key : this.focusedDateKey,
+      group_by: weekMode ? 'day' : 'user',
+      users: this.effectiveLegendUsers,
+    }
+    return { key: JSON.stringify([sessionId, params]), sessionId, params }
+  },
+
+  // Lane-assigned rows from the server for the visible window, keyed by day (week view) or user (day view).
+  calendarLaneRows(state) {
+    const query = this.calendarLaneQuery
+    if (!query || state.calendarLanes?.key !== query.key) return null
+
+    return buildLaneRows(state.calendarLanes.events).reduce((acc, row) => {
+      const columnKey = query.params.group_by === 'day' ? row.dayKey : row.user
+      if (!acc[columnKey]) acc[columnKey] = []
+      acc[columnKey].push(row)
+      return acc
+    }, {})
+  },
+
   weekCalendarColumns() {
+    const laneRows = this.calendarLaneRows
     return this.weekDays.map((day) => {
+      if (laneRows) {
+        return { ...day, layoutItems: laneRows[day.key] || [] }
+      }
+
       const dayDate = parseReportDate(day.key)
       const segmentedItems = dayDate ? buildWeeklyDaySegments(this.filteredRows, dayDate) : []
       return {
@@ -311,11 +352,12 @@ export const reportReviewGetters = {
   },
 
   dayCalendarColumns() {
+    const laneRows = this.calendarLaneRows
     return this.dayUserColumns.map((column) => ({
       key: column.user,
       user: column.user,
       items: column.items,
-      layoutItems: layoutCalendarItems(column.items),
+      layoutItems: laneRows ? laneRows[column.user] || [] : layoutCalendarItems(column.items),
     }))
   },
 
@@ -325,36 +367,64 @@ export const reportReviewGetters = {
     }
   },
 
-  calendarMonths() {
-    const groups = this.dateGroups
-    if (!groups.length) {
-      return []
+  calendarMonthKeys(state) {
+    const monthKeys = new Set()
+    const run = state.currentRun
+    if (run?.start_date && run?.end_date) {
+      // A stored session knows its own range, so the month view does not wait for the report rows.
+      const cursor = new Date(`${run.start_date.slice(0, 7)}-01T00:00:00`)
+      const lastKey = run.end_date.slice(0, 7)
+      while (toCalendarKey(cursor).slice(0, 7) <= lastKey) {
+        monthKeys.add(toCalendarKey(cursor).slice(0, 7))
+        cursor.setMonth(cursor.getMonth() + 1)
+      }
+      return Array.from(monthKeys)
     }
 
-    const itemsByDate = Object.fromEntries(
-      groups
-        .filter((group) => group.parsedDate)
-        .map((group) => [toCalendarKey(group.parsedDate), group.items])
-    )
-    const monthBuckets = new Map()
-
-    groups.forEach((group) => {
-      if (!group.parsedDate) {
-        return
-      }
-      const year = group.parsedDate.getFullYear()
-      const month = group.parsedDate.getMonth() + 1
-      const key = `${year}-${String(month).padStart(2, '0')}`
-      if (!monthBuckets.has(key)) {
-        monthBuckets.set(key, { year, month })
-      }
+    this.dateGroups.forEach((group) => {
+      if (!group.parsedDate) return
+      monthKeys.add(toCalendarKey(group.parsedDate).slice(0, 7))
     })
+    return Array.from(monthKeys).sort((left, right) => left.localeCompare(right))
+  },
+
+  calendarMonthQuery(state) {
+    const sessionId = state.currentRun?.id
+    if (!sessionId || state.viewMode !== 'calendar' || this.calendarMode !== 'month') return null
+    if (!this.calendarMonthKeys.length) return null
+
+    const months = this.calendarMonthKeys
+    const users = this.effectiveLegendUsers
+    return { key: JSON.stringify([sessionId, months, users]), sessionId, months, users }
+  },
+
+  // Per user/day aggregates from the server, or null while the month view still lays out the loaded rows.
+  calendarMonthSummariesByDay(state) {
+    const query = this.calendarMonthQuery
+    if (!query || state.calendarMonthSummaries?.key !== query.key) return null
+    return buildMonthSummariesByDay(state.calendarMonthSummaries.days)
+  },
+
+  visibleEntryCount(state) {
+    if (!this.calendarMonthSummariesByDay) return this.filteredRows.length
+    return state.calendarMonthSummaries.days.reduce((total, summary) => total + summary.entry_count, 0)
+  },
+
+  calendarMonths() {
+    const summariesByDay = this.calendarMonthSummariesByDay
+    const itemsByDate = summariesByDay
+      ? {}
+      : Object.fromEntries(
+        this.dateGroups
+          .filter((group) => group.parsedDate)
+          .map((group) => [toCalendarKey(group.parsedDate), group.items])
+      )
 
-    return Array.from(monthBuckets.entries())
-      .sort(([left], [right]) => left.localeCompare(right))
-      .map(([key, value]) => {
-        const monthStart = new Date(value.year, value.month - 1, 1)
-        const monthEnd = new Date(value.year, value.month, 0)
+    return this.calendarMonthKeys
+      .map((key) => {
+        const [year, month] = key.split('-').map(Number)
+        const monthStart = new Date(year, month - 1, 1)
+        const monthEnd = new Date(year, month, 0)
         const gridStart = new Date(monthStart)
         const startOffset = (gridStart.getDay() + 6) % 7
         gridStart.setDate(gridStart.getDate() - startOffset)
@@ -366,16 +436,22 @@ export const reportReviewGetters = {
         const cursor = new Date(gridStart)
         while (cursor <= gridEnd) {
           const dayKey = toCalendarKey(cursor)
+          const summaries = summariesByDay ? summariesByDay[dayKey] || [] : null
+          const items = summaries ? [] : sortedRowsByTime(itemsByDate[dayKey] || [])
           days.push({
             key: dayKey,
             label: cursor.getDate(),
             inCurrentMonth: cursor.getMonth() === monthStart.getMonth(),
-            items: sortedRowsByTime(itemsByDate[dayKey] || []),
+            items,
+            summaries,
+            entryCount: summaries
+              ? summaries.reduce((total, summary) => total + summary.entryCount, 0)
+              : items.length,
           })
           cursor.setDate(cursor.getDate() + 1)
         }
 
-        const entryCount = days.reduce((total, day) => total + day.items.length, 0)
+        const entryCount = days.reduce((total, day) => total + day.entryCount, 0)
         return {
           key,
           label: monthLabelFormatter.format(monthStart),
@@ -383,6 +459,7 @@ export const reportReviewGetters = {
           entryCount,
         }
       })
+      .filter((month) => month.entryCount > 0)
   },
 
   calendarPeriodLabel() {
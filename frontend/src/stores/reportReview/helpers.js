@@ -53,6 +53,68 @@ export const buildFlatRows = (reportResponses) => {
   return flatRows
 }
 
+const formatDurationHm = (hours) => {
+  const wholeHours = Math.trunc(hours)
+  return `${wholeHours}h ${Math.trunc((hours - wholeHours) * 60)}m`
+}
+
+const formatTimeOfDay = (value) => String(value || '').slice(11, 19)
+
+// Stored entries from the API, shaped like the rows built from report files.
+const buildEntryRow = (entry) => {
+  const startDateTime = parseReportDateTime(entry.start_datetime)
+  const endDateTime = parseReportDateTime(entry.end_datetime)
+  const dayKey = startDateTime ? toCalendarKey(startDateTime) : ''
+  return {
+    id: String(entry.id),
+    user: entry.user_name,
+    date: dayKey,
+    description: entry.description,
+    tags: entry.tags || [],
+    duration: entry.duration_hours,
+    duration_hm: formatDurationHm(entry.duration_hours),
+    startTime: formatTimeOfDay(entry.start_datetime),
+    endTime: formatTimeOfDay(entry.end_datetime),
+    startDateTime,
+    endDateTime,
+    endDate: endDateTime ? toCalendarKey(endDateTime) : '',
+    dayKey,
+  }
+}
+
+export const buildEntryRows = (entries) => entries.map(buildEntryRow)
+
+// Server lane events carry their position already; give them the fields the calendar cards read.
+export const buildLaneRows = (events) => {
+  return events.map((event) => ({
+    ...buildEntryRow(event),
+    id: event.id,
+    dayKey: event.day,
+    segmentDateKey: event.day,
+    startMinutes: event.start_minutes,
+    endMinutes: event.end_minutes,
+    laneIndex: event.lane_index,
+    laneCount: event.lane_count,
+  }))
+}
+
+// Month aggregates from the server, grouped by day key.
+export const buildMonthSummariesByDay = (days) => {
+  return days.reduce((acc, summary) => {
+    if (!acc[summary.day]) acc[summary.day] = []
+    acc[summary.day].push({
+      user: summary.user_name,
+      hours: summary.hours,
+      duration_hm: formatDurationHm(summary.hours),
+      entryCount: summary.entry_count,
+      hasOverlap: summary.has_overlap,
+      firstTime: formatTimeOfDay(summary.first_start),
+      lastTime: formatTimeOfDay(summary.last_end),
+    })
+    return acc
+  }, {})
+}
+
 export const downloadBlob = (blob, fileName) => {
   const blobUrl = window.URL.createObjectURL(blob)
   const link = document.createElement('a')
@@ -7,8 +7,13 @@ export const createReportReviewState = () => ({
   loading: false,
   error: '',
   rows: [],
+  // Run directory the loaded rows belong to; empty while a stored session's month view runs without them.
+  rowsRunDir: '',
   reportFiles: [],
   currentRun: null,
+  currentRunAnalysis: null,
+  calendarLanes: null,
+  calendarMonthSummaries: null,
   refreshLoading: false,
   viewMode: 'calendar',
   calendarMode: 'month',
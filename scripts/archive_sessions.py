@@ -0,0 +1,35 @@
+import argparse
+
+from backend.archive import archive_old_sessions
+from backend.database import SessionLocal
+from backend.settings import ARCHIVE_AFTER_DAYS
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Pack the time entries of old audit sessions into compressed archives.")
+    parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=ARCHIVE_AFTER_DAYS,
+        help="Archive sessions not synced for this many days. Defaults to TIME_AUDIT_ARCHIVE_AFTER_DAYS.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    with SessionLocal() as session:
+        archives = archive_old_sessions(session, args.older_than_days)
+
+    for archive in archives:
+        print(
+            f"Session {archive['audit_session_id']}: {archive['entry_count']} entries, "
+            f"{archive['original_bytes']} -> {archive['archived_bytes']} bytes."
+        )
+    saved_bytes = sum(archive["saved_bytes"] for archive in archives)
+    print(f"Archived {len(archives)} sessions, saving about {saved_bytes} bytes.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
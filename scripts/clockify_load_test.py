@@ -0,0 +1,138 @@
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import date
+
+import httpx
+
+# Keep shard checkpoints of the synthetic runs away from the real checkpoint directory.
+os.environ.setdefault("TIME_AUDIT_CLOCKIFY_CHECKPOINT_DIR", tempfile.mkdtemp(prefix="clockify-load-test-"))
+
+from backend.clockify.client import ClockifyClient  # noqa: E402
+from backend.clockify.fake import FakeClockifyApi, FakeClockifyConfig  # noqa: E402
+from time_audit import generate_time_audit  # noqa: E402
+
+
+class TimedTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+        self.latencies: list[float] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started_at = time.perf_counter()
+        response = await self._transport.handle_async_request(request)
+        self.latencies.append(time.perf_counter() - started_at)
+        return response
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Drive full Clockify audits against a local fake Clockify API.")
+    parser.add_argument("--users", type=int, default=20, help="Number of synthetic workspace users.")
+    parser.add_argument("--entries-per-day", type=int, default=6, help="Entries per user per working day.")
+    parser.add_argument("--start-date", type=date.fromisoformat, default=date(2026, 1, 1))
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date(2026, 6, 30))
+    parser.add_argument("--timezone", default="Europe/Lisbon")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Fixed latency added to every fake response.")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="Random extra latency per fake response.")
+    parser.add_argument("--page-size", type=int, default=200, help="Page size served by the fake and requested by the client.")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Answer every Nth request with 429 (0 disables).")
+    parser.add_argument("--forbid-reports", action="store_true", help="Answer detailed reports with 403 to force the fallback.")
+    parser.add_argument(
+        "--concurrency",
+        default="1,2,4,8",
+        help="Comma-separated shard concurrency levels to compare.",
+    )
+    parser.add_argument("--audits", type=int, default=3, help="Audits to run per concurrency level.")
+    parser.add_argument("--skip-analysis", action="store_true", help="Only fetch; do not run generate_time_audit.")
+    return parser.parse_args()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+async def run_level(args: argparse.Namespace, fake_api: FakeClockifyApi, concurrency: int) -> dict:
+    transport = TimedTransport(fake_api.transport())
+    client = ClockifyClient(
+        api_key="fake",
+        transport=transport,
+        page_size=args.page_size,
+        shard_concurrency=concurrency,
+    )
+
+    audit_seconds: list[float] = []
+    entry_count = 0
+    started_at = time.perf_counter()
+    for _ in range(args.audits):
+        audit_started_at = time.perf_counter()
+        rows = await client.fetch_detailed_report_rows(
+            start_date=args.start_date,
+            end_date=args.end_date,
+            timezone_name=args.timezone,
+        )
+        if not args.skip_analysis and rows:
+            generate_time_audit(csv_content=client.rows_to_csv(rows), write_reports=False)
+        audit_seconds.append(time.perf_counter() - audit_started_at)
+        entry_count += len(rows)
+    elapsed = time.perf_counter() - started_at
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(transport.latencies),
+        "entries": entry_count,
+        "entries_per_second": entry_count / elapsed if elapsed else 0.0,
+        "audit_seconds": statistics.mean(audit_seconds),
+        "p50_ms": percentile(transport.latencies, 0.50) * 1000,
+        "p95_ms": percentile(transport.latencies, 0.95) * 1000,
+        "p99_ms": percentile(transport.latencies, 0.99) * 1000,
+    }
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    fake_api = FakeClockifyApi(
+        FakeClockifyConfig(
+            user_count=args.users,
+            start_date=args.start_date,
+            end_date=args.end_date,
+            entries_per_user_per_day=args.entries_per_day,
+            latency_seconds=args.latency_ms / 1000,
+            latency_jitter_seconds=args.jitter_ms / 1000,
+            page_size=args.page_size,
+            forbid_detailed_report=args.forbid_reports,
+            rate_limit_every=args.rate_limit_every,
+        )
+    )
+    print(f"Fake workspace: {len(fake_api.users)} users, {len(fake_api.entries)} entries.")
+
+    results = []
+    for concurrency in [int(value) for value in args.concurrency.split(",") if value.strip()]:
+        results.append(await run_level(args, fake_api, concurrency))
+    print(f"Requests by route: {dict(fake_api.request_counts)}; 429 responses: {fake_api.rate_limited_count}")
+    return results
+
+
+def main() -> int:
+    args = parse_args()
+    results = asyncio.run(run(args))
+
+    print(
+        f"{'concurrency':>11} {'requests':>9} {'entries/s':>10} {'audit s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for result in results:
+        print(
+            f"{result['concurrency']:>11} {result['requests']:>9} {result['entries_per_second']:>10.0f} "
+            f"{result['audit_seconds']:>8.2f} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,162 @@
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+
+REPO_DIR = Path(__file__).resolve().parents[1]
+TEST_URL_ENV = "TIME_AUDIT_TEST_POSTGRES_URL"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run the migrations and the bulk loaders against a throwaway PostgreSQL database. "
+            "Every table is dropped again at the end."
+        )
+    )
+    parser.add_argument(
+        "--database-url",
+        default=os.getenv(TEST_URL_ENV),
+        help=f"Throwaway PostgreSQL URL. Defaults to {TEST_URL_ENV}.",
+    )
+    parser.add_argument("--entries", type=int, default=50000, help="Synthetic time entries to load per loader.")
+    parser.add_argument(
+        "--require",
+        action="store_true",
+        help="Fail instead of skipping when no database is configured or reachable.",
+    )
+    return parser.parse_args()
+
+
+def skip(reason: str, required: bool) -> int:
+    print(f"{'FAILED' if required else 'SKIPPED'}: {reason}")
+    return 1 if required else 0
+
+
+def synthetic_entries(count: int) -> list[dict]:
+    started_at = datetime(2026, 1, 5, 8, 0)
+    entries = []
+    for index in range(count):
+        start = started_at + timedelta(minutes=37 * index)
+        end = start + timedelta(minutes=15 + index % 90)
+        entries.append(
+            {
+                "user_name": f"User {index % 25:04d}",
+                "description": f"Task {index % 500}\twith\\escapes\nand newline",
+                "tags": "Tag 001, Tag 002" if index % 3 else "",
+                "start_datetime": start,
+                "end_datetime": end,
+                "duration_hours": (end - start).total_seconds() / 3600,
+            }
+        )
+    return entries
+
+
+def run_check(entry_count: int) -> None:
+    from alembic import command
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from sqlalchemy import func, select
+
+    from backend.database import SessionLocal, engine
+    from backend.models import AuditSession, AuditSessionTimeEntry, User
+    from backend.rollups import replace_session_rollups
+    from backend.time_entries import batched_insert, copy_insert, supports_copy
+
+    with engine.connect() as connection:
+        if MigrationContext.configure(connection).get_current_revision() is not None:
+            raise RuntimeError("The database is already migrated; point the check at an empty database.")
+
+    config = Config(str(REPO_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(REPO_DIR / "alembic"))
+    command.upgrade(config, "head")
+    try:
+        entries = synthetic_entries(entry_count)
+        with SessionLocal() as db:
+            if not supports_copy(db):
+                raise RuntimeError(f"COPY is not available through the {engine.dialect.driver} driver.")
+
+            admin_id = db.execute(select(User.id).order_by(User.id)).scalars().first()
+            sessions = {}
+            for loader in ("copy", "batched"):
+                audit_session = AuditSession(
+                    run_dir=f"postgres-check-{loader}",
+                    source_type="clockify",
+                    start_date=date(2026, 1, 1),
+                    end_date=date(2026, 12, 31),
+                    created_by_user_id=admin_id,
+                )
+                db.add(audit_session)
+                db.flush()
+                sessions[loader] = audit_session.id
+
+            table = AuditSessionTimeEntry.__table__
+            for loader, load in (("copy", copy_insert), ("batched", batched_insert)):
+                started_at = time.perf_counter()
+                loaded = load(db, table, sessions[loader], iter(entries))
+                print(f"{loader:>8}: {loaded} entries in {time.perf_counter() - started_at:.2f}s")
+            replace_session_rollups(db, sessions["copy"], entries)
+            db.commit()
+
+            stored = {
+                loader: db.execute(
+                    select(
+                        AuditSessionTimeEntry.user_name,
+                        AuditSessionTimeEntry.description,
+                        AuditSessionTimeEntry.tags,
+                        AuditSessionTimeEntry.start_datetime,
+                        AuditSessionTimeEntry.end_datetime,
+                        AuditSessionTimeEntry.duration_hours,
+                    )
+                    .where(AuditSessionTimeEntry.audit_session_id == audit_session_id)
+                    .order_by(AuditSessionTimeEntry.id)
+                ).all()
+                for loader, audit_session_id in sessions.items()
+            }
+            if len(stored["copy"]) != entry_count or stored["copy"] != stored["batched"]:
+                raise RuntimeError("COPY and batched inserts stored different rows.")
+            if [tuple(entry.values()) for entry in entries[:1]] != [tuple(row) for row in stored["copy"][:1]]:
+                raise RuntimeError("Stored entries do not match the loaded values.")
+            id_count = db.execute(select(func.count(func.distinct(AuditSessionTimeEntry.id)))).scalar_one()
+            if id_count != 2 * entry_count:
+                raise RuntimeError("COPY did not draw ids from the table sequence.")
+            print("Migrations, COPY and batched inserts agree.")
+    finally:
+        engine.dispose()
+        command.downgrade(config, "base")
+
+
+def main() -> int:
+    args = parse_args()
+    if not args.database_url:
+        return skip(f"set {TEST_URL_ENV} or pass --database-url to run the PostgreSQL check.", args.require)
+    if not args.database_url.startswith(("postgres:", "postgresql")):
+        return skip("the database URL is not a PostgreSQL URL.", args.require)
+    try:
+        import psycopg  # noqa: F401
+    except ImportError:
+        return skip("psycopg is not installed (poetry install --extras postgres).", args.require)
+
+    # Settings are read at import time, so the backend must only be imported after this.
+    os.environ["TIME_AUDIT_DATABASE_URL"] = args.database_url
+    os.environ.setdefault("TIME_AUDIT_ADMIN_PASSWORD", "postgres-check")
+
+    from sqlalchemy.exc import OperationalError
+
+    from backend.database import engine
+
+    try:
+        with engine.connect():
+            pass
+    except OperationalError as exc:
+        return skip(f"could not connect to PostgreSQL: {exc.orig}", args.require)
+
+    run_check(args.entries)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from backend.clockify.client import ClockifyClient
+
+
+# UTC instants at which each zone's offset changes in 2026.
+TRANSITIONS = [
+    pytest.param("Europe/Lisbon", datetime(2026, 3, 29, 1, tzinfo=timezone.utc), id="lisbon-spring-forward"),
+    pytest.param("Europe/Lisbon", datetime(2026, 10, 25, 1, tzinfo=timezone.utc), id="lisbon-fall-back"),
+    pytest.param("America/New_York", datetime(2026, 3, 8, 7, tzinfo=timezone.utc), id="new-york-spring-forward"),
+    pytest.param("America/New_York", datetime(2026, 11, 1, 6, tzinfo=timezone.utc), id="new-york-fall-back"),
+]
+ENTRY_MINUTES = (5, 30, 50, 70, 130)
+# Fractional starts are paired with different fractional ends, mixing "Z" and "+00:00".
+SUFFIX_PAIRS = [("Z", ".123456+00:00"), (".5Z", ".000001Z"), (".999Z", ".999Z"), (".000001Z", ".5Z")]
+
+
+def legacy_entries_to_rows(entries: list[dict[str, Any]], tzinfo: ZoneInfo) -> list[dict[str, Any]]:
+    """The per-row conversion ``_entries_to_columns`` replaced, reduced to the compared columns."""
+    rows = []
+    for entry in entries:
+        interval = entry["timeInterval"]
+        start_dt = datetime.fromisoformat(interval["start"].replace("Z", "+00:00")).astimezone(tzinfo)
+        end_dt = datetime.fromisoformat(interval["end"].replace("Z", "+00:00")).astimezone(tzinfo)
+        # Both ends share one tzinfo, so this subtracts wall-clock times.
+        duration_hours = round((end_dt - start_dt).total_seconds() / 3600, 6)
+        if duration_hours < 0:
+            continue
+        rows.append(
+            {
+                "Id": entry["id"],
+                "Start Date": start_dt.strftime("%d/%m/%Y"),
+                "Start Time": start_dt.strftime("%H:%M:%S"),
+                "End Date": end_dt.strftime("%d/%m/%Y"),
+                "End Time": end_dt.strftime("%H:%M:%S"),
+                "Duration (decimal)": duration_hours,
+            }
+        )
+    return rows
+
+
+def utc_hours(entry: dict[str, Any]) -> float:
+    interval = entry["timeInterval"]
+    start = datetime.fromisoformat(interval["start"].replace("Z", "+00:00"))
+    end = datetime.fromisoformat(interval["end"].replace("Z", "+00:00"))
+    return round((end - start).total_seconds() / 3600, 6)
+
+
+def build_entries(transition: datetime) -> list[dict[str, Any]]:
+    """Entries starting every ten minutes from two hours before to one hour after ``transition``."""
+    entries = []
+    start = transition - timedelta(hours=2)
+    while start <= transition + timedelta(hours=1):
+        for minutes in ENTRY_MINUTES:
+            for start_suffix, end_suffix in SUFFIX_PAIRS:
+                end = start + timedelta(minutes=minutes)
+                entries.append(
+                    {
+                        "id": f"e{len(entries)}",
+                        "userName": "DST Check",
+                        "timeInterval": {
+                            "start": start.strftime("%Y-%m-%dT%H:%M:%S") + start_suffix,
+                            "end": end.strftime("%Y-%m-%dT%H:%M:%S") + end_suffix,
+                        },
+                    }
+                )
+        # An end ten minutes before the start; across a fall-back it can still read later on the wall clock.
+        entries.append(
+            {
+                "id": f"e{len(entries)}",
+                "userName": "DST Check",
+                "timeInterval": {
+                    "start": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "end": (start - timedelta(minutes=10)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                },
+            }
+        )
+        start += timedelta(minutes=10)
+    return entries
+
+
+def convert(entries: list[dict[str, Any]], tzinfo: ZoneInfo) -> dict[str, dict[str, Any]]:
+    columns = ClockifyClient(api_key="dst-check")._entries_to_columns(entries, {}, {}, tzinfo)
+    names = list(columns)
+    return {values[0]: dict(zip(names, values)) for values in zip(*columns.values())}
+
+
+@pytest.mark.parametrize(("zone_name", "transition"), TRANSITIONS)
+def test_local_dates_and_times_match_per_row_conversion(zone_name, transition):
+    tzinfo = ZoneInfo(zone_name)
+    entries = build_entries(transition)
+    rows = convert(entries, tzinfo)
+    legacy_rows = {row["Id"]: row for row in legacy_entries_to_rows(entries, tzinfo)}
+
+    compared = rows.keys() & legacy_rows.keys()
+    assert compared
+    for entry_id in compared:
+        for name in ("Start Date", "Start Time", "End Date", "End Time"):
+            assert rows[entry_id][name] == legacy_rows[entry_id][name], (entry_id, name)
+
+
+@pytest.mark.parametrize(("zone_name", "transition"), TRANSITIONS)
+def test_durations_are_utc_hours(zone_name, transition):
+    entries = build_entries(transition)
+    entries_by_id = {entry["id"]: entry for entry in entries}
+    rows = convert(entries, ZoneInfo(zone_name))
+
+    assert rows.keys() == {entry["id"] for entry in entries if utc_hours(entry) >= 0}
+    for entry_id, row in rows.items():
+        assert row["Duration (decimal)"] == utc_hours(entries_by_id[entry_id])
+
+
+@pytest.mark.parametrize(("zone_name", "transition"), TRANSITIONS)
+def test_only_entries_spanning_the_change_differ_from_wall_clock_durations(zone_name, transition):
+    tzinfo = ZoneInfo(zone_name)
+    entries = build_entries(transition)
+    entries_by_id = {entry["id"]: entry for entry in entries}
+    rows = convert(entries, tzinfo)
+    legacy_rows = {row["Id"]: row for row in legacy_entries_to_rows(entries, tzinfo)}
+
+    changed = {
+        entry_id
+        for entry_id in rows.keys() & legacy_rows.keys()
+        if rows[entry_id]["Duration (decimal)"] != legacy_rows[entry_id]["Duration (decimal)"]
+    }
+    assert changed
+    for entry_id in changed:
+        interval = entries_by_id[entry_id]["timeInterval"]
+        start = datetime.fromisoformat(interval["start"].replace("Z", "+00:00"))
+        end = datetime.fromisoformat(interval["end"].replace("Z", "+00:00"))
+        assert start < transition <= end
+        difference = abs(rows[entry_id]["Duration (decimal)"] - legacy_rows[entry_id]["Duration (decimal)"])
+        assert difference == pytest.approx(1.0)
+
+
+def test_fractional_seconds_are_truncated_like_the_per_row_conversion():
+    tzinfo = ZoneInfo("Europe/Lisbon")
+    entries = [
+        {
+            "id": "fraction",
+            "userName": "DST Check",
+            "timeInterval": {"start": "2026-03-29T00:59:59.999999Z", "end": "2026-03-29T01:00:00.5+00:00"},
+        }
+    ]
+    row = convert(entries, tzinfo)["fraction"]
+    legacy_row = legacy_entries_to_rows(entries, tzinfo)[0]
+
+    assert (row["Start Time"], row["End Time"]) == ("00:59:59", "02:00:00")
+    assert (row["Start Time"], row["End Time"]) == (legacy_row["Start Time"], legacy_row["End Time"])
+    assert row["Duration (decimal)"] == utc_hours(entries[0])
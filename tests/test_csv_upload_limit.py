@@ -0,0 +1,83 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from backend import public
+
+
+LIMIT = 1024
+BOUNDARY = "csv-upload-limit"
+
+
+def multipart_body(filename: str, content: bytes) -> bytes:
+    return b"".join(
+        [
+            f"--{BOUNDARY}\r\n".encode(),
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'.encode(),
+            b"Content-Type: text/csv\r\n\r\n",
+            content,
+            f"\r\n--{BOUNDARY}--\r\n".encode(),
+        ]
+    )
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(public, "CSV_UPLOAD_MAX_BYTES", LIMIT)
+    monkeypatch.setattr(public, "MULTIPART_OVERHEAD_BYTES", 512)
+    app = FastAPI()
+    app.include_router(public.router)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def form_calls(monkeypatch):
+    calls = []
+    form = Request.form
+
+    def counting_form(self, *args, **kwargs):
+        calls.append(self)
+        return form(self, *args, **kwargs)
+
+    monkeypatch.setattr(Request, "form", counting_form)
+    return calls
+
+
+def post_upload(client: TestClient, content, headers: dict[str, str] | None = None):
+    return client.post(
+        "/api/audit",
+        content=content,
+        headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}", **(headers or {})},
+    )
+
+
+def test_declared_oversized_body_is_rejected_before_parsing(client, form_calls):
+    response = post_upload(client, multipart_body("report.csv", b"x" * (4 * LIMIT)))
+
+    assert response.status_code == 413
+    assert form_calls == []
+
+
+def test_streamed_oversized_body_is_rejected_while_it_arrives(client):
+    body = multipart_body("report.csv", b"x" * (4 * LIMIT))
+    chunks = (body[offset:offset + 256] for offset in range(0, len(body), 256))
+
+    response = post_upload(client, chunks)
+
+    assert response.status_code == 413
+
+
+def test_file_over_the_limit_within_the_multipart_overhead_is_rejected(client):
+    response = post_upload(client, multipart_body("report.csv", b"x" * (LIMIT + 100)))
+
+    assert response.status_code == 413
+
+
+def test_body_within_the_limit_is_parsed(client, form_calls):
+    response = post_upload(client, multipart_body("report.txt", b"x" * 100))
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "File must be a CSV"
+    assert len(form_calls) == 1
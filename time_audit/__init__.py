@@ -1,3 +1,3 @@
-from .core import generate_time_audit
+from .core import generate_time_audit, update_run_reports
 
-__all__ = ["generate_time_audit"]
+__all__ = ["generate_time_audit", "update_run_reports"]
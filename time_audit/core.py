@@ -1,10 +1,10 @@
 import os
 import json
 import shutil
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
 import pandas as pd
 from io import StringIO
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, TextIO, Union
 import uuid
 
 
@@ -14,26 +14,164 @@ def convert_decimal_to_hm(decimal_hours: float) -> str:
     return f"{hours}h {minutes}m"
 
 
+REPORT_LAYOUTS = ("single", "month", "week")
+
+
+def _report_stem(user: str) -> str:
+    return user.replace(" ", "_").lower()
+
+
+def _report_filename(user: str) -> str:
+    return f"{_report_stem(user)}_report.json"
+
+
+def _shard_bounds(day: date, layout: str) -> tuple[str, date, date]:
+    if layout == "week":
+        iso_year, iso_week, _ = day.isocalendar()
+        first_day = day - timedelta(days=day.weekday())
+        return f"{iso_year}-W{iso_week:02d}", first_day, first_day + timedelta(days=6)
+    first_day = day.replace(day=1)
+    next_month = (first_day + timedelta(days=32)).replace(day=1)
+    return f"{day.year}-{day.month:02d}", first_day, next_month - timedelta(days=1)
+
+
+def _write_user_report(
+    run_dir_path: str,
+    run_dir_name: str,
+    user: str,
+    data: Dict[str, Any],
+    layout: str = "single",
+) -> Dict[str, Any]:
+    filename = _report_filename(user)
+    report_file: Dict[str, Any] = {
+        "user": user,
+        "filename": filename,
+        "relative_path": f"{run_dir_name}/{filename}",
+    }
+    if layout not in ("month", "week"):
+        json_file_path = os.path.join(run_dir_path, filename)
+        with open(json_file_path, "w") as f:
+            json.dump(data, f, indent=4)
+        return report_file
+
+    # Sharded layout: <user>/<YYYY-MM>.json or <user>/<YYYY-Www>.json, each holding the same date -> tasks
+    # mapping for the days of its month or ISO week. ``filename`` still names the whole report, which the
+    # backend assembles from the shards on request.
+    user_dir = _report_stem(user)
+    user_dir_path = os.path.join(run_dir_path, user_dir)
+    if os.path.isdir(user_dir_path):
+        shutil.rmtree(user_dir_path)
+    os.makedirs(user_dir_path)
+
+    shards: Dict[str, Dict[str, Any]] = {}
+    for date_key, tasks in data.items():
+        if not tasks:
+            continue
+        day = datetime.strptime(tasks[0]["start_datetime"][:10], "%Y-%m-%d").date()
+        key, first_day, last_day = _shard_bounds(day, layout)
+        shard = shards.setdefault(
+            key,
+            {"key": key, "start_date": first_day.isoformat(), "end_date": last_day.isoformat(), "report": {}},
+        )
+        shard["report"][date_key] = tasks
+
+    report_file["layout"] = layout
+    report_file["shards"] = []
+    for key in sorted(shards):
+        shard = shards[key]
+        shard_filename = f"{user_dir}/{key}.json"
+        with open(os.path.join(run_dir_path, shard_filename), "w") as f:
+            json.dump(shard["report"], f, indent=4)
+        report_file["shards"].append(
+            {
+                "key": key,
+                "start_date": shard["start_date"],
+                "end_date": shard["end_date"],
+                "filename": shard_filename,
+                "relative_path": f"{run_dir_name}/{shard_filename}",
+                "entry_count": sum(len(tasks) for tasks in shard["report"].values()),
+            }
+        )
+    return report_file
+
+
+def _remove_user_report(run_dir_path: str, user: str) -> None:
+    file_path = os.path.join(run_dir_path, _report_filename(user))
+    if os.path.exists(file_path):
+        os.remove(file_path)
+    user_dir_path = os.path.join(run_dir_path, _report_stem(user))
+    if os.path.isdir(user_dir_path):
+        shutil.rmtree(user_dir_path)
+
+
+def _write_manifest(run_dir_path: str, report_files: List[Dict[str, Any]], layout: str = "single") -> None:
+    manifest_path = os.path.join(run_dir_path, "manifest.json")
+    with open(manifest_path, "w") as f:
+        json.dump({"layout": layout, "report_files": report_files}, f, indent=4)
+
+
+def update_run_reports(
+    output_dir: str,
+    run_dir_name: str,
+    report_by_user_by_date: Dict[str, Dict[str, Any]],
+    removed_users: Optional[List[str]] = None,
+) -> List[Dict[str, str]]:
+    """Rewrite only the given users' report files inside an existing run directory.
+
+    Reports of users that are not mentioned are left untouched. Users listed in
+    ``removed_users`` have their report file (or shards) deleted. Rewritten reports
+    keep the run's layout. The manifest is rewritten and the full, user-sorted list
+    of report files is returned.
+    """
+    run_dir_path = os.path.join(output_dir, run_dir_name)
+    os.makedirs(run_dir_path, exist_ok=True)
+
+    layout = "single"
+    report_files_by_user: Dict[str, Dict[str, Any]] = {}
+    manifest_path = os.path.join(run_dir_path, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        layout = manifest.get("layout", "single")
+        for report_file in manifest.get("report_files", []):
+            report_files_by_user[report_file["user"]] = report_file
+
+    for user in removed_users or []:
+        report_files_by_user.pop(user, None)
+        _remove_user_report(run_dir_path, user)
+
+    for user, data in report_by_user_by_date.items():
+        report_files_by_user[user] = _write_user_report(run_dir_path, run_dir_name, user, data, layout)
+
+    report_files = [report_files_by_user[user] for user in sorted(report_files_by_user)]
+    _write_manifest(run_dir_path, report_files, layout)
+    return report_files
+
+
 def generate_time_audit(
-    csv_content: str,
+    csv_content: Union[str, TextIO],
     big_task_hours: float = 8.0,
     output_dir: Optional[str] = None,
     run_dir_name: Optional[str] = None,
     write_reports: bool = True,
     clean_output_dir: bool = False,  # deprecated: retained for compatibility, ignored in favor of per-request subdirs
     retention_hours: int = 24,
+    report_layout: str = "single",
 ) -> Dict[str, Any]:
     """Generate time audit statistics and (optionally) write per-user JSON reports.
 
     Parameters
     ----------
-    csv_content: Raw CSV string exported from Clockify detailed report (with the same columns expected previously).
+    csv_content: Raw CSV string exported from Clockify detailed report (with the same columns expected previously),
+        or a text file object to parse it from without loading it into one string.
     big_task_hours: Threshold above which a task is considered very big.
     output_dir: Directory to write per-user JSON reports. Used only if write_reports is True.
     run_dir_name: Optional explicit run directory name to reuse when writing reports.
     write_reports: Whether to write JSON report files. If False, function only returns structures.
     clean_output_dir: (Deprecated) Ignored; previous behavior replaced with per-request subdirectories for isolation.
     retention_hours: Number of hours to retain past run directories. Directories older than this will be deleted.
+    report_layout: "single" writes one <user>_report.json per user; "month" or "week" shard each user's report
+        into <user>/<YYYY-MM>.json or <user>/<YYYY-Www>.json files, indexed under "shards" in the manifest.
 
     Returns
     -------
@@ -44,11 +182,12 @@ def generate_time_audit(
         big_tasks_per_user (duration > big_task_hours)
         report_by_user_by_date (nested dict user -> date -> list[task dict])
     big_task_hours (echo of threshold)
-    report_files (list of {user, filename, relative_path}) if write_reports is True else empty list
+    report_files (list of {user, filename, relative_path}, plus layout and shards when sharded)
+        if write_reports is True else empty list
     run_dir (name of the per-request subdirectory) when write_reports True else None
     """
     # Read CSV from string
-    data_new = pd.read_csv(StringIO(csv_content))
+    data_new = pd.read_csv(StringIO(csv_content) if isinstance(csv_content, str) else csv_content)
     if "Tags" not in data_new.columns:
         data_new["Tags"] = ""
     data_new["Tags"] = data_new["Tags"].fillna("")
@@ -74,7 +213,8 @@ def generate_time_audit(
         big_tasks_per_user[user] = []
         time_stats["time_per_user"][user] = 0
 
-        group_sorted = group.sort_values("Start Datetime")
+        # Stable, fully specified order so entries sharing a start time pair up the same way every run.
+        group_sorted = group.sort_values(["Start Datetime", "End Datetime", "Description"], kind="stable")
 
         for i in range(len(group_sorted) - 1):
             if (
@@ -161,7 +301,7 @@ def generate_time_audit(
             }
         )
 
-    report_files: List[Dict[str, str]] = []
+    report_files: List[Dict[str, Any]] = []
     if write_reports:
         if output_dir is None:
             output_dir = "output"
@@ -193,21 +333,11 @@ def generate_time_audit(
             shutil.rmtree(run_dir_path)
         os.makedirs(run_dir_path, exist_ok=True)
 
+        layout = report_layout if report_layout in REPORT_LAYOUTS else "single"
         for user, data in report_by_user_by_date.items():
-            safe_user = user.replace(" ", "_").lower()
-            filename = f"{safe_user}_report.json"
-            json_file_path = os.path.join(run_dir_path, filename)
-            with open(json_file_path, "w") as f:
-                json.dump(data, f, indent=4)
-            report_files.append({
-                "user": user,
-                "filename": filename,
-                "relative_path": f"{run_dir_name}/{filename}",
-            })
-
-        manifest_path = os.path.join(run_dir_path, "manifest.json")
-        with open(manifest_path, "w") as f:
-            json.dump({"report_files": report_files}, f, indent=4)
+            report_files.append(_write_user_report(run_dir_path, run_dir_name, user, data, layout))
+
+        _write_manifest(run_dir_path, report_files, layout)
 
     return {
         "overlap_per_user": overlap_per_user,